@@ -91,8 +91,7 @@ class BuildMode():
         
     def can_place(self, room : Room) -> bool:
         """check if the placeable can be placed without colliding with other objects"""
-        room_rects = [placeable.rect for placeable in room.placed]
-        if self.ghost_rect.collidelistall(room_rects) or room.num in [0, 5]:
+        if room.get_placeables_colliding(self.ghost_rect) or room.num in [0, 5]: # only the objects in the grid cells under the ghost are tested
             return False
         else:
             return True
@@ -110,9 +109,10 @@ class DestructionMode():
 
     def remove_from_room(self, placeable : Placeable, room : Room):
         """removes the placeable from the room"""
-        if placeable not in room.blacklist:
+        if not room.in_blacklist(placeable):
             placeable.placed = False
-            room.placed.remove(placeable)
+            room.remove_placeable(placeable)
+            placeable.compact() # back in the inventory, the surfaces that can be rebuilt are freed
     
     def toggle(self):
         """toggles the destruction mode"""
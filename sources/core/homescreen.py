@@ -174,7 +174,7 @@ class OnlineHomescreen:
                 popup.lifetime -= 1
 
     def draw(self, WIN : pg.Surface, mouse_pos : tuple):
-        WIN.blit(self.background, (0,0), (self.bg_offset, 0, *WIN.get_size()))
+        WIN.blit(self.background.get(), (0,0), (self.bg_offset, 0, *WIN.get_size()))
         self.bg_offset += 2
 
         if self.bg_offset > self.background.get_width()-WIN.get_width():
@@ -262,7 +262,7 @@ class OfflineHomescreen:
                     play_button.handle_event(event)
             
             #draw
-            win.blit(background, (0,0), (bg_offset, 0, *win.get_size()))
+            win.blit(background.get(), (0,0), (bg_offset, 0, *win.get_size()))
             bg_offset += 2
 
             temp_title = pg.transform.scale_by(sprite.TITLE, 1 + sin(title_screen_size_incr)*0.02)
@@ -42,10 +42,12 @@ class State(Enum):
 # system 
 import pygame as pg
 from math import pi #used for the transition effect
+from time import perf_counter # work time of the frames, for the frame pacer
 
 # core game elements
 from core.buildmode import BuildMode, DestructionMode
 from core.unlockmanager import UnlockManager
+from core.scene import Layer
 from objects.bot import Hivemind, BotDistributor
 from objects.canva import Canva
 from objects.dialogue import DialogueManager
@@ -65,9 +67,12 @@ import ui.sprite as sprite
 # misc
 from utils.coord import Coord
 from utils.fonts import TERMINAL_FONT_BIG
-from utils.room_config import R1, R4, ROOMS, Room, PARTICLE_SPAWNERS, SPECIAL_PLACEABLES
+from utils.room_config import R1, R4, MUSEUM, Room, PARTICLE_SPAWNERS, SPECIAL_PLACEABLES
 from utils.sound import SoundManager
 from utils.timermanager import TimerManager
+from utils.assetstore import ASSETS
+from utils.framepacer import FramePacer
+from utils.scheduler import Scheduler
 
 class Game:
     def __init__(self, win : pg.Surface, config : dict, inventory, shop, gold, unlock_manager, transparency_win, last_frame_of_homescreen : pg.Surface, sound_manager : SoundManager):
@@ -81,7 +86,8 @@ class Game:
         self.sound_manager = sound_manager
         self.sound_manager.timer = self.timer
         self.sound_manager.play_random_ambiant_sound()
-        self.clock : pg.time.Clock = pg.time.Clock()
+        self.pacer : FramePacer = FramePacer(config['gameplay']['fps'], config['gameplay']['background_fps']) # Replaces clock.tick, throttles the game in the background
+        self.clock : pg.time.Clock = self.pacer.clock
         self.popups : list[InfoPopup] = []
         self.confirmation_popups : list[ConfirmationPopup] = [] # Stack of confirmation popups
         self.gui_state = State.INTERACTION
@@ -95,18 +101,28 @@ class Game:
         self.bot_distributor : BotDistributor = BotDistributor(self.timer, self.hivemind, self)
         self.dialogue_manager : DialogueManager = DialogueManager()
         self.current_room : Room = R1 # Starter room always in floor 1.
+        ASSETS.set_active_groups([f"floor{self.current_room.num}"]) # Sprites of the other floors can be evicted from memory
+        ASSETS.evict_group("homescreen") # Not drawn again before the game is left, rebuilt (or read from the disk cache) then
         self.incr_fondu = 0
         self.money : int = gold
-        self.beauty : float = self.process_total_beauty()
+        self.museum = MUSEUM # every floor, with their beauty kept up to date by the rooms
+        self.cheat_beauty : float = 0 # added by the debug key
         self.unlock_manager : UnlockManager = unlock_manager
         self.canva : Canva = Canva(Coord(0,(618,24)), self)
         self.pattern_holder : PatternHolder = PatternHolder(Coord(0, (36, self.canva.coord.y+72)), canva=self.canva)
         self.paused = False
+        self.dirty = True # set when the frame has to be drawn again while paused (see needs_redraw)
+        self.hud_strings : tuple | None = None # Counters currently rendered in hud_surfs (see update_hud)
+        self.hud_surfs : tuple[pg.Surface, pg.Surface] | None = None
 
         self.particle_spawners : dict[int,list] = PARTICLE_SPAWNERS
 
         self.guichet = SPECIAL_PLACEABLES['guichet']
 
+        self.mouse_pos : Coord = Coord(self.current_room.num, (0, 0)) # Mouse position of the current update, used by the scheduled tasks
+        self.scheduler : Scheduler = self.init_scheduler()
+        self.update_hud() # The HUD texts are rendered by the scheduler, but the cutscenes can draw the game before the first update
+
         # Initialize unlocks effects.
         for unlocked_feature in self.unlock_manager.unlocked_features: # If the auto cachier is unlocked
             self.unlock_effect(unlocked_feature) # Apply the unlock effect
@@ -132,7 +148,7 @@ class Game:
             case "Auto Cachier":
                 self.timer.create_timer(3, self.accept_bot, True) # Accept a bot every 3 seconds (effect of the auto cachier unlock)
                 self.guichet.auto_cachier_unlocked = True # To display the auto cachier effect on the guichet
-                R4.placed.remove(SPECIAL_PLACEABLES['auto_cachier']) # Remove the auto cachier from the room
+                R4.remove_placeable(SPECIAL_PLACEABLES['auto_cachier']) # Remove the auto cachier from the room
             case "Color":
                 self.canva.color_buttons = self.canva.init_color_buttons(True) # Initialize again the color buttons with the color feature unlocked this time
                 self.canva.color_buttons_unlocked = True
@@ -140,8 +156,7 @@ class Game:
     def configure_online_mode(self):
         """ Handles the changes necessary to play in online mode"""
         self.spectating_placeable = subplaceable.SpectatorPlaceable('spectating_placeable', Coord(5,(1032, 678)), sprite.TELESCOPE, self.config)
-        ROOMS[5].placed.append(self.spectating_placeable)
-        ROOMS[5].blacklist.append(self.spectating_placeable)
+        self.museum[5].add_placeable(self.spectating_placeable, blacklisted=True)
 
     def change_floor(self, direction):
         """ Changes the current room to the next one in the given direction 
@@ -150,7 +165,10 @@ class Game:
         # Check if the next room is within the limits and unlocked
         if 0 <= self.current_room.num + direction <= 5 and (self.unlock_manager.is_floor_unlocked(self.current_room.num + direction) or self.config['gameplay']['cheats']):
 
-            self.current_room = ROOMS[self.current_room.num + direction]  # Move to the next room
+            if self.current_room.num == 0:
+                self.canva.brush.end() # The canvas doesn't get the events of the other floors, the stroke can't go on
+            self.current_room = self.museum[self.current_room.num + direction]  # Move to the next room
+            ASSETS.set_active_groups([f"floor{self.current_room.num}"]) # Sprites of the previous floor become evictable
             self.update_all_locked_status() # Update doors lock state
 
             # Checks if floor already visited and launches dialogue if not
@@ -167,9 +185,8 @@ class Game:
     def update_all_locked_status(self):
         """ Updates the locked status of all unlockable placeable in the current room
         Intended to be called when a new floor is discovered or when a new feature is unlocked"""
-        for door in self.current_room.placed:
-            if type(door) in [subplaceable.DoorUp, subplaceable.DoorDown]:
-                door.update_lock_status(self.unlock_manager, self.current_room)
+        for door in self.current_room.get_placeables_of_type(subplaceable.DoorUp, subplaceable.DoorDown):
+            door.update_lock_status(self.unlock_manager, self.current_room)
 
     def launch_random_dialogue(self, bot_anim):
         """ Function to initiate dialogue easily passed to other functions
@@ -210,12 +227,10 @@ class Game:
         self.paused = False
         self.gui_state = State.INTERACTION
 
-    def process_total_beauty(self):
-        """ Sums the overall beauty score to be used by the Bot_Manager"""
-        total = 0
-        for room in ROOMS:
-            total += room.get_beauty_in_room()
-        return total
+    @property
+    def beauty(self) -> float:
+        """ Overall beauty score used by the Bot_Manager, maintained incrementally by the museum"""
+        return self.museum.beauty + self.cheat_beauty
     
     def accept_bot(self):
         """ When liberating a bot, add the proper money amount given by hivemind.free_last_bot (which updates the bots logic)"""
@@ -301,7 +316,7 @@ class Game:
             case pg.K_g:
                 self.money += 1000
             case pg.K_b:
-                self.beauty += 1
+                self.cheat_beauty += 1
 
     def toggle_inventory(self):
         """ Toggles the inventory GUI state
@@ -332,6 +347,10 @@ class Game:
             self.pause()
 
     def save_canva(self):
+        if self.canva.is_painting(): # A painting can be started while the confirmation is open, the canvas is reset when saved
+            self.popups.append(InfoPopup("Attendez la fin de la peinture !"))
+            self.sound_manager.incorrect.play()
+            return
         self.inventory.inv.append(self.canva.get_placeable())
         self.popups.append(InfoPopup("Vous avez sauvegardé votre toile dans l'inventaire !"))
 
@@ -366,7 +385,7 @@ class Game:
             case subplaceable.ColorUnlockPlaceable:
                 self.handle_color_placeable_interaction()
             case _:
-                if not hasattr(placeable, 'no_interaction'):
+                if not placeable.no_interaction:
                     self.popups.append(InfoPopup(placeable.name))
 
                        
@@ -473,9 +492,8 @@ class Game:
 
     def handle_build_mode(self):
         if self.build_mode.can_place(self.current_room): # Check if the object can be placed in the room when clicked
-            self.current_room.placed.append(self.build_mode.get_configured_placeable(self.current_room.num)) # Place the object in the room
+            self.current_room.add_placeable(self.build_mode.get_configured_placeable(self.current_room.num)) # Place the object in the room
             self.sound_manager.items.play() 
-            self.beauty = self.process_total_beauty() # Update beauty score
             self.gui_state = State.INVENTORY # Return to the inventory
             self.inventory.init()
         else:
@@ -492,15 +510,12 @@ class Game:
             self.gui_state = State.BUILD
 
     def handle_destruction_mode(self, mouse_pos: Coord):
-        for placeable in self.current_room.placed:
-            if placeable.rect.collidepoint(mouse_pos.x, mouse_pos.y):
-                self.destruction_mode.remove_from_room(placeable, self.current_room) # Remove the object from the room
-                self.beauty = self.process_total_beauty()
+        for placeable in self.current_room.get_placeables_at(mouse_pos.xy): # Only the objects under the mouse, found with the room grid
+            self.destruction_mode.remove_from_room(placeable, self.current_room) # Remove the object from the room
 
     def handle_interaction_mode(self, mouse_pos: Coord):
-        for placeable in self.current_room.placed:
-            if placeable.rect.collidepoint(mouse_pos.x, mouse_pos.y): # Check if the mouse is over a placeable
-                self.placeable_interaction_handler(placeable)
+        for placeable in self.current_room.get_placeables_at(mouse_pos.xy): # Only the objects under the mouse, found with the room grid
+            self.placeable_interaction_handler(placeable)
 
         self.hivemind.handle_bot_click(mouse_pos, self.launch_random_dialogue) # Handle bot reaction click
 
@@ -526,26 +541,50 @@ class Game:
 #     /_/                         
 
 
+    def init_scheduler(self) -> Scheduler:
+        """ Registers the update of each subsystem with its own rate (in updates per second, every update if None)
+        Low priority tasks can be postponed to the next update if the update is too long"""
+        scheduler = Scheduler(self.config['gameplay']['fps'])
+        scheduler.register("music", self.update_music, rate=4)
+        scheduler.register("timers", self.update_timers)
+        scheduler.register("particles", self.update_particles, rate=30, low_priority=True, catch_up=True)
+        scheduler.register("room", self.update_current_room)
+        scheduler.register("bots", self.update_bots)
+        scheduler.register("painting", self.update_painting, catch_up=True)
+        scheduler.register("gui state", self.update_gui_state)
+        scheduler.register("last bot", self.update_last_bot_clickable, rate=10, low_priority=True)
+        scheduler.register("hud", self.update_hud, rate=10, low_priority=True)
+        scheduler.register("thumbnails", self.update_thumbnails, rate=30, low_priority=True)
+        return scheduler
+
     def update(self, mouse_pos):
-        self.update_music()
-        self.update_timers()
-        self.update_particles()
-        self.update_current_room(mouse_pos)
-        self.update_bots()
-        self.update_gui_state()
+        self.mouse_pos = mouse_pos
+        self.scheduler.run() # Runs the subsystems that are due (see init_scheduler)
 
     def update_timers(self):
         self.timer.update()
 
-    def update_particles(self):
+    def update_particles(self, steps : int = 1):
+        """ steps is the number of updates since the last call, the particles run at a lower rate"""
         spawners: list[ParticleSpawner] = self.particle_spawners.get(self.current_room.num, None)
         if spawners is not None:
             for spawner in spawners:
-                spawner.spawn()
-                spawner.update_all()
+                spawner.spawn(steps)
+                spawner.update_all(steps)
                 if spawner.finished:
                     spawners.remove(spawner)
     
+    def update_painting(self, steps : int = 1):
+        """ Advances the painting animations of the canvas, they keep going on the other floors"""
+        self.canva.update_painting(steps / self.config['gameplay']['fps'])
+
+    def update_thumbnails(self):
+        """ Generates the thumbnails of the pages next to the current one of the open inventory or shop"""
+        if self.gui_state is State.INVENTORY:
+            self.inventory.preload_thumbnails()
+        elif self.gui_state is State.SHOP:
+            self.shop.preload_thumbnails()
+
     def update_music(self):
         if self.current_room.num == 5:
             self.sound_manager.music_ambiant.set_volume(0.6*self.sound_manager.volume)
@@ -557,23 +596,29 @@ class Game:
             self.sound_manager.play_random_robot_sound()
         
 
-    def update_current_room(self, mouse_pos):
+    def update_current_room(self):
+        mouse_pos = self.mouse_pos
         self.current_room.update_sprite()
+        hovered = []
+        if self.gui_state in [State.DESTRUCTION, State.INTERACTION]:
+            hovered = self.current_room.get_placeables_at(mouse_pos.xy) # Only the objects of the grid cell under the mouse are tested
+        color = (170, 170, 230) if self.gui_state != State.DESTRUCTION else (255, 0, 0)
         for placeable in self.current_room.placed:
-            if placeable.rect.collidepoint(mouse_pos.xy) and self.gui_state in [State.DESTRUCTION, State.INTERACTION]:
-                color = (170, 170, 230) if self.gui_state != State.DESTRUCTION else (255, 0, 0)
+            if placeable in hovered:
                 placeable.update_sprite(True, color)
             else:
                 placeable.update_sprite(False)
 
     def update_bots(self):
         self.hivemind.order_inline_bots()
-        self.hivemind.update(ROOMS, self.timer)
+        self.hivemind.update(self.museum.rooms, self.timer)
 
-    def update_gui_state(self):
+    def update_last_bot_clickable(self):
         match self.gui_state:
             case State.INTERACTION:
                 self.hivemind.create_last_bot_clickable()
+
+    def update_gui_state(self):
         if self.confirmation_popups:
             self.gui_state = State.CONFIRMATION
 
@@ -584,8 +629,34 @@ class Game:
 #  / /_/ / /  / /_/ /| |/ |/ / 
 # /_____/_/   \__,_/ |__/|__/  
 
+    def needs_redraw(self) -> bool:
+        """Returns True if the frame has to be drawn again.  
+        The game always moves (bots, animated labels...), only the paused states are drawn on demand :
+        after an input, while a popup moves, while the dialog text is typed or when the bot animation changes frame."""
+        dialog_changed = False
+        if self.gui_state == State.DIALOG:
+            icon_changed = self.dialogue_manager.update_icon() # called before any early return, the icon only advances here
+            dialog_changed = icon_changed or self.dialogue_manager.is_typing()
+        return not self.paused or self.dirty or bool(self.popups) or dialog_changed
+
+    def can_sleep(self) -> bool:
+        """Returns True if nothing will change on screen until the next input, the main loop then waits for it.  
+        Timers are not updated while paused, so they can't wake the game up."""
+        if not self.paused or self.popups:
+            return False
+        if self.gui_state == State.DIALOG:
+            return self.dialogue_manager.is_idle()
+        return self.gui_state == State.PAUSED
+
     def draw(self, mouse_pos: Coord):
-        """Draws all elements of the game"""
+        """Draws all elements of the game, the room is drawn layer by layer (see core/scene.py)"""
+        if self.gui_state in [State.PAUSED, State.DIALOG] and self.paused:
+            # The grayscale copy of the screen covers the whole room, so only the menu is drawn
+            self.draw_gui(mouse_pos)
+            if self.config['gameplay']['debug']:
+                self.draw_debug_info(mouse_pos)
+            self.render_popups()
+            return
         self.draw_background()
         self.draw_current_room()
         self.draw_bots(mouse_pos)
@@ -600,28 +671,36 @@ class Game:
         if not self.paused:
             self.win.blit(self.transparency_win, (0, 0))
             
-    def draw_info_ui(self):
+    def update_hud(self):
+        """ Renders the beauty and money counters, run at 10 Hz by the scheduler"""
         beauty_default_string = "0000.0" # Default string to display the beauty score
         cropped_beauty = float(min(self.beauty, 9999.9)) # Crop the beauty score to 4 digits
         beauty_string = beauty_default_string[:6-len(str(cropped_beauty))] + str(cropped_beauty) # Magic slice to replace the end of default string with actual beauty value
-        beauty_background = sprite.BEAUTY_LABEL_ANIMATION.get_frame() # Get the current frame of the beauty label animation
-
         cropped_money = int(min(self.money, 99999)) # Crop the money to 5 digits, doesn't affect the actual money value
-        money_background = sprite.MONEY_LABEL_ANIMATION.get_frame()
-
-        # Blit everything together
-        beauty_background.blit(TERMINAL_FONT_BIG.render(beauty_string, False, (0, 255, 0)), (6*6, 6*6))
-        money_background.blit(TERMINAL_FONT_BIG.render(str(cropped_money), False, (255, 255, 0)), (6*5, 8*6)) 
+        if self.hud_strings != (beauty_string, cropped_money): # Only rendered again when a counter changed
+            self.hud_strings = (beauty_string, cropped_money)
+            self.hud_surfs = (TERMINAL_FONT_BIG.render(beauty_string, False, (0, 255, 0)), TERMINAL_FONT_BIG.render(str(cropped_money), False, (255, 255, 0)))
 
-        self.win.blit(beauty_background, (self.win.get_width()-beauty_background.get_width(), 0))
+    def draw_info_ui(self):
+        beauty_background = sprite.BEAUTY_LABEL_ANIMATION.get_frame() # Get the current frame of the beauty label animation
+        money_background = sprite.MONEY_LABEL_ANIMATION.get_frame()
 
+        # Blit everything together, the text is drawn on the window as the animation frames are shared
+        beauty_pos = (self.win.get_width()-beauty_background.get_width(), 0)
         if self.current_room.num == 0:
-            self.win.blit(money_background, (self.win.get_width()-money_background.get_width(), beauty_background.get_height()+6))
+            money_pos = (self.win.get_width()-money_background.get_width(), beauty_background.get_height()+6)
         else:
-            self.win.blit(money_background, (self.win.get_width()-money_background.get_width()-beauty_background.get_width()-6, 0))
+            money_pos = (self.win.get_width()-money_background.get_width()-beauty_background.get_width()-6, 0)
+
+        scene = self.current_room.scene
+        scene.submit(Layer.UI, beauty_background, beauty_pos)
+        scene.submit(Layer.UI, self.hud_surfs[0], (beauty_pos[0]+6*6, beauty_pos[1]+6*6))
+        scene.submit(Layer.UI, money_background, money_pos)
+        scene.submit(Layer.UI, self.hud_surfs[1], (money_pos[0]+6*5, money_pos[1]+8*6))
+        scene.draw_layer(Layer.UI, self.win)
 
     def draw_background(self):
-        self.win.blit(self.current_room.bg_surf, (0, 0))
+        self.current_room.scene.draw_layer(Layer.BACKGROUND, self.win)
         self.transparency_win.fill((0, 0, 0, 0)) # Reset the transparency window
 
     def draw_current_room(self):
@@ -631,7 +710,8 @@ class Game:
         self.current_room.draw_placed_foreground(self.transparency_win)
 
     def draw_bots(self, mouse_pos):
-        self.hivemind.draw(self.win, self.current_room.num, mouse_pos, self.transparency_win)
+        self.hivemind.draw(self.current_room.scene, self.current_room.num, mouse_pos)
+        self.current_room.scene.draw_layer(Layer.BOTS, self.win)
 
     def draw_patterns_and_canva(self):
         if self.current_room.num == 0:
@@ -642,7 +722,8 @@ class Game:
         spawners: list[ParticleSpawner] = self.particle_spawners.get(self.current_room.num, None)
         if spawners is not None:
             for spawner in spawners:
-                spawner.draw_all(self.transparency_win)
+                self.current_room.scene.submit_spawner(spawner)
+        self.current_room.scene.draw_layer(Layer.PARTICLES, self.transparency_win) # also draws the particles of the bots
 
     def draw_gui(self, mouse_pos):
         """Draws the GUI elements based on the current state"""
@@ -653,13 +734,13 @@ class Game:
                     self.spectating_placeable.user_list.draw(self.win)
 
             case State.BUILD:
-                self.win.blit(sprite.BUILD_MODE_BORDER, (0, 0))
+                self.win.blit(sprite.BUILD_MODE_BORDER.get(), (0, 0))
                 mouse_pos_coord = Coord(self.current_room.num, (mouse_pos.x - self.build_mode.get_width() // 2, mouse_pos.y - self.build_mode.get_height() // 2))
                 self.build_mode.show_hologram(self.win, mouse_pos_coord)
                 self.build_mode.show_room_holograms(self.win, self.current_room)
             
             case State.DESTRUCTION:
-                self.win.blit(sprite.DESTRUCTION_MODE_BORDER, (0, 0))
+                self.win.blit(sprite.DESTRUCTION_MODE_BORDER.get(), (0, 0))
                 self.destruction_quit_button.draw(self.win, self.destruction_quit_button.rect.collidepoint(mouse_pos.xy))
 
             case State.DIALOG:
@@ -692,7 +773,8 @@ class Game:
 
     def draw_debug_info(self, mouse_pos : Coord):
         self.win.blit(InfoPopup(
-            f'gui state : {self.gui_state} / fps : {round(self.clock.get_fps())} / mouse : {mouse_pos.get_pixel_perfect()} / $ : {self.money} / th_gold : {self.bot_distributor.theorical_gold} / beauty : {self.beauty} / bot_count {len(self.hivemind.liberated_bots)}').text_surf, (0, 0))
+            f'gui state : {self.gui_state} / {self.pacer.get_report()} / mouse : {mouse_pos.get_pixel_perfect()} / $ : {self.money} / th_gold : {self.bot_distributor.theorical_gold} / beauty : {self.beauty} {self.museum.get_beauty_per_room()} {self.museum.get_beauty_per_tag()} / bot_count {len(self.hivemind.liberated_bots)}').text_surf, (0, 0))
+        self.win.blit(InfoPopup(f'update : {self.scheduler.get_report()}').text_surf, (0, 30)) # Mean time of each subsystem
 
 
 #     __  ______    _____   __   __    ____  ____  ____ 
@@ -703,25 +785,33 @@ class Game:
 
 
     def get_save_dict(self):
-        return {'gold': self.money, 'inventory': self.inventory.inv, "shop": self.shop.inv, "unlocks": self.unlock_manager, "beauty" : self.beauty}
+        return {'gold': self.money, 'inventory': self.inventory.inv, "shop": self.shop.inv, "unlocks": self.unlock_manager, "beauty" : self.beauty, "beauty_per_room" : self.museum.get_beauty_per_room(), "beauty_per_tag" : self.museum.get_beauty_per_tag()}
 
     def main_loop(self) -> dict:
-        fps = self.config['gameplay']['fps']  # Frame rate
         while True:
-            self.clock.tick(fps)  # Maintain frame rate
-            mouse_pos: Coord = Coord(self.current_room.num, pg.mouse.get_pos())  # Coordinates of the mouse (to not call pg.mouse.get_pos() multiple times)
+            steps = self.pacer.tick()  # Maintain frame rate, more than one update is needed if the frame rate was lowered
             events = pg.event.get()  # Get all events from the event queue
+            if not events and not self.dirty and self.can_sleep():
+                events = [pg.event.wait()] # Nothing moves on screen, sleeps until the next input instead of drawing the same frame
+                self.pacer.wake()
+            start = perf_counter() # work of the frame, without the waits
+            if events:
+                self.dirty = True
+            mouse_pos: Coord = Coord(self.current_room.num, pg.mouse.get_pos())  # Coordinates of the mouse (to not call pg.mouse.get_pos() multiple times)
 
             for event in events:
                 if event.type == pg.QUIT:  # Check for quit event
                     return self.get_save_dict() # Return data to be saved in the DB
                 
+                self.pacer.handle_event(event) # Window minimized, hidden, focus lost or back
                 self.event_handler(event, mouse_pos)
             
-            if not self.paused: # If the game is not paused
-                self.update(mouse_pos)
-
-            self.draw(mouse_pos) # Draw the game
-
-
-            pg.display.flip()  # Update the display
\ No newline at end of file
+            for _ in range(steps):
+                if not self.paused: # If the game is not paused
+                    self.update(mouse_pos)
+
+            if self.pacer.should_render() and self.needs_redraw(): # Only the simulation runs while the window is in the background
+                self.draw(mouse_pos) # Draw the game
+                pg.display.flip()  # Update the display
+                self.dirty = False
+            self.pacer.add_work_time((perf_counter() - start) * 1000)
\ No newline at end of file
@@ -10,32 +10,119 @@ Key Features:
 -------------
 - Tracks placed objects and prevents editing of blacklisted items.
 - Handles rendering of placed objects within the room.
-- Calculates the beauty score of a room based on decorative objects.
+- Keeps the beauty score of a room (per tag) up to date when objects are placed or removed.
+- Museum class aggregating the beauty of every floor.
 - Supports animated background.
+- Static backgrounds can be Asset handles, fetched from the asset store each frame.
+- Spatial grid over the placed objects for hover, click and collision queries.
+- Layered scene (core/scene.py) drawing the background and the placed objects in batches.
+- Name, type and blacklist indexes, so the lookups done every frame don't scan the placed objects.
 
 Author: Pouchy (Paul)
 """
 
 from objects.placeable import Placeable
 from utils.anim import Animation
+from utils.assetstore import Asset
+from utils.spatialgrid import SpatialGrid
+from core.scene import Scene, Layer
+from pygame import Surface, Rect
 
 class Room:
     def __init__(self, num, bg_surf = None, anim = None) -> None:
         """Initializes a Room object with a number, background surface, and optional animation for the backgroudn.
-        Blacklist is a list of permanent objects that cannot be edited (they still need to be in self.placed to render the object)."""
+        Blacklist is a set of permanent objects that cannot be edited (they still need to be in self.placed to render the object)."""
         assert bg_surf or anim, "You should define at least one of : bg_surf, anim."
 
         self.size_px = (320,180)
         self.num = num
-        self.placed : list[Placeable] = []
+        self.placed : list[Placeable] = [] # use add_placeable and remove_placeable to keep the grid up to date
+        self.grid = SpatialGrid()
         
         self.anim : Animation = anim
+        self.bg : Surface | Asset = bg_surf
         if self.anim:
-            self.bg_surf = self.anim.get_frame()
-        else:
-            self.bg_surf = bg_surf
+            self.anim_frame = self.anim.get_frame()
         #permanent objects that can not be edited (still place in placed to render the object)
-        self.blacklist : list[Placeable] = []
+        self.blacklist : set[Placeable] = set()
+
+        # indexes of the placed objects, maintained by add_placeable and remove_placeable
+        self.name_count : dict[str, int] = {}
+        self.by_type : dict[type, list[Placeable]] = {}
+
+        # layered draw list of the room (see core/scene.py)
+        self.scene = Scene()
+        self.scene.register(Layer.BACKGROUND, self.get_background_blit_args)
+
+        # beauty of the placed objects, maintained by add_placeable and remove_placeable
+        self.beauty_per_tag : dict[str, float] = {}
+        self.museum : Museum | None = None # set by the museum, notified when the beauty changes
+
+    @property
+    def bg_surf(self) -> Surface:
+        """Returns the current background surface (animation frame, or static background)."""
+        if self.anim:
+            return self.anim_frame
+        if type(self.bg) is Asset:
+            return self.bg.get()
+        return self.bg
+
+    def get_background_blit_args(self):
+        return self.bg_surf, (0, 0)
+
+    def add_placeable(self, placeable : Placeable, blacklisted : bool = False):
+        """Places an object in the room (drawn after the ones already placed in its layer of the scene).
+        Blacklisted objects can't be edited or destroyed by the player."""
+        self.placed.append(placeable)
+        self.grid.insert(placeable, placeable.rect)
+        self.name_count[placeable.name] = self.name_count.get(placeable.name, 0) + 1
+        self.by_type.setdefault(type(placeable), []).append(placeable)
+        self.scene.register(Layer.ANIMATED if placeable.is_animated() else Layer.STATIC, placeable.get_blit_args)
+        if placeable.has_foreground:
+            self.scene.register(Layer.FOREGROUND, placeable.get_foreground_blit_args)
+        if blacklisted:
+            self.blacklist.add(placeable)
+        self.add_beauty(placeable.tag, placeable.beauty)
+
+    def remove_placeable(self, placeable : Placeable):
+        """Removes an object from the room (and from the blacklist)."""
+        self.placed.remove(placeable)
+        self.grid.remove(placeable)
+        self.name_count[placeable.name] -= 1
+        if not self.name_count[placeable.name]:
+            del self.name_count[placeable.name]
+        self.by_type[type(placeable)].remove(placeable)
+        self.scene.unregister(Layer.STATIC, placeable.get_blit_args)
+        self.scene.unregister(Layer.ANIMATED, placeable.get_blit_args)
+        if placeable.has_foreground:
+            self.scene.unregister(Layer.FOREGROUND, placeable.get_foreground_blit_args)
+        self.blacklist.discard(placeable)
+        self.add_beauty(placeable.tag, -placeable.beauty)
+
+    def __contains__(self, placeable : Placeable) -> bool:
+        """Returns True if the object is placed in the room, the grid holds every placed object."""
+        return placeable in self.grid.items
+
+    def get_placeables_of_type(self, *types : type) -> list[Placeable]:
+        """Returns the placed objects of the exact given types (subclasses are not included), in drawing order of each type."""
+        return [placeable for placeable_type in types for placeable in self.by_type.get(placeable_type, ())]
+
+    def add_beauty(self, tag : str | None, beauty : float):
+        """Updates the beauty of the tag, and the museum total."""
+        if not beauty:
+            return
+        self.beauty_per_tag[tag] = self.beauty_per_tag.get(tag, 0) + beauty
+        if self.museum:
+            self.museum.add_beauty(tag, beauty)
+
+    def get_placeables_at(self, xy : tuple[int, int]) -> list[Placeable]:
+        """Returns the placed objects under the point, in drawing order.
+        The grid gives the objects whose rect contains the point, their mask is then checked."""
+        return [placeable for placeable in self.grid.query_point(xy) if placeable.collidepoint(xy)]
+
+    def get_placeables_colliding(self, rect : Rect) -> list[Placeable]:
+        """Returns the placed objects overlapping the rect, in drawing order."""
+        return self.grid.query_rect(rect)
 
     def in_blacklist(self, plcbl : Placeable) -> bool:
         """Check if a Placeable object is in the blacklist."""
@@ -43,30 +130,60 @@ class Room:
     
     def name_exists_in_placed(self, name : str) -> bool:
         """Check if a Placeable object with a specific name exists in the placed list."""
-        for obj in self.placed:
-            if obj.name == name:
-                return True
-        return False
+        return name in self.name_count
     
     def draw_placed(self, win):
-        """Draw all placed objects in the room."""
-        win.blits([placeable.get_blit_args() for placeable in self.placed])
+        """Draw all placed objects in the room, the static ones first."""
+        self.scene.draw_layer(Layer.STATIC, win)
+        self.scene.draw_layer(Layer.ANIMATED, win)
     
     def draw_placed_foreground(self, win):
         """Draw special foreground part of some objects (like the register) in the room."""
-        for placeable in self.placed:
-            placeable.draw_foreground(win)
+        self.scene.draw_layer(Layer.FOREGROUND, win)
     
-    def get_beauty_in_room(self):
-        """Calculate the total beauty score of the room based on decorative objects."""
-        total = 0
-        for placeable in self.placed:
-            if placeable.tag == "decoration":
-                total += placeable.beauty
-        return total
+    def get_beauty_in_room(self) -> float:
+        """Returns the total beauty score of the room based on decorative objects."""
+        return round(self.beauty_per_tag.get("decoration", 0), 6) # rounded to hide the float errors of the incremental sum
     
     def update_sprite(self):
         """Update the background sprite of the room.
         Needs to be called every frame."""
         if self.anim:
-            self.bg_surf = self.anim.get_frame()
\ No newline at end of file
+            self.anim_frame = self.anim.get_frame()
+
+class Museum:
+    def __init__(self, rooms : list[Room]) -> None:
+        """All the floors of the player, with the beauty aggregated over them.
+        The rooms notify the museum when their beauty changes, so the total is always up to date in O(1)."""
+        self.rooms = rooms
+        self.beauty_per_tag : dict[str, float] = {}
+        for room in self.rooms:
+            room.museum = self
+            for tag, beauty in room.beauty_per_tag.items():
+                self.add_beauty(tag, beauty)
+
+    def __getitem__(self, num : int) -> Room:
+        return self.rooms[num]
+
+    def __iter__(self):
+        return iter(self.rooms)
+
+    def __len__(self):
+        return len(self.rooms)
+
+    def add_beauty(self, tag : str | None, beauty : float):
+        self.beauty_per_tag[tag] = self.beauty_per_tag.get(tag, 0) + beauty
+
+    @property
+    def beauty(self) -> float:
+        """Total beauty of the museum, only decorations count."""
+        return round(self.beauty_per_tag.get("decoration", 0), 6)
+
+    def get_beauty_per_room(self) -> dict[int, float]:
+        """Beauty of each floor, used by the debug HUD and saved for the spectator list."""
+        return {room.num : room.get_beauty_in_room() for room in self.rooms}
+
+    def get_beauty_per_tag(self) -> dict[str, float]:
+        """Beauty of each tag of object over all the floors, used by the debug HUD and saved for the spectator list.
+        Only the decorations count in the total, the others are shown apart."""
+        return {str(tag) : round(beauty, 6) for tag, beauty in self.beauty_per_tag.items() if round(beauty, 6)}
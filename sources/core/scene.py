@@ -0,0 +1,71 @@
+r"""
+Projet : Creative Core
+Equipe : Paul Baumard, Abel Bossard, Tybalt Debruyne, Taddeo Boisseuil-Marcil
+  ___  ___ ___ _ __   ___
+ / __|/ __/ _ \ '_ \ / _ \
+ \__ \ (_|  __/ | | |  __/
+ |___/\___\___|_| |_|\___|
+
+Key Features:
+-------------
+- Explicit draw order of a room, split in layers : background, static props, animated props, bots, foreground, particles, UI.
+- Participants (background, placed objects...) are registered once, only them are iterated when drawing their layer.
+- Things that only exist for the current frame (bots, labels...) are submitted each frame.
+- Each layer is drawn with a single fblits call.
+
+Notes:
+------
+Particles are circles drawn with pygame.draw, so their layer calls the spawners instead of batching blits.
+"""
+
+from enum import Enum, auto
+from pygame import Surface
+
+class Layer(Enum):
+    """Layers of a scene, drawn in this order."""
+    BACKGROUND = auto()
+    STATIC = auto() # placed objects whose sprite only changes on hover
+    ANIMATED = auto() # placed objects playing an animation
+    BOTS = auto() # sorted by y by the hivemind before being submitted
+    FOREGROUND = auto() # parts of objects drawn over the bots (the desk)
+    PARTICLES = auto()
+    UI = auto()
+
+class Scene:
+    def __init__(self) -> None:
+        """Layered draw list of a room.
+        Participants are callables returning the (surface, position) to blit, like Placeable.get_blit_args,
+        they are called each time their layer is drawn."""
+        self.participants : dict[Layer, list] = {layer : [] for layer in Layer}
+        self.submitted : dict[Layer, list[tuple[Surface, tuple]]] = {layer : [] for layer in Layer}
+        self.spawners : list = [] # particle spawners submitted for the current frame
+
+    def register(self, layer : Layer, participant):
+        """Adds a participant at the end of the layer."""
+        self.participants[layer].append(participant)
+
+    def unregister(self, layer : Layer, participant):
+        """Removes a participant from the layer, bound methods are equal if they are bound to the same object."""
+        if participant in self.participants[layer]:
+            self.participants[layer].remove(participant)
+
+    def submit(self, layer : Layer, surf : Surface, pos : tuple):
+        """Adds a blit to the layer for the current frame only."""
+        self.submitted[layer].append((surf, pos))
+
+    def submit_spawner(self, spawner):
+        """Adds the particles of a spawner to the particle layer for the current frame only."""
+        self.spawners.append(spawner)
+
+    def get_batch(self, layer : Layer) -> list[tuple[Surface, tuple]]:
+        """Returns every blit of the layer, the registered ones first."""
+        return [participant() for participant in self.participants[layer]] + self.submitted[layer]
+
+    def draw_layer(self, layer : Layer, win : Surface):
+        """Draws the layer in a single batch and clears what was submitted for this frame."""
+        if layer is Layer.PARTICLES:
+            for spawner in self.spawners:
+                spawner.draw_all(win)
+            self.spawners.clear()
+        win.fblits(self.get_batch(layer))
+        self.submitted[layer].clear()
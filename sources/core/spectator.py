@@ -71,7 +71,7 @@ class Spectator:
         # Places placeables in room from inventory
         for placeable in self.game_save_dict['inventory']:
             if placeable.placed:
-                self.rooms[placeable.coord.room_num].placed.append(placeable)
+                self.rooms[placeable.coord.room_num].add_placeable(placeable)
     
     def quit(self):
         """Quit the game"""
@@ -12,7 +12,7 @@ This module loads config, initializes Pygame and starts the game.
 
 Key Features:
 -------------
-- Loading screen when loading the assets.
+- Loading screen with a progress bar when loading the assets, which are decoded in parallel.
 - Loads configuration from a TOML file.
 - Has multiple game modes (online and offline).
 - Loads saved game data from a database.
@@ -46,22 +46,55 @@ def create_display():
 
     return win, transparency_win, load_assets(win, config) # Return the window, transparency window and the sound manager
 
+def draw_loading_bar(win, background, done, total):
+    """
+    Draws the loading screen with a progress bar at the bottom.
+    Called by the parallel loader each time a file is loaded.
+    """
+    pg.event.pump() # Keeps the window responsive while loading
+
+    bar_rect = pg.Rect(0, 0, win.get_width()//2, 24)
+    bar_rect.midbottom = (win.get_width()//2, win.get_height() - 60)
+    filled_rect = bar_rect.copy()
+    filled_rect.width = int(bar_rect.width * done / max(total, 1))
+
+    win.blit(background, (0, 0))
+    pg.draw.rect(win, (40, 40, 40), bar_rect)
+    pg.draw.rect(win, (236, 235, 222), filled_rect)
+    pg.draw.rect(win, (236, 235, 222), bar_rect, 3)
+    pg.display.flip()
+
 def load_assets(win, config):
     """
     Loads the game assets and displays a loading screen while doing so.
     This is done to prevent the game from freezing while loading.
+    Images and sounds are decoded in parallel by a thread pool, the progress bar shows the real progress.
     """
 
     pg.mixer.init()
 
+    from utils.assetstore import ASSETS
+    ASSETS.set_budget(config['memory']['asset_budget']) # Big sprites of the floors the player isn't on are freed past this budget
+    if config['memory']['disk_cache']: # Sprites already scaled during a previous launch are read from the disk instead of being decoded
+        from utils.diskcache import DISK_CACHE
+        DISK_CACHE.open()
+        ASSETS.disk_cache = DISK_CACHE
+
      # Loading backgound while the sounds and sprites load.
-    win.blit(pg.image.load('data/loading_bg.png'),(0,0))
-    pg.display.flip()
+    loading_bg = pg.image.load('data/loading_bg.png').convert()
+    draw_loading_bar(win, loading_bg, 0, 1)
 
-    import ui.sprite # Importing the sprites to load them
+    import ui.sprite
     import utils.sound
+    from utils.loader import ParallelLoader
+
+    sounds = ParallelLoader().load(ui.sprite.get_group_paths("homescreen"), list(utils.sound.SOUND_FILES.values()), ui.sprite.get_group_paths("homescreen", handles=True),
+                                   lambda done, total: draw_loading_bar(win, loading_bg, done, total))
+    ui.sprite.preload("homescreen") # Only the homescreen sprites, the game ones are loaded when launching the game
+    if ASSETS.disk_cache:
+        ASSETS.disk_cache.save() # Only writes something if new sprites were scaled
 
-    return utils.sound.SoundManager(config['sound']['volume'], int) # Just to load the sounds, int is a dummy function
+    return utils.sound.SoundManager(config['sound']['volume'], int, sounds) # Just to load the sounds, int is a dummy function
 
 def place_inventory_items(game_save_dict, rooms):
     """
@@ -69,7 +102,7 @@ def place_inventory_items(game_save_dict, rooms):
     """
     for placeable in game_save_dict['inventory']:
         if placeable.placed:
-            rooms[placeable.coord.room_num].placed.append(placeable)
+            rooms[placeable.coord.room_num].add_placeable(placeable)
 
 def start_game(game_save_dict, win, transparency_win, last_frame_of_homescreen, sound_manager):
     """
@@ -80,6 +113,16 @@ def start_game(game_save_dict, win, transparency_win, last_frame_of_homescreen,
     pg.display.set_icon(pg.image.load('data/big_icon.png'))
     pg.display.set_caption('Creative Core')
 
+    # Loads the game sprites at once instead of during the first frames, on top of the last frame of the homescreen
+    import ui.sprite
+    from utils.loader import ParallelLoader
+    ParallelLoader().load(ui.sprite.get_group_paths("game"), native_paths=ui.sprite.get_group_paths("game", handles=True),
+                          on_progress=lambda done, total: draw_loading_bar(win, last_frame_of_homescreen, done, total))
+    ui.sprite.preload("game")
+    from utils.assetstore import ASSETS
+    if ASSETS.disk_cache:
+        ASSETS.disk_cache.save()
+
     from core.logic import Game
     from utils.room_config import ROOMS
     
@@ -98,6 +141,9 @@ def main():
     win, transparency_win,sound_manager  = create_display()
 
     while True:
+        from utils.assetstore import ASSETS
+        ASSETS.set_active_groups(["homescreen"]) # Keeps the homescreen background in memory until the game starts
+
         if not config['gameplay']['offline_mode']: # If online mode is enabled
             from core.homescreen import OnlineHomescreen
             homescreen = OnlineHomescreen(config['server']['ip'], config['server']['port']) 
@@ -110,9 +156,9 @@ def main():
             homescreen.database.save_user_data(username, data_to_save) # Save game data to database on the right user
 
         else: # If offline mode is enabled
-            from utils.room_config import DEFAULT_SAVE
             from core.homescreen import OfflineHomescreen
             last_frame_of_homescreen = OfflineHomescreen().main_loop(win) # Display offline homescreen
+            from utils.room_config import DEFAULT_SAVE # Builds the rooms, so only once the homescreen is left
             start_game(DEFAULT_SAVE, win, transparency_win, last_frame_of_homescreen, sound_manager) # Start game with default save data
 
 if __name__ == "__main__": 
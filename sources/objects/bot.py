@@ -48,9 +48,9 @@ Author: Pouchy (Paul), with help from Tioh, Ytyt, and Leih.
 
 from enum import Enum, auto
 from utils.coord import Coord
-from pygame import Surface, Rect, transform
 from random import choice, randint
 from core.room import Room
+from core.scene import Scene, Layer
 from utils.room_config import R1
 import ui.sprite as sprite
 from utils.timermanager import TimerManager
@@ -258,8 +258,8 @@ class Hivemind:
                 self.inline_bots[i].target_coord.x = self.x_lookup_table[i+1]+randint(-30,30) #randomize the x coord a bit
                 self.inline_bots[i], self.inline_bots[i+1] = self.inline_bots[i+1], self.inline_bots[i] #swap the bots
 
-    def draw(self, win : Surface, current_room_num : int, mouse_pos: Coord, transparency_win): 
-        """Draws the bots on the window.  
+    def draw(self, scene : Scene, current_room_num : int, mouse_pos: Coord): 
+        """Submits the bots of the current room to the bots layer of the scene.  
         Sorts the bots by y axis to respect perspective when rendering."""
         #list of background bots
         list_of_bots = [bot for bot in self.inline_bots if type(bot) is Bot] + self.liberated_bots
@@ -268,11 +268,11 @@ class Hivemind:
         #updates the placeable to follow the last bot's animation
         if self.bot_placeable_pointer and type(self.inline_bots[-1]) is Bot and current_room_num == 1:
             self.bot_placeable_pointer.surf = self.inline_bots[-1].surf
-            self.inline_bots[-1].draw_exclamation_over_bot(win)
+            self.inline_bots[-1].draw_exclamation_over_bot(scene)
             if not hasattr(self, 'exclamation_label'):
                 self.exclamation_label = TERMINAL_FONT.render("Cliquez moi dessus !", True, STANDARD_COLOR)
                 self.height_incr = 0
-            win.blit(self.exclamation_label, (self.inline_bots[-1].coord.x + 20, self.inline_bots[-1].coord.y - 40 + sin(self.height_incr)*5))
+            scene.submit(Layer.BOTS, self.exclamation_label, (self.inline_bots[-1].coord.x + 20, self.inline_bots[-1].coord.y - 40 + sin(self.height_incr)*5))
             self.height_incr += 0.1
             
 
@@ -280,7 +280,7 @@ class Hivemind:
         for bot in sorted_bots:
             if bot.coord.room_num == current_room_num: # update only the bots in the current room for performance
                 bot.particle_logic()
-                bot.draw(win, mouse_pos, transparency_win)
+                bot.draw(scene, mouse_pos)
     
     def sorted_bot_by_y(self, bots : list):
         """Sorts bots depending on y axis, to be blited in the right order (to respect perspective when rendering)  
@@ -320,14 +320,12 @@ class Hivemind:
             #create a clickable to let robots enter
             bot_placeable = subplaceable.BotPlaceable('bot_placeable', last_bot.coord, last_bot.surf)
             self.bot_placeable_pointer = bot_placeable
-            R1.placed.append(bot_placeable)
-            R1.blacklist.append(bot_placeable)
+            R1.add_placeable(bot_placeable, blacklisted=True)
     
     def remove_last_bot_clickable(self, current_room : Room):
         """removes the clickable that lets robots enter"""
-        if self.bot_placeable_pointer and self.bot_placeable_pointer in current_room.placed:
-            current_room.placed.remove(self.bot_placeable_pointer)
-            current_room.blacklist.remove(self.bot_placeable_pointer)
+        if self.bot_placeable_pointer and self.bot_placeable_pointer in current_room:
+            current_room.remove_placeable(self.bot_placeable_pointer) # also removes it from the blacklist
             self.bot_placeable_pointer = None
 
 class Bot:
@@ -357,6 +355,7 @@ class Bot:
         self.anim_walk_right = Animation(anim_spritesheet, 0, spritesheet_lengths[0], 2)
         self.anim_walk_left = Animation(anim_spritesheet, 1, spritesheet_lengths[1], 2)
         self.anim_idle_right = Animation(anim_spritesheet, 2, spritesheet_lengths[2], 2)
+        self.anim_idle_left = Animation(anim_spritesheet, 2, spritesheet_lengths[2], 2, flip=(False, True)) # flipped once by the spritesheet, so the mask and outline caches hit
         self.anim_watch = Animation(anim_spritesheet, 3, spritesheet_lengths[3], 6, False)
         self.exclamation_anim = Animation(sprite.EXCLAMATION_SPRITESHEET, 0, 9, 3)
 
@@ -436,7 +435,7 @@ class Bot:
             case "RIGHT":
                 self.surf = self.anim_idle_right.get_frame()
             case "LEFT":
-                self.surf = transform.flip(self.anim_idle_right.get_frame(), False, True)
+                self.surf = self.anim_idle_left.get_frame()
 
     def update_walk_animation(self):
         match self.move_dir:
@@ -445,9 +444,13 @@ class Bot:
             case "LEFT":
                 self.surf = self.anim_walk_left.get_frame()
 
+    def is_hovered(self, mouse_pos: Coord) -> bool:
+        """Pixel perfect hit test with the cached mask of the current frame."""
+        return self.coord.room_num == mouse_pos.room_num and sprite.mask_collidepoint(self.surf, self.coord.xy, mouse_pos.xy)
+
     def handle_click(self, mouse_pos: Coord, launch_dialogue_func):
         """Handles user interaction when the bot is clicked."""
-        if self.is_reacting and self.coord.room_num == mouse_pos.room_num and Rect(self.coord.x, self.coord.y, self.rect.width, self.rect.height).collidepoint(mouse_pos.xy): # if the bot is reacting and the mouse is over the bot
+        if self.is_reacting and self.is_hovered(mouse_pos): # if the bot is reacting and the mouse is over the bot
             self.is_reacting = False
             launch_dialogue_func(self.anim_idle_right) # launch the dialogue
 
@@ -509,34 +512,33 @@ class Bot:
             if key not in ['left_dust', 'right_dust']:
                 particle_data[0].spawn()
 
-    def draw(self, win: Surface, mouse_pos: Coord, transparency_win: Surface):
-        """ Draws the bot on the window.  
+    def draw(self, scene: Scene, mouse_pos: Coord):
+        """ Submits the bot to the scene of the room, it is drawn with the other bots in a single batch.  
         Needs to be called after hivemind.update_bot_ai."""
-        self.draw_outline_if_reacting(win, mouse_pos)
-        self.draw_bot(win)
+        self.draw_outline_if_reacting(scene, mouse_pos)
+        self.draw_bot(scene)
         if self.is_reacting:
-            self.draw_exclamation_over_bot(win)
-        self.draw_particles(transparency_win)
+            self.draw_exclamation_over_bot(scene)
+        self.draw_particles(scene)
 
-    def draw_outline_if_reacting(self, win: Surface, mouse_pos: Coord):
+    def draw_outline_if_reacting(self, scene: Scene, mouse_pos: Coord):
         """Draws an outline around the bot if it is reacting and the mouse is over it."""
-        if self.is_reacting and self.coord.room_num == mouse_pos.room_num and Rect(self.coord.x, self.coord.y, self.rect.width, self.rect.height).collidepoint(mouse_pos.xy):
-            temp_surf = sprite.get_outline(self.surf, (170, 170, 230))
-            temp_surf.blit(self.surf, (3, 3))
-            win.blit(temp_surf, (self.coord.x - 3, self.coord.y - 3))
+        if self.is_reacting and self.is_hovered(mouse_pos):
+            # the bot itself is drawn on top of the outline by draw_bot
+            scene.submit(Layer.BOTS, sprite.get_cached_outline(self.surf, (170, 170, 230)), (self.coord.x - 3, self.coord.y - 3))
 
-    def draw_bot(self, win: Surface):
-        win.blit(self.surf, self.coord.xy)
+    def draw_bot(self, scene: Scene):
+        scene.submit(Layer.BOTS, self.surf, self.coord.xy)
 
-    def draw_exclamation_over_bot(self, win: Surface):
+    def draw_exclamation_over_bot(self, scene: Scene):
         """Draws an exclamation mark above the bot if it is reacting."""
         coord_over_head_of_bot = (self.coord.x + (self.surf.get_width() // 2) - 6, self.coord.y - 10 * 6)
-        win.blit(self.exclamation_anim.get_frame(), coord_over_head_of_bot)
+        scene.submit(Layer.BOTS, self.exclamation_anim.get_frame(), coord_over_head_of_bot)
 
-    def draw_particles(self, transparency_win: Surface):
-        """Draws the particles eventually associated with the bot."""
+    def draw_particles(self, scene: Scene):
+        """Adds the particles eventually associated with the bot to the particle layer."""
         for particle_data in self.particle_spawners.values():
-            particle_data[0].draw_all(transparency_win)
+            scene.submit_spawner(particle_data[0])
 
     def __repr__(self):
         return str(self.__dict__)
\ No newline at end of file
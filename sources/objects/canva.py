@@ -13,15 +13,17 @@ This module manages the game's art system, including the canvas and painting mec
 Key Features:
 -------------
 - Provides UI elements for painting and saving.
-- Arm and sprayer animation using inverse kinematics.
-- Color selection and painting mechanics.
+- Arm and sprayer animation using inverse kinematics, the painting itself is animated by the queued paint jobs (objects/paintjob.py).
+- Color selection and painting mechanics, the paint layer is composited from the patterns by the stencil engine (objects/stencil.py).
+- Live preview of the painting over the canvas, updated while the patterns are dragged.
+- Undo/redo of the paintings (Ctrl+Z / Ctrl+Y), only the painted tiles of the canvas are saved (objects/history.py).
+- Freehand spray with the right mouse button (objects/spraybrush.py).
 - Numerous popups for user feedback and information.
 - Particle effects for painting animations.
 
 Notes:
 ------
 Definitely needs to be refactored to separate the UI elements from the game logic, however, the current implementation is functional.
-The animation handler should be moved to a separate module.
 
 Author: Ytyt (Tybalt) (with contributions from Paul)
 """
@@ -29,15 +31,21 @@ Author: Ytyt (Tybalt) (with contributions from Paul)
 import pygame as pg
 from utils.coord import Coord
 from objects.placeable import Placeable
+from objects.placeablesubclass import PaintingPlaceable
 from objects.patterns import Pattern
 from ui.inputbox import InputBox
-from ui.sprite import FRAME_PAINTING, invert_alpha, PAINT_BUTTON, SAVE_BUTTON, CANVA_UI_NAME, CANVA_UI_PAINT, whiten, ARM, SPRAYER, point_rotate, inverse_kinematics, get_locked_surface, COLOR_BUTTON_BG
+from ui.sprite import PAINT_BUTTON, SAVE_BUTTON, CANVA_UI_NAME, CANVA_UI_PAINT, whiten, ARM, SPRAYER, cached_point_rotate, ROTATION_STEP, inverse_kinematics, get_locked_surface, COLOR_BUTTON_BG
 from ui.button import Button
 from ui.confirmationpopup import ConfirmationPopup
 from ui.infopopup import InfoPopup
 from utils.fonts import TERMINAL_FONT_VERYBIG
-from math import sqrt, ceil, pi, sin
-from objects.particlesspawner import CircleParticleSpawner, ParticleSpawner
+from math import pi, sin
+from collections import deque
+from objects.paintjob import PaintJob
+from objects.stencil import StencilEngine
+from objects.history import CanvaHistory
+from objects.tiledcanvas import TiledCanvas
+from objects.spraybrush import SprayBrush
 from utils.sound import SoundManager
 
 COLORS = [(11,23,33), (105,117,130), (213,226,240),(141,171,131) , (217,137,76), (232, 216, 153), (194, 49, 47), (117, 97, 156), (91, 138, 203), (42,30,66)]
@@ -45,6 +53,8 @@ COLORS = [(11,23,33), (105,117,130), (213,226,240),(141,171,131) , (217,137,76),
 offsetx = -60 # Needed to adjust the position of the control panel, because sadly it was not written with relative coordinates
 offsety = -90
 
+PREVIEW_ALPHA = 110 # opacity of the live preview of the painting
+
 class Canva:
     def __init__(self, coord : Coord, game, color_buttons_unlocked=False): 
         """Initialize the Canva object with its properties and UI elements."""
@@ -52,9 +62,9 @@ class Canva:
 
         # Set the size and surface of the canvas
         self.size = (672,1020)
-        self.surf = pg.Surface(self.size)
         self.bg_color = (236, 235, 222)
-        self.surf.fill(self.bg_color)
+        self.canvas = TiledCanvas(self.size, self.bg_color) # the paintings only rewrite the tiles they paint (see objects/tiledcanvas.py)
+        self.surf = self.canvas.surf
         
         # Set the rectangle and position of the canvas
         self.rect = self.surf.get_rect()
@@ -87,8 +97,8 @@ class Canva:
         # Initialize robotic arm properties
         self.arm_root = (522, 469)
         self.default_target = (605, 454)
-        self.arm = {'surf' : ARM.copy(), 'len' : ARM.copy().get_size()[0], 'angle' : 0}
-        self.forearm = {'surf' : ARM.copy(), 'len' : ARM.copy().get_size()[0], 'angle' : 0}
+        self.arm = {'surf' : ARM, 'len' : ARM.get_width(), 'angle' : 0} # shared sprite, its rotations are cached (see cached_point_rotate)
+        self.forearm = {'surf' : ARM, 'len' : ARM.get_width(), 'angle' : 0}
         self.arm['angle'], self.forearm['angle'] = inverse_kinematics(self.default_target, self.arm_root, self.arm['len'], self.forearm['len'])
 
         # Set the current color for painting
@@ -96,8 +106,18 @@ class Canva:
 
         self.color_gauge_incr = -pi
 
-        # Initialize the animation handler
-        self.animation_handler = CanvaAnimationHandler(self)
+        # Queue of the paintings to animate, advanced by the game updates (see objects/paintjob.py)
+        self.paint_jobs : deque[PaintJob] = deque()
+
+        # Coverage of the placed patterns, the paint layer is only recomposited when they change (see objects/stencil.py)
+        self.stencil_engine = StencilEngine(self.size)
+        self.preview : pg.Surface | None = None # what the next painting will look like, drawn over the canvas
+
+        # Undo/redo of the paintings, starts over with each new canvas (see objects/history.py)
+        self.history = CanvaHistory(self.canvas)
+
+        # Freehand painting with the right mouse button (see objects/spraybrush.py)
+        self.brush = SprayBrush(self)
 
     def change_color(self, color):
         """Change the current color used for painting.""" 
@@ -143,9 +163,8 @@ class Canva:
 
     def get_placeable(self) -> Placeable:
         """Create and return a Placeable object from the current canvas.""" 
-        scaled_surf = pg.transform.scale_by(self.surf.copy(),0.5).convert()
-        FRAME_PAINTING.blit(scaled_surf,(12,12))
-        placeable = Placeable(self.name, self.coord.copy(), FRAME_PAINTING.copy(), beauty=self.total_beauty, tag="decoration", flags=["static"])
+        thumbnail = self.canvas.get_thumbnail() # half size, nearest neighbour so the colors of the canvas are kept for the palette
+        placeable = PaintingPlaceable(self.name, self.coord.copy(), thumbnail, beauty=self.total_beauty)
         self.reset()
         return placeable
     
@@ -174,48 +193,78 @@ class Canva:
             self.total_beauty = round(self.total_beauty, 2)
     
     def reset(self):
-        """Reset the canvas to its initial state.""" 
+        """Reset the canvas to its initial state.
+        The particles of the queued paintings are removed, the paintings themselves are dropped with the canvas.""" 
+        for job in self.paint_jobs:
+            job.cancel()
         self.__init__(self.coord, self.game, self.color_buttons_unlocked)
     
-    def get_round_mask(self, surface : pg.Surface, xy : tuple, circle_radius):
-        """Create and return a circular mask for the given surface.""" 
-        circle_surf = pg.Surface((circle_radius * 2, circle_radius * 2), pg.SRCALPHA)
-        pg.draw.circle(circle_surf, (255, 255, 255, 255), (circle_radius, circle_radius), circle_radius)
+    def get_stencils(self) -> list[tuple[pg.Surface, tuple[int, int]]]:
+        """Returns the placed patterns as stencils, positioned relatively to the canvas."""
+        return [(pattern.true_pattern, (pattern.rect.x - self.coord.x, pattern.rect.y - self.coord.y)) for pattern in self.placed_patterns]
+
+    def update_preview(self):
+        """Update the live preview of the painting, with the held pattern where it would be dropped.
+        Only the rects of the patterns that moved since the last update are recomposited."""
+        stencils = self.get_stencils()
+        if self.holded_pattern:
+            stencils.append((self.holded_pattern.true_pattern, (self.holded_pattern.rect.x - self.coord.x, self.holded_pattern.rect.y - self.coord.y)))
+        self.preview = self.stencil_engine.get_preview(stencils, self.current_color)
+        self.preview.set_alpha(PREVIEW_ALPHA)
 
-        circle_surf.blit(surface, (-xy[0], -xy[1]), special_flags=pg.BLEND_RGBA_MIN)
-        return circle_surf
-    
     def get_next_surf(self):
-        """Generate and return the next surface to be painted.
-        This was tiedious to write, but it's a simple function.""" 
-        next_surf = pg.Surface(self.size)
-        next_surf = next_surf.convert_alpha()
-        next_surf.fill((0,0,0,0))
-
-        for pattern in self.placed_patterns:
-            self.draw_pattern(next_surf, pattern) # Draw the pattern on the next surface
-
-        invert_alpha(next_surf) # Invert the alpha channel of the next surface
-        
-            
-        next_surf.fill(self.current_color+tuple([0]), special_flags=pg.BLEND_RGBA_MAX) # Fill the next surface with the current color, using the maximum alpha value, a clever use of that filter
-        return next_surf
+        """Return the next surface to be painted : the current color, transparent under the placed patterns.
+        Composited by the stencil engine, which keeps the result while the patterns and the color don't change."""
+        return self.stencil_engine.get_paint_layer(self.get_stencils(), self.current_color)
     
     def start_painting(self):
         """Start the painting process if the player has enough money.""" 
+        self.brush.end() # the stroke has to be in the history before the painting
         if self.check_price(self.get_price()): # Check if the player has enough money
-            self.game.sound_manager.mite.play()
-            self.animation_handler.start_anim(self.get_next_surf()) # Start the painting animation
+            beauty = round(sum(pattern.beauty for pattern in self.placed_patterns), 2)
+            self.paint_jobs.append(PaintJob(self, self.get_next_surf(), self.current_color, beauty)) # Queue the painting animation, it starts after the previous ones
             self.add_to_beauty(self.placed_patterns) # Add the beauty value of the patterns to the total beauty
-            
-    
-    def draw_pattern(self, surf, pattern : Pattern):
-        """Imprint the pattern on the given surface.""" 
-        relative_pos = (pattern.rect.x - self.coord.x,
-                        pattern.rect.y - self.coord.y)
 
-        surf.blit(pattern.get_effect(), relative_pos)
+    def is_painting(self) -> bool:
+        return bool(self.paint_jobs) or self.brush.active
+
+    def undo(self):
+        """Undo the last painting, its beauty is removed but the money isn't given back."""
+        if self.is_painting(): # The paint jobs write in the canvas, and add their own entries
+            self.game.popups.append(InfoPopup("Attendez la fin de la peinture !"))
+            self.game.sound_manager.incorrect.play()
+            return
+        entry = self.history.undo()
+        if entry is None:
+            self.game.sound_manager.incorrect.play()
+            return
+        self.total_beauty = round(self.total_beauty - entry.beauty, 2)
 
+    def redo(self):
+        """Redo the last undone painting."""
+        if self.is_painting():
+            self.game.popups.append(InfoPopup("Attendez la fin de la peinture !"))
+            self.game.sound_manager.incorrect.play()
+            return
+        entry = self.history.redo()
+        if entry is None:
+            self.game.sound_manager.incorrect.play()
+            return
+        self.total_beauty = round(self.total_beauty + entry.beauty, 2)
+
+    def update_painting(self, dt : float):
+        """Advances the painting animations by dt seconds, called on each update of the game.
+        The time left by a finished job is given to the next one.
+        Also stamps the stroke of the brush, once per update whatever the number of mouse motions."""
+        if self.brush.active and not pg.mouse.get_pressed()[2]: # released while the canvas didn't get the events (other floor, other GUI)
+            self.brush.end()
+        self.brush.update()
+        while self.paint_jobs and dt > 0:
+            dt = self.paint_jobs[0].step(dt)
+            if not self.paint_jobs[0].finished:
+                break
+            self.paint_jobs.popleft()
+    
     def place_pattern(self, pattern : Pattern):
         """Place a moveable pattern on the canvas.""" 
         self.placed_patterns.append(pattern)
@@ -249,6 +298,10 @@ class Canva:
 
     def attempt_save(self):
         """Attempt to save the current canvas.""" 
+        if self.is_painting(): # The canvas is reset when saved, the queued paintings would be lost
+            self.game.popups.append(InfoPopup("Attendez la fin de la peinture !"))
+            self.game.sound_manager.incorrect.play()
+            return
         # Set the canvas name from the input box and show a confirmation popup
         self.name = self.name_input.text
         self.game.confirmation_popups.append(ConfirmationPopup(self.game.win, "Sauvegarder la toile ?", self.game.save_canva))
@@ -258,6 +311,10 @@ class Canva:
         # Draw the canvas surface
         win.blit(self.surf, self.coord.xy)
 
+        # Draw the live preview of the painting, only once there is a pattern to paint with
+        if self.preview and (self.placed_patterns or self.holded_pattern):
+            win.blit(self.preview, self.coord.xy)
+
         # Draw all placed patterns on the canvas
         for placed_pattern in self.placed_patterns:
             placed_pattern.draw(win)
@@ -301,27 +358,29 @@ class Canva:
         self.blit_arms(win)
     
     def blit_arms(self, win):
-        """Draw the robotic arms on the given window surface.""" 
+        """Draw the robotic arms on the given window surface.
+        The angles are rounded to the step of the rotation cache, so the joints match the cached rotated images.""" 
+        arm_angle = round(self.arm['angle'] / ROTATION_STEP) * ROTATION_STEP
+        forearm_angle = round(self.forearm['angle'] / ROTATION_STEP) * ROTATION_STEP
+
         # Rotate and draw the arm
-        rotated_surf, rect = point_rotate(self.arm['surf'], self.arm_root, (5,5), -self.arm['angle'])
+        rotated_surf, rect = cached_point_rotate(self.arm['surf'], self.arm_root, (5,5), -arm_angle)
         relative_arm_vector = pg.Vector2(self.arm['len'], 0)
-        rotated_arm_vector = relative_arm_vector.rotate(self.arm['angle'])
+        rotated_arm_vector = relative_arm_vector.rotate(arm_angle)
         # The position of the 'elbow' of the arm by adding the arm vector to the root
         global_arm_end_pos = rotated_arm_vector + pg.Vector2(self.arm_root)
 
         # Rotate and draw the forearm
-        rotated_surf2, rect2 = point_rotate(self.forearm['surf'], global_arm_end_pos, (5,5), -self.forearm['angle'])
+        rotated_surf2, rect2 = cached_point_rotate(self.forearm['surf'], global_arm_end_pos, (5,5), -forearm_angle)
         relative_forearm_vector = pg.Vector2(self.forearm['len'], 0)
-        rotated_forearm_vector = relative_forearm_vector.rotate(self.forearm['angle'])
+        rotated_forearm_vector = relative_forearm_vector.rotate(forearm_angle)
         # The position of the'hand' of the arm by adding all the vectors
         global_forearm_end_pos = rotated_forearm_vector + rotated_arm_vector + pg.Vector2(self.arm_root) 
 
         # Draw the sprayer at the end of the forearm
         sprayer_rect = SPRAYER.get_rect(center = global_forearm_end_pos)
 
-        win.blit(rotated_surf, rect)
-        win.blit(rotated_surf2, rect2)
-        win.blit(SPRAYER, sprayer_rect)
+        win.fblits([(rotated_surf, rect), (rotated_surf2, rect2), (SPRAYER, sprayer_rect)])
 
     def handle_event(self, event):
         """Handle user input events.""" 
@@ -336,11 +395,26 @@ class Canva:
         for button in self.color_buttons:
             button.handle_event(event)
 
+        # Ctrl+Z / Ctrl+Y to undo / redo the paintings, unless the name is being typed
+        if event.type == pg.KEYDOWN and event.mod & pg.KMOD_CTRL and not self.name_input.active:
+            if event.key == pg.K_z:
+                self.undo()
+            elif event.key == pg.K_y:
+                self.redo()
+
         # Check if a pattern is clicked and hold it
         eventual_collided_pattern = [pattern for pattern in self.placed_patterns if pattern.rect.collidepoint(mouse_pos)]
-        if event.type == pg.MOUSEBUTTONDOWN and eventual_collided_pattern:
+        if event.type == pg.MOUSEBUTTONDOWN and event.button == 1 and eventual_collided_pattern:
             self.hold_pattern(eventual_collided_pattern[0])
 
+        # Spray with the right mouse button, the motions are only recorded here
+        if event.type == pg.MOUSEBUTTONDOWN and event.button == 3 and self.rect.collidepoint(mouse_pos) and not self.holded_pattern:
+            self.brush.start(mouse_pos)
+        elif event.type == pg.MOUSEMOTION:
+            self.brush.add_sample(event.pos, event.buttons)
+        elif event.type == pg.MOUSEBUTTONUP and event.button == 3:
+            self.brush.end()
+
         # Handle the held pattern's movement and dropping
         if self.holded_pattern:
             if event.type == pg.MOUSEBUTTONUP:
@@ -349,126 +423,8 @@ class Canva:
             if event.type == pg.MOUSEMOTION:
                 self.holded_pattern.rect.center = Coord(0, mouse_pos).get_pixel_perfect()
 
+        # Keep the preview in sync with the patterns and the color (does nothing if they didn't change)
+        if event.type in (pg.MOUSEMOTION, pg.MOUSEBUTTONDOWN, pg.MOUSEBUTTONUP):
+            self.update_preview()
+
         return False
-    
-class CanvaAnimationHandler:
-    """
-    A handler class for managing painting animations on a Canva object.
-    """
-    def __init__(self, canva):
-        """Initialize the AnimationHandler with a reference to the Canva object.""" 
-        self.canva : Canva = canva
-
-    def start_anim(self, next_surf):
-        """Start the painting animation with the given surface.
-        This is a sort of turtle graphics implementation.""" 
-        # Define the radius of the circular mask and the step size for the painting animation
-        circle_radius = 120
-        step = 25
-
-        # Calculate optimal corner and height for the circular mask
-        optimal_corner = ceil((circle_radius - (circle_radius * sqrt(2) / 2))) #ceil is used to round up to the nearest integer
-        optimal_height = ceil(circle_radius * sqrt(2))
-        width = (self.canva.size[0] - (circle_radius + optimal_corner))
-
-        # Initialize the paint gun position
-        paint_gun_pos = [-optimal_corner-100, -optimal_corner+self.canva.size[1]//2-25]
-
-        # Create particle spawners for the painting animation
-        center = Coord(0, (self.canva.coord.x + paint_gun_pos[0] + circle_radius, self.canva.coord.y + paint_gun_pos[1] + circle_radius))
-        static_particles, aura_particles = self.create_particles(center, circle_radius)
-
-        # Add the particle spawners to the particle spawner list
-        self.canva.game.particle_spawners[0] += [static_particles, aura_particles]
-
-        # Create the path stack for the painting animation
-        path_stack = self.create_path_stack(width, optimal_height)
-        current_dir = path_stack.pop()
-
-        # Initialize animation state variables
-        active = False
-        static_particles.active = False
-        aura_particles.active = False
-
-        # Create a copy of the current canvas surface to apply the next surface
-        true_next_surf = self.canva.surf.copy()
-        true_next_surf.blit(next_surf, (0, 0))
-
-        # Initialize the clock for controlling the animation frame rate
-        clock = pg.time.Clock()
-
-        # Start the painting animation loop
-        while path_stack or current_dir[1] > 0:
-            clock.tick(60)
-
-            # Check if the current direction step is completed
-            if current_dir[1] <= 0:
-                current_dir = path_stack.pop()
-
-            # Toggle the active state of the particles and animation
-            if current_dir == 'toggle':
-                active = not active
-                static_particles.active = not static_particles.active
-                aura_particles.active = not aura_particles.active
-                current_dir = path_stack.pop()
-
-            # Apply the circular mask to the canvas surface if active
-            if active:
-                self.canva.surf.blit(self.canva.get_round_mask(next_surf, tuple(paint_gun_pos), circle_radius), paint_gun_pos)
-
-            # Decrease the current direction step by the step size
-            current_dir[1] -= step
-
-            # Calculate the next step size
-            next_step = step + current_dir[1] if current_dir[1] < 0 else step
-
-            # Update the paint gun position based on the current direction and step size
-            self.update_paint_gun_pos(current_dir[0], paint_gun_pos, next_step)
-
-            # Update the center position for the particle spawners
-            mouse_pos = Coord(0, pg.mouse.get_pos())
-            center.xy = (self.canva.coord.x + paint_gun_pos[0] + circle_radius, self.canva.coord.y + paint_gun_pos[1] + circle_radius)
-
-            # Update and draw the game state
-            self.canva.game.update(mouse_pos)
-            self.canva.game.draw(mouse_pos)
-            self.canva.blit_arms(self.canva.game.win)
-
-            # Update the angles of the robotic arms based on the new center position
-            self.canva.arm['angle'], self.canva.forearm['angle'] = inverse_kinematics(center.xy, self.canva.arm_root, self.canva.arm['len'], self.canva.forearm['len'])
-
-            # Refresh the display
-            pg.display.flip()
-
-        # Finalize the painting animation by setting the canvas surface to the true next surface
-        self.canva.surf = true_next_surf
-        static_particles.active = False
-        aura_particles.active = False
-
-        # Schedule the removal of the particle spawners after all the particles should've vanish
-        self.canva.game.timer.create_timer(5, self.canva.game.particle_spawners[0].remove, arguments=[static_particles])
-        self.canva.game.timer.create_timer(5, self.canva.game.particle_spawners[0].remove, arguments=[aura_particles])
-
-    def create_particles(self, center, circle_radius):
-        """Create and return static and aura particle spawners.""" 
-        static_particles = CircleParticleSpawner(center, circle_radius, pg.Vector2(0, 0), self.canva.current_color, 600, density=10, dir_randomness=0, radius=(10, 20))
-        aura_particles = ParticleSpawner(center, pg.Vector2(0, 0), self.canva.current_color, 60, dir_randomness=2)
-        return static_particles, aura_particles
-
-    def create_path_stack(self, width, optimal_height):
-        """Create and return the path stack for the painting animation.""" 
-        return [["U", self.canva.size[1]//2], ["L", 100-25], 'toggle', ["L", width+25], ["D", optimal_height], ["R", width], ["D", optimal_height],
-                ["L", width], ["D", optimal_height], ["R", width], ["D", optimal_height],
-                ["L", width], ["D", optimal_height], ["R", width], 'toggle', ["R", 100], ["U", self.canva.size[1]//2-25]]
-
-    def update_paint_gun_pos(self, direction, paint_gun_pos, step):
-        """Update the paint gun position based on the current direction and step.""" 
-        match direction:
-            case "R":
-                paint_gun_pos[0] += step
-            case "L":
-                paint_gun_pos[0] -= step
-            case "D":
-                paint_gun_pos[1] += step
-            case "U":
-                paint_gun_pos[1] -= step
\ No newline at end of file
@@ -85,6 +85,12 @@ class Dialogue:
         else:
             self.bliting_list[self.part_ind - (self.page * self.page_size)] = self.get_text_surf(bot_name)  # Update line
 
+    def is_typing(self) -> bool:
+        """
+        Check if the text of the current part is still being animated.
+        """
+        return self.showed_texte != self.anim_chars
+
     def is_on_last_part(self):
         """
         Check if the dialogue is on the last part.
@@ -179,6 +185,28 @@ class DialogueManager:
         """  # Default bot name
         self.selected_dialogue.update(npc_name)  # Update the dialogue with the bot name
 
+    def is_typing(self) -> bool:
+        """
+        Check if the current dialogue is still being animated, the dialog box has to be drawn every frame.
+        """
+        return self.selected_dialogue.is_typing()
+
+    def is_idle(self) -> bool:
+        """
+        Check if the dialog box won't change until the next click (text fully typed and no bot animation).
+        """
+        return not self.is_typing() and type(self.npc_icon) != Animation
+
+    def update_icon(self) -> bool:
+        """
+        Advance the bot animation and return True if its frame changed.
+        Lets the game draw the paused dialog only when something changed.
+        """
+        if type(self.npc_icon) != Animation:
+            return False
+        previous_frame = self.npc_icon.current_frame
+        return self.npc_icon.get_frame() is not previous_frame
+
     def draw(self, screen: pg.Surface):
         """
         Draw the dialogue and bot animation on the screen.
@@ -190,7 +218,7 @@ class DialogueManager:
 
         if self.npc_icon:
             if type(self.npc_icon) == Animation:
-                scaled_bot_surface = pg.transform.scale2x(self.npc_icon.get_frame())  # Scale the bot animation
+                scaled_bot_surface = pg.transform.scale2x(self.npc_icon.get_current_frame())  # Scale the bot animation, advanced by update_icon
             else:
                 scaled_bot_surface = pg.transform.scale2x(self.npc_icon)
             scaled_bot_rect = scaled_bot_surface.get_rect(bottomright=(504, 1050))  # Get the rect for the bot animation
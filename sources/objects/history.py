@@ -0,0 +1,134 @@
+r"""
+Projet : Creative Core
+Equipe : Paul Baumard, Abel Bossard, Tybalt Debruyne, Taddeo Boisseuil-Marcil
+ _     _     _
+| |   (_)   | |
+| |__  _ ___| |_ ___  _ __ _   _
+| '_ \| / __| __/ _ \| '__| | | |
+| | | | \__ \ || (_) | |  | |_| |
+|_| |_|_|___/\__\___/|_|   \__, |
+                            __/ |
+                           |___/
+
+Key Features:
+-------------
+- Undo and redo of the paintings of the canvas.
+- A painting only saves the tiles of the canvas it modifies (copy on write) : before and after the painting.
+- Undo and redo only write the saved tiles, their cost depends on the painted area, not on the size of the canvas.
+- The old entries are compressed with zlib, and the oldest ones are dropped when the history is over its memory budget.
+
+Notes:
+------
+The paint job calls touch() before writing in a part of the canvas, the tiles are copied the first time they are touched.
+The tiles that end up unchanged (covered by the stencils) are dropped when the painting is committed.
+"""
+
+import zlib
+import pygame as pg
+from objects.tiledcanvas import TiledCanvas
+
+RAW_ENTRIES = 2 # the last entries are kept uncompressed, they are the most likely to be undone
+MAX_BYTES = 32 * 1024 * 1024
+
+class HistoryEntry:
+    def __init__(self, beauty : float) -> None:
+        """Tiles of the canvas before and after a painting, as RGB bytes (compressed once the entry gets old)."""
+        self.beauty = beauty # added to the canvas by the painting
+        self.before : dict[tuple[int, int], bytes] = {}
+        self.after : dict[tuple[int, int], bytes] = {}
+        self.compressed = False
+
+    def get_size(self) -> int:
+        return sum(len(data) for data in self.before.values()) + sum(len(data) for data in self.after.values())
+
+    def compress(self):
+        if not self.compressed:
+            self.before = {key : zlib.compress(data, 1) for key, data in self.before.items()}
+            self.after = {key : zlib.compress(data, 1) for key, data in self.after.items()}
+            self.compressed = True
+
+    def get_tiles(self, tiles : dict[tuple[int, int], bytes]) -> dict[tuple[int, int], bytes]:
+        """Returns the tiles uncompressed."""
+        if self.compressed:
+            return {key : zlib.decompress(data) for key, data in tiles.items()}
+        return tiles
+
+class CanvaHistory:
+    def __init__(self, canvas : TiledCanvas, max_bytes : int = MAX_BYTES) -> None:
+        """Undo/redo stacks of a canvas, saved with its tiles. max_bytes bounds the memory used by the saved tiles."""
+        self.canvas = canvas
+        self.max_bytes = max_bytes
+        self.undo_stack : list[HistoryEntry] = []
+        self.redo_stack : list[HistoryEntry] = []
+        self.pending : HistoryEntry | None = None # painting in progress
+
+    def read_tile(self, key : tuple[int, int]) -> bytes:
+        return pg.image.tobytes(self.canvas.tiles[key], "RGB")
+
+    def write_tiles(self, tiles : dict[tuple[int, int], bytes]):
+        for key, data in tiles.items():
+            self.canvas.write_tile(key, pg.image.frombytes(data, self.canvas.tiles[key].get_size(), "RGB"))
+
+    def begin(self, beauty : float = 0):
+        """Starts the entry of a painting, the tiles are saved as the painting touches them."""
+        self.pending = HistoryEntry(beauty)
+
+    def touch(self, keys : list[tuple[int, int]]):
+        """Saves the given tiles if they weren't saved yet, called before the painting writes in them."""
+        if self.pending is None:
+            return
+        for key in keys:
+            if key not in self.pending.before:
+                self.pending.before[key] = self.read_tile(key)
+
+    def commit(self):
+        """Ends the entry of the painting, once the canvas is painted.
+        A new painting can't be redone over, the redo stack is cleared."""
+        entry, self.pending = self.pending, None
+        if entry is None:
+            return
+        for key, before in list(entry.before.items()):
+            after = self.read_tile(key)
+            if after == before:
+                del entry.before[key]
+            else:
+                entry.after[key] = after
+
+        self.undo_stack.append(entry)
+        self.redo_stack.clear()
+        self.trim()
+
+    def trim(self):
+        """Compresses the old entries and drops the oldest ones while the history is over its memory budget."""
+        for entry in self.undo_stack[:-RAW_ENTRIES]:
+            entry.compress()
+        while len(self.undo_stack) > 1 and self.get_size() > self.max_bytes:
+            self.undo_stack.pop(0)
+
+    def get_size(self) -> int:
+        return sum(entry.get_size() for entry in self.undo_stack + self.redo_stack)
+
+    def can_undo(self) -> bool:
+        return bool(self.undo_stack) and self.pending is None
+
+    def can_redo(self) -> bool:
+        return bool(self.redo_stack) and self.pending is None
+
+    def undo(self) -> HistoryEntry | None:
+        """Puts back the tiles of the canvas as they were before the last painting, returns its entry (None if there is nothing to undo)."""
+        if not self.can_undo():
+            return None
+        entry = self.undo_stack.pop()
+        self.write_tiles(entry.get_tiles(entry.before))
+        self.redo_stack.append(entry)
+        return entry
+
+    def redo(self) -> HistoryEntry | None:
+        """Paints the last undone painting again, returns its entry (None if there is nothing to redo)."""
+        if not self.can_redo():
+            return None
+        entry = self.redo_stack.pop()
+        self.write_tiles(entry.get_tiles(entry.after))
+        self.undo_stack.append(entry)
+        self.trim()
+        return entry
@@ -0,0 +1,239 @@
+r"""
+Projet : Creative Core
+Equipe : Paul Baumard, Abel Bossard, Tybalt Debruyne, Taddeo Boisseuil-Marcil
+              _       _       _       _
+             (_)     | |     (_)     | |
+  _ __   __ _ _ _ __ | |_     _  ___ | |__
+ | '_ \ / _` | | '_ \| __|   | |/ _ \| '_ \
+ | |_) | (_| | | | | | |_    | | (_) | |_) |
+ | .__/ \__,_|_|_| |_|\__|   | |\___/|_.__/
+ | |                        _/ |
+ |_|                       |__/
+
+Key Features:
+-------------
+- Painting animation of the canvas, advanced a little on each update of the game instead of running its own loop.
+- Owns the path of the paint gun, the stamping of the paint and the angles of the robotic arm.
+- The paint is stamped with NumPy over the bounding box of the disk, with a disk mask computed once per radius.
+- The game keeps handling the events (and can be closed) while painting.
+- Several jobs can be queued on the canvas, they are painted one after the other.
+- Each job is an entry of the undo history of the canvas, the tiles it paints are saved before being painted.
+- Only the tiles of the canvas with paint are copied at the start of the job and rewritten at its end (see objects/tiledcanvas.py).
+
+Notes:
+------
+The paint gun follows a sort of turtle graphics path, moving 25 pixels per move and 60 moves per second.
+The number of moves done in a single update is bounded, a slow frame doesn't make the next one slower.
+"""
+
+import pygame as pg
+import numpy as np
+from math import sqrt, ceil
+from utils.coord import Coord
+from ui.sprite import inverse_kinematics
+from objects.particlesspawner import CircleParticleSpawner, ParticleSpawner
+
+MOVES_PER_SECOND = 60
+MAX_MOVES_PER_STEP = 4 # bounded cost per update, the remaining moves are done on the next ones
+
+STAMP_MASKS : dict[int, np.ndarray] = {} # circle of the paint gun for each radius, indexed [x, y] like surfarray
+
+def get_stamp_mask(radius : int) -> np.ndarray:
+    """Returns the disk painted by the paint gun, computed once per radius.
+    Drawn with pygame.draw.circle so the shape is exactly the one of the previous circle surfaces."""
+    if radius not in STAMP_MASKS:
+        circle_surf = pg.Surface((radius * 2, radius * 2), pg.SRCALPHA)
+        pg.draw.circle(circle_surf, (255, 255, 255, 255), (radius, radius), radius)
+        STAMP_MASKS[radius] = pg.surfarray.array_alpha(circle_surf) > 0
+    return STAMP_MASKS[radius]
+
+def composite(surf : pg.Surface, rect : pg.Rect, paint, alpha : np.ndarray, mask : np.ndarray | None = None):
+    """Alpha composites the paint over the rect of the surface, paint being an int32 rgb array of the size of the rect (or a color),
+    and alpha an int32 array of the size of the rect. Same formula as the alpha blits of pygame.
+    With a boolean mask of the size of the rect, only the masked pixels are composited, alpha then has one value per masked pixel."""
+    pixels = pg.surfarray.pixels3d(surf) # locks the surface until the view is deleted
+    area = pixels[rect.left:rect.right, rect.top:rect.bottom]
+    if mask is None:
+        current = area.astype(np.int32)
+        area[...] = current + (((paint - current) * alpha[..., np.newaxis] + paint) >> 8)
+    else:
+        current = area[mask].astype(np.int32)
+        area[mask] = current + (((paint - current) * alpha[..., np.newaxis] + paint) >> 8)
+    del pixels, area
+
+class PaintJob:
+    def __init__(self, canva, next_surf : pg.Surface, color : tuple, beauty : float = 0) -> None:
+        """A painting of the canvas, next_surf is the paint layer (the color where the stencils are not).
+        beauty is the beauty added to the canvas by the painting, given back if it is undone.
+        Nothing happens until the first step, so the job can wait in the queue of the canvas."""
+        from objects.canva import Canva
+        self.canva : Canva = canva
+        self.next_surf = next_surf
+        self.color = color
+        self.beauty = beauty
+
+        # Define the radius of the circular mask and the step size for the painting animation
+        self.circle_radius = 120
+        self.step_size = 25
+
+        # Calculate optimal corner and height for the circular mask
+        optimal_corner = ceil((self.circle_radius - (self.circle_radius * sqrt(2) / 2))) #ceil is used to round up to the nearest integer
+        optimal_height = ceil(self.circle_radius * sqrt(2))
+        width = (self.canva.size[0] - (self.circle_radius + optimal_corner))
+
+        # Initialize the paint gun position
+        self.paint_gun_pos = [-optimal_corner-100, -optimal_corner+self.canva.size[1]//2-25]
+
+        # Path followed by the paint gun, in order
+        self.path = self.create_path(width, optimal_height)
+        self.path_index = 0
+        self.segment = self.path[0]
+
+        self.started = False
+        self.finished = False
+        self.active = False # paints only between the two toggles of the path
+        self.pending_moves : float = 0
+        self.center : Coord | None = None
+        self.painted_tiles : dict[tuple[int, int], pg.Surface] | None = None # final pixels of the tiles with paint
+        self.static_particles : ParticleSpawner | None = None
+        self.aura_particles : ParticleSpawner | None = None
+        self.paint_rgb : np.ndarray | None = None # pixels of next_surf, read by each stamp
+        self.paint_alpha : np.ndarray | None = None
+
+    def create_path(self, width, optimal_height) -> list:
+        """Create and return the path of the painting animation, 'toggle' starts or stops the paint."""
+        return [["U", self.canva.size[1]//2-25], ["R", 100], 'toggle', ["R", width], ["D", optimal_height], ["L", width], ["D", optimal_height],
+                ["R", width], ["D", optimal_height], ["L", width], ["D", optimal_height],
+                ["R", width], ["D", optimal_height], ["L", width+25], 'toggle', ["L", 100-25], ["U", self.canva.size[1]//2]]
+
+    def start(self):
+        """Creates the particles and the final tiles, from the canvas as it is when the job starts (after the previous jobs)."""
+        self.started = True
+        self.canva.game.sound_manager.mite.play()
+
+        # Create particle spawners for the painting animation
+        self.center = Coord(0, self.get_center())
+        self.static_particles = CircleParticleSpawner(self.center, self.circle_radius, pg.Vector2(0, 0), self.color, 600, density=10, dir_randomness=0, radius=(10, 20))
+        self.aura_particles = ParticleSpawner(self.center, pg.Vector2(0, 0), self.color, 60, dir_randomness=2)
+        self.static_particles.active = False
+        self.aura_particles.active = False
+        self.canva.game.particle_spawners[0] += [self.static_particles, self.aura_particles]
+
+        # The final pixels, from the canvas as it is now, only for the tiles that will get paint
+        self.painted_tiles = self.canva.canvas.get_painted_tiles(self.next_surf)
+
+        # The paint layer doesn't change during the job, its pixels are copied once for the stamps
+        self.paint_rgb = pg.surfarray.array3d(self.next_surf).astype(np.int32)
+        self.paint_alpha = pg.surfarray.array_alpha(self.next_surf).astype(np.int32)
+
+        # The tiles of the canvas are saved for the undo as they are painted (see objects/history.py)
+        self.canva.history.begin(self.beauty)
+
+    def step(self, dt : float) -> float:
+        """Advances the painting by dt seconds, called on each update of the game.
+        Returns the time left if the job finished before the end of dt, to be given to the next job."""
+        if not self.started:
+            self.start()
+
+        self.pending_moves = min(self.pending_moves + dt * MOVES_PER_SECOND, MAX_MOVES_PER_STEP)
+        while self.pending_moves >= 1 and not self.finished:
+            self.move()
+            self.pending_moves -= 1
+
+        if self.finished:
+            self.finish()
+            left_time, self.pending_moves = self.pending_moves / MOVES_PER_SECOND, 0
+            return left_time
+        return 0
+
+    def move(self):
+        """Moves the paint gun by one step, painting under it if the paint is on."""
+        # Check if the current direction step is completed
+        if self.segment[1] <= 0:
+            self.next_segment()
+
+        # Toggle the active state of the particles and animation
+        if self.segment == 'toggle':
+            self.active = not self.active
+            self.static_particles.active = self.active
+            self.aura_particles.active = self.active
+            self.next_segment()
+
+        # Apply the circular mask to the canvas surface if active
+        if self.active:
+            self.stamp()
+
+        # Decrease the current direction step by the step size
+        self.segment[1] -= self.step_size
+
+        # Calculate the next step size
+        next_step = self.step_size + self.segment[1] if self.segment[1] < 0 else self.step_size
+
+        # Update the paint gun position based on the current direction and step size
+        self.update_paint_gun_pos(self.segment[0], next_step)
+
+        # Update the center position for the particle spawners and the angles of the robotic arms
+        self.center.xy = self.get_center()
+        self.canva.arm['angle'], self.canva.forearm['angle'] = inverse_kinematics(self.center.xy, self.canva.arm_root, self.canva.arm['len'], self.canva.forearm['len'])
+
+        if self.path_index == len(self.path) - 1 and self.segment[1] <= 0:
+            self.finished = True
+
+    def next_segment(self):
+        self.path_index += 1
+        self.segment = self.path[self.path_index]
+
+    def get_center(self) -> tuple:
+        """Returns the position of the center of the paint gun on the screen."""
+        return (self.canva.coord.x + self.paint_gun_pos[0] + self.circle_radius, self.canva.coord.y + self.paint_gun_pos[1] + self.circle_radius)
+
+    def stamp(self):
+        """Paints the disk under the paint gun on the canvas.
+        Alpha composites the paint layer into the pixels of the canvas, only over the part of the disk inside the canvas.
+        Uses the same formula as the alpha blits of pygame, so the result is the same as blitting a masked copy of the layer."""
+        x, y = self.paint_gun_pos
+        diameter = self.circle_radius * 2
+        left, top = max(x, 0), max(y, 0)
+        right, bottom = min(x + diameter, self.canva.size[0]), min(y + diameter, self.canva.size[1])
+        if left >= right or top >= bottom: # the paint gun is outside the canvas
+            return
+
+        mask = get_stamp_mask(self.circle_radius)[left-x:right-x, top-y:bottom-y]
+        rect = pg.Rect(left, top, right - left, bottom - top)
+        self.canva.history.touch(self.canva.canvas.get_tiles(rect))
+        composite(self.canva.surf, rect, self.paint_rgb[left:right, top:bottom], self.paint_alpha[left:right, top:bottom] * mask)
+        self.canva.canvas.mark_dirty(rect)
+
+    def update_paint_gun_pos(self, direction, step):
+        """Update the paint gun position based on the current direction and step."""
+        match direction:
+            case "R":
+                self.paint_gun_pos[0] += step
+            case "L":
+                self.paint_gun_pos[0] -= step
+            case "D":
+                self.paint_gun_pos[1] += step
+            case "U":
+                self.paint_gun_pos[1] -= step
+
+    def cancel(self):
+        """Stops and removes the particles of a job that won't be finished (the canvas is reset)."""
+        for spawner in (self.static_particles, self.aura_particles):
+            if spawner is not None:
+                spawner.active = False
+                if spawner in self.canva.game.particle_spawners[0]:
+                    self.canva.game.particle_spawners[0].remove(spawner)
+
+    def finish(self):
+        """Writes the final tiles in the canvas and stops the particles."""
+        # Finalize the painting animation by writing the final pixels, over what the paint gun stamped
+        self.canva.history.touch(list(self.painted_tiles)) # the tiles the paint gun didn't reach yet
+        for key, tile in self.painted_tiles.items():
+            self.canva.canvas.write_tile(key, tile)
+        self.canva.history.commit()
+        self.static_particles.active = False
+        self.aura_particles.active = False
+
+        # Schedule the removal of the particle spawners after all the particles should've vanish
+        self.canva.game.timer.create_timer(5, self.canva.game.particle_spawners[0].remove, arguments=[self.static_particles])
+        self.canva.game.timer.create_timer(5, self.canva.game.particle_spawners[0].remove, arguments=[self.aura_particles])
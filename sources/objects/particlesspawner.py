@@ -16,6 +16,7 @@ Key Features:
 - Spawns particles in different shapes and patterns.
 - Particles can be used for various effects like explosions, fireworks, etc.
 - Spawners can be heavily customized to create unique effects.
+- Can be updated at a lower rate than the frame rate, advancing several frames at once.
 
 Note:
 ------
@@ -42,16 +43,17 @@ class Particle:
         self.gravity = gravity
         #print(self.color)
 
-    def update(self):
-        self.radius -= 0.1
-        self.lifetime -= 1
-        self.direction.x -= self.gravity
+    def update(self, steps : int = 1):
+        """steps is the number of frames the particle advances (more than one when updated at a lower rate)"""
+        self.radius -= 0.1 * steps
+        self.lifetime -= steps
+        self.direction.x -= self.gravity * steps
 
         if self.lifetime <= 0 or self.radius <= 0:
             self.dead = True
 
-        self.coord.x += self.direction.x
-        self.coord.y += self.direction.y
+        self.coord.x += self.direction.x * steps
+        self.coord.y += self.direction.y * steps
 
     def draw_particle(self, transparency_win):
         draw.circle(transparency_win, self.color, self.coord.xy, self.radius)
@@ -91,14 +93,14 @@ class ParticleSpawner:
         
 
 
-    def spawn(self):
+    def spawn(self, steps : int = 1):
         if self.active:
             if self.total_amount:
                 for _ in range(self.total_amount):
                     self.particles.append(self.get_particle())
                 self.finished = True
             else:
-                for _ in range(self.density):
+                for _ in range(self.density * steps):
                     self.particles.append(self.get_particle())
             
 
@@ -114,10 +116,10 @@ class ParticleSpawner:
 
         return Particle(self.coord.copy(), rng_rad, rng_dir, rng_col , self.gravity, self.particle_lifetime)
     
-    def update_all(self):
-        """test"""
+    def update_all(self, steps : int = 1):
+        """Updates every particle, steps is the number of frames since the last update."""
         for particle in self.particles:
-            particle.update()
+            particle.update(steps)
 
             if particle.dead:
                 self.particles.remove(particle)
@@ -139,9 +141,9 @@ class ConfettiSpawner(ParticleSpawner):
         self.finished = False
         self.finished_countdown = 600
 
-    def spawn(self):
+    def spawn(self, steps : int = 1):
         if self.particle_amount > 0:
-            for _ in range(3):
+            for _ in range(3 * steps):
                 coord = Coord(self.coord.room_num,(randint(0,1920),0))
                 rng_rad = randint(5,15)
                 rng_dir = Vector2(uniform(-0.2, 0.2), 
@@ -151,7 +153,7 @@ class ConfettiSpawner(ParticleSpawner):
                 self.particle_amount-= 1
                 self.particles.append(Particle(coord, rng_rad, rng_dir, rng_col , 0, 1000))
         else:
-            self.finished_countdown -= 1
+            self.finished_countdown -= steps
         
         if self.finished_countdown <= 0:
             self.finished = True
@@ -61,9 +61,6 @@ class Pattern:
     def draw(self, win : pg.Surface):
         win.blit(self.thumbnail, self.rect.topleft)
 
-    def get_effect(self):
-        return self.true_pattern.copy()
-    
     def copy(self):
         return Pattern(self.name, self.rect.topleft, self.thumbnail, self.true_pattern ,self.price, self.beauty)
 
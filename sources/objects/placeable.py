@@ -15,7 +15,9 @@ Key Features:
 - Placeables are all the things placed in a room that can be edited and interacted with.
 - Supports static surfaces and animations with frame updates.
 - Pixelization and hover-based outline effects.
+- The drawn sprite is only recomputed when the surface, hover state or color changes.
 - Custom pickling for object persistence.
+- Slotted class with the flags stored in a bitset, to keep big inventories light.
 
 Author: Pouchy (Paul), with contributions from Tioh (Taddeo) for visual effects.
 """
@@ -29,9 +31,27 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from utils.coord import Coord
 from utils.anim import Animation
-from ui.sprite import get_outline
+from ui.sprite import get_outline, get_cached_outline, mask_collidepoint
+
+# Flags of the placeables, stored as the bits of a single int instead of one attribute per flag
+NO_OUTLINE = 1
+TEMPORARY = 2
+NO_INTERACTION = 4
+STATIC = 8
+FLAGS = {"no_outline" : NO_OUTLINE, "temporary" : TEMPORARY, "no_interaction" : NO_INTERACTION, "static" : STATIC}
+
+def get_slots(cls) -> list[str]:
+    """Returns every slot of the class, including the ones of its parent classes."""
+    return [slot for klass in reversed(cls.__mro__) for slot in getattr(klass, "__slots__", ())]
 
 class Placeable:
+    # No __dict__ per instance, inventories can hold hundreds of paintings
+    __slots__ = ("name", "id", "coord", "surf", "anim", "temp_surf", "sprite_key", "tag", "rect", "temp_rect",
+                 "y_constraint", "placed", "price", "beauty", "flags", "precalculated_outline")
+    animated = False # class attributes, overridden by the subclasses playing their own animations or having a foreground
+    has_foreground = False
+    derived_slots = ("temp_surf", "temp_rect", "sprite_key", "precalculated_outline") # rebuilt from the other slots, not pickled
+
     def __init__(self, name: str, coord: Coord, surf: Surface, tag: str | None = None, anim: Animation | None = None, y_constraint: int | None = None, price : int = 0, beauty : float = 0, flags : list = []) -> None:
         """Initializes a Placeable object with a name, coordinates, surface, and optional tag, animation, and y_constraint.
         Flags are :
@@ -52,13 +72,14 @@ class Placeable:
         else:
             self.surf = surf
         self.anim = anim
-        self.temp_surf = self.surf.copy()  # Create a temporary copy of the surface
+        self.temp_surf = self.surf  # Surface actually drawn, only recomputed when the sprite changes (see update_sprite)
+        self.sprite_key = None
 
         self.tag = tag
 
         self.rect: Rect = self.surf.get_rect()  # Get the rectangular area of the surface
         self.rect.x, self.rect.y = self.coord.xy  # Set rectangle's position
-        self.temp_rect = self.rect.copy()
+        self.temp_rect = self.rect
 
         # Snap to x-axis if a y_constraint is provided
         self.y_constraint = y_constraint
@@ -67,24 +88,47 @@ class Placeable:
         self.price = price
         self.beauty = beauty
 
+        self.flags = 0
         for flag in flags:
-            setattr(self, flag, True)
+            self.flags |= FLAGS[flag]
+
+        self.precalculated_outline = None # white outline of the static objects, computed on the first hover (see update_sprite)
+
+    @property
+    def no_outline(self) -> bool:
+        return bool(self.flags & NO_OUTLINE)
 
-        if "static" in flags:
-            self.precalculated_outline = get_outline(self.surf, (255,255,255)) # white outline, that will be used for the whole time
-            # white because a filter will be applied to the outline to change its color
+    @property
+    def temporary(self) -> bool:
+        return bool(self.flags & TEMPORARY)
+
+    @property
+    def no_interaction(self) -> bool:
+        return bool(self.flags & NO_INTERACTION)
+
+    @property
+    def static(self) -> bool:
+        return bool(self.flags & STATIC)
 
     def get_blit_args(self):
         """Returns the surface and rectangle for blitting."""
         return self.temp_surf, self.temp_rect
     
-    def draw_foreground(self, win):
-        """Placeholder method for foreground sprite; meant to be overridden in subclasses."""
-        pass
+    def is_animated(self) -> bool:
+        """Returns True if the sprite changes on its own, used to choose the layer of the object in the room scene."""
+        return self.animated or self.anim is not None
+
+    def get_foreground_blit_args(self):
+        """Returns the surface and position of the part drawn over the bots, only called if has_foreground is True."""
+        return None
 
     def draw_outline(self, win: Surface, color: tuple):
         """Draws an outline around the surface on the given window."""
-        win.blit(get_outline(self.surf, color), (self.rect.x-3, self.rect.y-3))
+        win.blit(get_cached_outline(self.surf, color), (self.rect.x-3, self.rect.y-3))
+
+    def collidepoint(self, xy: tuple) -> bool:
+        """Pixel perfect hit test, clicking the transparent area around the sprite doesn't select it."""
+        return self.rect.collidepoint(xy) and mask_collidepoint(self.surf, self.rect.topleft, xy)
     
     def move(self, coord: Coord):
         """Updates the position of the Placeable object based on new coordinates."""
@@ -99,34 +143,64 @@ class Placeable:
 
     def __repr__(self) -> str:
         """Returns a string representation of the Placeable object."""
-        return str(self.__dict__)
+        return str({slot : getattr(self, slot, None) for slot in get_slots(type(self))})
     
     def interaction(self, args):
         """Placeholder method for interaction logic; meant to be overridden in subclasses."""
         pass
 
+    def get_sprite_key(self, is_hovered: bool, color: tuple) -> tuple:
+        """Returns everything the drawn sprite depends on, the sprite is only recomputed when it changes.
+        Subclasses drawing overlays add their own state to it."""
+        outlined = is_hovered and not self.no_outline
+        return (self.surf, is_hovered, outlined, color if outlined else None) # the surface is compared by identity
+
+    def get_overlays(self, is_hovered: bool) -> list[tuple[Surface, tuple]]:
+        """Returns the surfaces drawn on top of the sprite (labels, locks...) with their position relative to the sprite.
+        Meant to be overridden in subclasses."""
+        return []
+
     def update_sprite(self, is_hovered: bool, color: tuple = (170,170,230)):
-        """Updates the sprite based on hover state and modifies visual aspects if necessary."""
+        """Updates the sprite based on hover state and modifies visual aspects if necessary.
+        Nothing is copied or allocated if the surface, hover state and color are the same as the last call."""
         if self.anim:
-            self.surf = self.anim.get_frame()  # Update the surface if an animation is used
+            self.surf = self.anim.get_frame()  # Update the surface if an animation is used, same surface as long as the frame doesn't change
+
+        outlined = is_hovered and not self.no_outline
+        if outlined:
+            self.temp_rect = self.rect.move(-3, -3) # Adjust position for the 3-pixel border of the outline
+        else:
+            self.temp_rect = self.rect
+
+        sprite_key = self.get_sprite_key(is_hovered, color)
+        if sprite_key == self.sprite_key:
+            return
+        self.sprite_key = sprite_key
 
-        if is_hovered and not hasattr(self, "no_outline"):
+        if outlined:
             # Create an outline if the sprite is hovered over
-            if hasattr(self, "static"): # If the object is static, use the precalculated outline
+            if self.static: # If the object is static, use the precalculated outline
+                if self.precalculated_outline is None:
+                    self.precalculated_outline = get_outline(self.surf, (255,255,255)) # white outline, that will be used for the whole time
+                    # white because a filter will be applied to the outline to change its color
                 outline = self.precalculated_outline
                 outline.fill(color, special_flags=BLEND_RGBA_MIN) # Change the color of the white outline
             else:
-                outline = get_outline(self.surf, color)
+                outline = get_cached_outline(self.surf, color).copy() # copied because the sprite is drawn on it
             
             # Position of the sprite is offsetted to account for the 3-pixel border of the outline
             self.temp_surf = outline # Use the outline (solid color) as the temporary surface
             self.temp_surf.blit(self.surf, (3, 3))  # Blit the original surface onto the outline
-            self.temp_rect = self.rect.copy()
-            self.temp_rect.x -= 3  # Adjust position for outline
-            self.temp_rect.y -= 3
         else:
-            self.temp_surf = self.surf.copy()  # Use the normal surface when not hovered
-            self.temp_rect = self.rect.copy()  # Retain original rectangle dimensions
+            self.temp_surf = self.surf  # Use the normal surface when not hovered, shared and not copied
+
+        overlays = self.get_overlays(is_hovered)
+        if overlays:
+            if self.temp_surf is self.surf: # never draw on the shared surface
+                self.temp_surf = self.surf.copy()
+            offset = 3 if outlined else 0
+            for overlay, pos in overlays:
+                self.temp_surf.blit(overlay, (pos[0]+offset, pos[1]+offset))
     
     def set_attribute(self, attribute_name, value):
         """Dynamically sets an attribute if it exists; raises an attribute error otherwise."""
@@ -135,15 +209,41 @@ class Placeable:
         else:
             raise AttributeError(f"'{type(self).__name__}' object has no attribute '{attribute_name}'") # My first good error handling !
     
+    def compact(self):
+        """Frees what can be rebuilt, called when the object goes back to the inventory.
+        Meant to be overridden in subclasses keeping a lighter copy of their surface."""
+        pass
+
+    def get_surf_state(self):
+        """Returns the surface as it is pickled, a Surface can't be pickled."""
+        return (image.tostring(self.surf, "RGBA"), self.surf.get_size())
+
+    def set_surf_state(self, surf_state):
+        """Restores the surface from what get_surf_state returned."""
+        self.surf = image.frombuffer(surf_state[0], surf_state[1], "RGBA")
+
     def __getstate__(self):
-        """Custom pickling method to save the object's state."""
-        state = self.__dict__.copy()
-        state["surf"] = (image.tostring(self.surf, "RGBA"), self.surf.get_size())
-        state['temp_surf'] = state['surf']
+        """Custom pickling method to save the object's state.
+        The state is still a dict like before the slots, the surfaces derived from surf are not saved."""
+        state = {slot : getattr(self, slot) for slot in get_slots(type(self)) if slot != "surf" and slot not in self.derived_slots and hasattr(self, slot)}
+        state["surf"] = self.get_surf_state()
         return state
     
     def __setstate__(self, state : dict):
-        """Custom unpickling method to restore the object's state."""
-        self.__dict__ = state
-        self.surf = image.frombuffer(self.surf[0], self.surf[1], "RGBA")
-        self.temp_surf = self.surf.copy()
\ No newline at end of file
+        """Custom unpickling method to restore the object's state.
+        Also reads the saves made before the slots, where each flag was an attribute set to True."""
+        slots = get_slots(type(self))
+        self.flags = 0
+        self.anim = None
+        for key, value in state.items():
+            if key in FLAGS:
+                self.flags |= FLAGS[key]
+            elif key in slots and key != "surf" and key not in self.derived_slots:
+                setattr(self, key, value)
+            # other keys were attributes of older versions, they are ignored
+
+        for derived in self.derived_slots:
+            setattr(self, derived, None)
+        self.set_surf_state(state["surf"])
+        self.temp_surf = self.surf
+        self.temp_rect = self.rect
@@ -18,6 +18,7 @@ Key Features:
     - InvPlaceable for the inventory placeable at floor 1.
     - AutoCachierPlaceable for the automatic cash register unlock at floor 4.
     - SpectatorPlaceable for the spectator placeable at floor 5.
+    - PaintingPlaceable for the paintings made on the canvas, kept as 8-bit palette indexed pictures.
 
 Author: Pouchy (Paul), with contributions from Tioh (Taddeo)
 """
@@ -29,12 +30,15 @@ from typing import Optional
 from utils.timermanager import TimerManager
 from core.unlockmanager import UnlockManager
 from pygame.transform import grayscale 
-from pygame import Surface
+from pygame import Surface, image
 from utils.fonts import TERMINAL_FONT, STANDARD_COLOR
 
 class DoorUp(Placeable):
     """Class for the door up placeable.  
     Only one instance of this class is shared between all floors."""
+    __slots__ = ("anim_close", "anim_open", "anim_blink", "door_down", "locked", "idle_surf", "locked_surf", "label_surf")
+    animated = True
+
     def __init__(self, name, coord, surf, tag = None):
         super().__init__(name, coord, surf, tag)
         self.anim_close = Animation(sprite.SPRITESHEET_BAS, 0, 9, 4, False)     #download closing animation
@@ -47,7 +51,9 @@ class DoorUp(Placeable):
         self.door_down : Optional[DoorDown] = None
         self.locked = True
 
-        self.locked_surf = sprite.get_locked_surface(sprite.SPRITESHEET_DOOR_BLINK.get_img((0,0)))       #create a locked door surface
+        self.idle_surf = sprite.SPRITESHEET_DOOR_BLINK.get_img((0,0)) # closed door, extracted once instead of every frame
+        self.locked_surf = sprite.get_locked_surface(self.idle_surf)       #create a locked door surface
+        self.label_surf = TERMINAL_FONT.render("Monter", False, STANDARD_COLOR) # rendered once, drawn when hovered
         
     
     def update_lock_status(self, unlock_manager : UnlockManager, current_room):
@@ -65,18 +71,22 @@ class DoorUp(Placeable):
             if is_hovered:
                 self.anim = self.anim_blink
             else:           # Delete the blinking animation after closing when the mouse isn't on the door
-                self.surf = sprite.SPRITESHEET_DOOR_BLINK.get_img((0,0))
+                self.surf = self.idle_surf
                 self.anim = None
     
         super().update_sprite(is_hovered, color)
+    
+    def get_sprite_key(self, is_hovered, color):
+        return super().get_sprite_key(is_hovered, color) + (self.locked,)
 
+    def get_overlays(self, is_hovered):
+        """Label on the door when hovered and lock if the floor is locked."""
+        overlays = []
         if is_hovered:
-            label_surf = TERMINAL_FONT.render("Monter", False, STANDARD_COLOR)
-            label_surf_rect = label_surf.get_rect(center = self.surf.get_rect().center)
-            self.temp_surf.blit(label_surf, label_surf_rect)
-
+            overlays.append((self.label_surf, self.label_surf.get_rect(center = self.surf.get_rect().center).topleft))
         if self.locked:
-            self.temp_surf.blit(self.locked_surf, (3,3) if is_hovered else (0,0)) # Draw the lock on the door (offset if hovered because of the outline)
+            overlays.append((self.locked_surf, (0,0)))
+        return overlays
     
     def interaction(self, timer : TimerManager):
         """Interaction with the door.  
@@ -96,6 +106,9 @@ class DoorUp(Placeable):
 class DoorDown(Placeable):
     """Class for the door down placeable.  
     Only one instance of this class is shared between all floors."""
+    __slots__ = ("anim_close", "anim_open", "anim_blink", "door_up", "locked", "idle_surf", "locked_surf", "label_surf")
+    animated = True
+
     def __init__(self, name, coord, surf, tag = None):
         super().__init__(name, coord, surf, tag)
         self.anim_close = Animation(sprite.SPRITESHEET_BAS_FLIP, 0, 9, 4, False)        #download closing animation
@@ -107,7 +120,9 @@ class DoorDown(Placeable):
         self.door_up : Optional[DoorUp] = None
         self.locked = True
 
-        self.locked_surf = sprite.get_locked_surface(sprite.SPRITESHEET_DOOR_BLINK_FLIP.get_img((0,0)))       #create a locked door surface
+        self.idle_surf = sprite.SPRITESHEET_DOOR_BLINK_FLIP.get_img((0,0)) # closed door, extracted once instead of every frame
+        self.locked_surf = sprite.get_locked_surface(self.idle_surf)       #create a locked door surface
+        self.label_surf = TERMINAL_FONT.render("Decendre", False, STANDARD_COLOR) # rendered once, drawn when hovered
 
     def update_lock_status(self, unlock_manager : UnlockManager, current_room):
         if unlock_manager.is_floor_unlocked(str(current_room.num-1)):
@@ -123,18 +138,22 @@ class DoorDown(Placeable):
             if is_hovered:
                 self.anim = self.anim_blink
             else:           #delete the blinking animation after closing when the mouse isn't on the door
-                self.surf = sprite.SPRITESHEET_DOOR_BLINK_FLIP.get_img((0,0))
+                self.surf = self.idle_surf
                 self.anim = None
     
         super().update_sprite(is_hovered, color)
+    
+    def get_sprite_key(self, is_hovered, color):
+        return super().get_sprite_key(is_hovered, color) + (self.locked,)
 
-        if is_hovered: # simple label on the door
-            label_surf = TERMINAL_FONT.render("Decendre", False, STANDARD_COLOR)
-            label_surf_rect = label_surf.get_rect(center = self.surf.get_rect().center)
-            self.temp_surf.blit(label_surf, label_surf_rect)
-
+    def get_overlays(self, is_hovered):
+        """Label on the door when hovered and lock if the floor is locked."""
+        overlays = []
+        if is_hovered:
+            overlays.append((self.label_surf, self.label_surf.get_rect(center = self.surf.get_rect().center).topleft))
         if self.locked:
-            self.temp_surf.blit(self.locked_surf, (3,3) if is_hovered else (0,0)) # Draw the lock on the door (offset if hovered because of the outline)
+            overlays.append((self.locked_surf, (0,0)))
+        return overlays
     
     def interaction(self, timer : TimerManager):
         """Interaction with the door.  
@@ -154,41 +173,49 @@ class DoorDown(Placeable):
 
 class BotPlaceable(Placeable):
     """Class for the clickable inline bot."""
-    pass
+    __slots__ = ()
+    animated = True # follows the animation of the bot
 
 class ShopPlaceable(Placeable):
     """Class for the shop placeable at floor 2."""
-    pass
+    __slots__ = ()
 
 class InvPlaceable(Placeable):
     """Class for the inventory placeable at floor 1."""
+    __slots__ = ("blink_anim", "idle_surf", "label_surf")
+    animated = True
+
     def __init__(self, name, coord, surf, tag = None):
         super().__init__(name, coord, surf, tag)
         self.blink_anim = Animation(sprite.SPRITESHEET_INVENTORY, 0, 7)
         self.surf = self.blink_anim.get_frame()
+        self.idle_surf = sprite.SPRITESHEET_INVENTORY.get_img((0,0)) # extracted once instead of every frame
+        self.label_surf = TERMINAL_FONT.render("Inventaire", False, STANDARD_COLOR)
     
     def update_sprite(self, is_hovered, color = (150, 150, 255)):
         if is_hovered:
             self.surf = self.blink_anim.get_frame()
         else:
-            self.surf = sprite.SPRITESHEET_INVENTORY.get_img((0,0))
+            self.surf = self.idle_surf
 
         super().update_sprite(is_hovered, color)
 
+    def get_overlays(self, is_hovered):
         if is_hovered: # simple label on the inventory
-            label_surf = TERMINAL_FONT.render("Inventaire", False, STANDARD_COLOR)
-            label_surf_rect = label_surf.get_rect(center = self.surf.get_rect().center)
-            self.temp_surf.blit(label_surf, label_surf_rect)
+            return [(self.label_surf, self.label_surf.get_rect(center = self.surf.get_rect().center).topleft)]
+        return []
 
 class AutoCachierPlaceable(Placeable):
     """Class for the automatic cash register unlock at floor 4."""
-    pass
+    __slots__ = ()
 
 class ColorUnlockPlaceable(Placeable):
     """Class for the color unlock placeable at floor 3."""
-    pass
+    __slots__ = ()
 
 class SpectatorPlaceable(Placeable):
+    __slots__ = ("database", "user_list", "open")
+
     def __init__(self, name, coord, surf, config, tag = None):
         super().__init__(name, coord, surf, tag)
         from ui.userlist import UserList
@@ -204,6 +231,10 @@ class SpectatorPlaceable(Placeable):
 
 class DeskPlaceable(Placeable):
     """Class for the unique desk placeable at floor 1."""
+    __slots__ = ("auto_cachier_unlocked", "anim_bg", "anim_fg", "special_auto_guichet_bg", "bg_surf", "fg_surf", "desk_frames", "active")
+    animated = True
+    has_foreground = True
+
     def __init__(self, name, coord, surf, tag = None):
         super().__init__(name, coord, surf, tag)
         self.auto_cachier_unlocked = False
@@ -211,13 +242,22 @@ class DeskPlaceable(Placeable):
         self.anim_bg = Animation(sprite.DESK_BG, 0, 14, speed=3, repeat=False)
         self.anim_fg = Animation(sprite.DESK_FG, 0, 14, speed=3, repeat=False)
         self.special_auto_guichet_bg = Animation(sprite.DESK_ROBOT_BG, 0, 14, speed=3, repeat=False)
-        self.surf = self.anim_bg.reset_frame()
+        self.bg_surf = self.anim_bg.reset_frame()
         self.fg_surf = self.anim_fg.reset_frame()
 
-        self.surf.blit(self.fg_surf, (0,0))
+        # The animation frames are shared, so the foreground is drawn on a copy, only when one of the frames changes
+        self.desk_frames = None
+        self.compose_desk()
 
         self.active = False
 
+    def compose_desk(self):
+        """Draws the foreground on the background, if one of them changed since the last call."""
+        if self.desk_frames != (self.bg_surf, self.fg_surf):
+            self.desk_frames = (self.bg_surf, self.fg_surf)
+            self.surf = self.bg_surf.copy()
+            self.surf.blit(self.fg_surf, (0,0))
+
     def update_sprite(self, is_hovered, color = ...):
         """Update the sprite of the desk by playing the animation."""
         if self.auto_cachier_unlocked:
@@ -225,21 +265,77 @@ class DeskPlaceable(Placeable):
 
         if self.anim_bg.is_finished():
             self.active = False
-            self.surf = self.anim_bg.reset_frame()
+            self.bg_surf = self.anim_bg.reset_frame()
             self.fg_surf = self.anim_fg.reset_frame()
 
         if self.active:
-            self.surf = self.anim_bg.get_frame()
+            self.bg_surf = self.anim_bg.get_frame()
             self.fg_surf = self.anim_fg.get_frame()
         
-        self.surf.blit(self.fg_surf, (0,0))
+        self.compose_desk()
         
-        self.temp_surf = self.surf.copy()
-        self.temp_rect = self.rect.copy()
+        self.temp_surf = self.surf
+        self.temp_rect = self.rect
     
-    def draw_foreground(self, win : Surface):
-        """Draws the special foreground of the desk.  
+    def get_foreground_blit_args(self):
+        """Returns the special foreground of the desk.  
         Needed because this part needs to be drawn on top of the bots."""
-        win.blit(self.fg_surf, self.coord.xy)
-
+        return self.fg_surf, self.coord.xy
+
+
+
+class PaintingPlaceable(Placeable):
+    """Class for the paintings made on the canvas.  
+    The picture is kept as an 8-bit palette indexed surface, the frame and the palette are shared by all the paintings.
+    The framed surface, in the display format, is only built when the painting is drawn, and freed when it goes back to the inventory."""
+    __slots__ = ("picture", "framed")
+    derived_slots = Placeable.derived_slots + ("picture", "framed") # the picture is pickled as the surf state
+
+    def __init__(self, name, coord, picture : Surface, beauty = 0):
+        self.picture = sprite.to_indexed(picture) or picture.copy() # more than 256 colors (translucent paint over many colors), kept as it is
+        self.framed = None
+        super().__init__(name, coord, None, beauty=beauty, tag="decoration", flags=["static"])
+
+    @property
+    def surf(self) -> Surface:
+        """Framed picture, built on first use."""
+        if self.framed is None:
+            self.framed = sprite.FRAME_PAINTING.copy() # the shared frame is never drawn on
+            self.framed.blit(self.picture, (12,12))
+        return self.framed
+
+    @surf.setter
+    def surf(self, surf : Surface | None):
+        self.framed = surf
+
+    def compact(self):
+        """Only keeps the indexed picture, the framed surface and what was derived from it are rebuilt when needed."""
+        self.framed = None
+        self.temp_surf = None
+        self.sprite_key = None
+        self.precalculated_outline = None
+
+    def get_blit_args(self):
+        if self.temp_surf is None:
+            self.temp_surf, self.temp_rect = self.surf, self.rect
+        return self.temp_surf, self.temp_rect
+
+    def get_surf_state(self):
+        """The indices and the palette of the picture, a quarter of the size of the framed RGBA surface."""
+        if self.picture.get_bitsize() == 8:
+            palette = tuple(tuple(color[:3]) for color in self.picture.get_palette())
+            palette = sprite.PALETTES.setdefault(palette, palette) # the same object for every painting, pickled once per save
+            return ("P", self.picture.get_size(), image.tobytes(self.picture, "P"), palette)
+        return ("RGB", self.picture.get_size(), image.tobytes(self.picture, "RGB"))
+
+    def set_surf_state(self, surf_state):
+        if surf_state[0] == "P":
+            self.picture = sprite.from_indexed(surf_state[2], surf_state[1], surf_state[3])
+        else:
+            self.picture = image.frombytes(surf_state[2], surf_state[1], "RGB")
+        self.framed = None
 
+    def __setstate__(self, state : dict):
+        super().__setstate__(state)
+        if not self.placed: # in the inventory, only the indexed picture is kept
+            self.compact()
@@ -0,0 +1,139 @@
+r"""
+Projet : Creative Core
+Equipe : Paul Baumard, Abel Bossard, Tybalt Debruyne, Taddeo Boisseuil-Marcil
+                             _                    _
+                            | |                  | |
+ ___ _ __  _ __ __ _ _   _  | |__  _ __ _   _ ___| |__
+/ __| '_ \| '__/ _` | | | | | '_ \| '__| | | / __| '_ \
+\__ \ |_) | | | (_| | |_| | | |_) | |  | |_| \__ \ | | |
+|___/ .__/|_|  \__,_|\__, | |_.__/|_|   \__,_|___/_| |_|
+    | |               __/ |
+    |_|              |___/
+
+Key Features:
+-------------
+- Freehand painting on the canvas with the right mouse button, in the selected color.
+- The mouse motions only record points, the stroke is interpolated between them and stamped once per update of the game.
+- All the stamps of an update are merged in a single mask, only its pixels are composited, with the compositor of the paint jobs.
+- Costs 1 coin every few stamps, and each stroke is an entry of the undo history.
+
+Notes:
+------
+The brush is a disk of the pixel art scaled by 6, and the stamps are aligned on the pixels of the pixel art.
+"""
+
+import pygame as pg
+import numpy as np
+from objects.paintjob import composite, get_stamp_mask
+from ui.infopopup import InfoPopup
+
+PIXEL_SIZE = 6 # size of a pixel of the pixel art
+BRUSH_RADIUS = 3 # in pixels of the pixel art
+BRUSH_MASK = np.repeat(np.repeat(get_stamp_mask(BRUSH_RADIUS), PIXEL_SIZE, 0), PIXEL_SIZE, 1) # blocky disk, indexed [x, y]
+STAMP_SPACING = 12 # distance between two stamps along the stroke
+STAMPS_PER_COIN = 8
+
+class SprayBrush:
+    def __init__(self, canva) -> None:
+        """Freehand brush of the canvas, a stroke goes from start() to end()."""
+        from objects.canva import Canva
+        self.canva : Canva = canva
+        self.active = False
+        self.samples : list[tuple[int, int]] = [] # mouse positions on the canvas since the last update
+        self.last_point : tuple[float, float] | None = None # last point of the stroke already interpolated
+        self.carry = 0. # distance travelled since the last stamp
+        self.cost = 0. # coins owed for the stamps of the stroke, paid when they make a whole coin
+
+    def to_canvas(self, pos : tuple[int, int]) -> tuple[int, int]:
+        return (pos[0] - self.canva.coord.x, pos[1] - self.canva.coord.y)
+
+    def start(self, pos : tuple[int, int]):
+        """Starts a stroke at the given screen position, refused while the canvas is being painted."""
+        if self.canva.is_painting(): # the paint jobs write in the canvas and in the undo history
+            self.canva.game.popups.append(InfoPopup("Attendez la fin de la peinture !"))
+            self.canva.game.sound_manager.incorrect.play()
+            return
+        self.active = True
+        self.samples = [self.to_canvas(pos)]
+        self.last_point = None
+        self.carry = 0
+        self.cost = 0
+        self.canva.history.begin()
+
+    def add_sample(self, pos : tuple[int, int], buttons : tuple[int, int, int]):
+        """Records a position of the mouse, nothing is drawn until the next update.
+        buttons are the mouse buttons held during the motion, the stroke ends if the right one was released without the canvas seeing it."""
+        if not self.active:
+            return
+        if not buttons[2]:
+            self.end()
+            return
+        self.samples.append(self.to_canvas(pos))
+
+    def end(self):
+        """Stamps what is left of the stroke and ends its entry in the undo history."""
+        if not self.active:
+            return
+        self.update()
+        self.active = False
+        self.canva.history.commit()
+
+    def get_stamps(self) -> list[tuple[float, float]]:
+        """Interpolates the stroke through the recorded samples, a stamp every STAMP_SPACING pixels."""
+        stamps = []
+        for point in self.samples:
+            if self.last_point is None: # first point of the stroke
+                stamps.append(point)
+                self.last_point = point
+                continue
+            direction = pg.Vector2(point) - self.last_point
+            length = direction.length()
+            if length == 0:
+                continue
+            direction /= length
+            distance = STAMP_SPACING - self.carry # to the next stamp
+            while distance <= length:
+                stamps.append(tuple(pg.Vector2(self.last_point) + direction * distance))
+                distance += STAMP_SPACING
+            self.carry = length - (distance - STAMP_SPACING)
+            self.last_point = point
+        self.samples.clear()
+        return stamps
+
+    def update(self):
+        """Stamps the stroke recorded since the last update, called on each update of the game."""
+        if not self.active or not self.samples:
+            return
+        stamps = self.get_stamps()
+        if not stamps:
+            return
+
+        self.cost += len(stamps) / STAMPS_PER_COIN
+        coins = int(self.cost)
+        if coins:
+            if not self.canva.check_price(coins): # the stroke stops when the player runs out of money
+                self.active = False
+                self.canva.history.commit()
+                return
+            self.cost -= coins
+
+        # Union of the stamps, aligned on the pixel art, over their bounding box clipped to the canvas
+        diameter = BRUSH_MASK.shape[0]
+        corners = [(round(x / PIXEL_SIZE) * PIXEL_SIZE - diameter // 2, round(y / PIXEL_SIZE) * PIXEL_SIZE - diameter // 2) for x, y in stamps]
+        rect = pg.Rect(min(x for x, _ in corners), min(y for _, y in corners), 0, 0)
+        rect.width = max(x for x, _ in corners) + diameter - rect.x
+        rect.height = max(y for _, y in corners) + diameter - rect.y
+        rect = rect.clip(self.canva.canvas.surf.get_rect())
+        if not (rect.w and rect.h):
+            return
+
+        mask = np.zeros(rect.size, bool)
+        for x, y in corners:
+            left, top = max(x, rect.left), max(y, rect.top)
+            right, bottom = min(x + diameter, rect.right), min(y + diameter, rect.bottom)
+            if left < right and top < bottom:
+                mask[left-rect.left:right-rect.left, top-rect.top:bottom-rect.top] |= BRUSH_MASK[left-x:right-x, top-y:bottom-y]
+
+        self.canva.history.touch(self.canva.canvas.get_tiles(rect))
+        composite(self.canva.surf, rect, np.array(self.canva.current_color, np.int32), np.full(np.count_nonzero(mask), 255, np.int32), mask)
+        self.canva.canvas.mark_dirty(rect)
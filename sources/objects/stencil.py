@@ -0,0 +1,192 @@
+r"""
+Projet : Creative Core
+Equipe : Paul Baumard, Abel Bossard, Tybalt Debruyne, Taddeo Boisseuil-Marcil
+     _                  _ _
+    | |                (_) |
+ ___| |_ ___ _ __   ___ _| |
+/ __| __/ _ \ '_ \ / __| | |
+\__ \ ||  __/ | | | (__| | |
+|___/\__\___|_| |_|\___|_|_|
+
+Key Features:
+-------------
+- Computes the paint layer of the canvas (the color where the stencils are not) with NumPy, without blitting the patterns on a surface.
+- Each pattern is converted once to masks (opaque and translucent pixels) and 8-bit arrays, cached with the surface of the pattern.
+- Only the bounding box of each stencil is composited, the cost depends on the area of the stencils, not on the size of the canvas.
+- The coverage is kept between calls : adding a stencil only composites the new one, an unchanged set costs nothing.
+- A moved or removed stencil only recomposites its old and new rects (dirty rects), for the live preview of the canvas.
+
+Notes:
+------
+The stencils are composited with the same formula as the alpha blits of pygame, so the paint layer is the same as the one of the blits.
+A translucent stencil lets a part of the paint through, overlapping stencils add up like stacked blits.
+The patterns are grayscale (white or black, see pattern_dict), a single color channel is composited instead of three.
+The fully transparent pixels of a pattern are skipped, pygame would copy their color where nothing was blitted yet (black for every pattern).
+"""
+
+import pygame as pg
+import numpy as np
+from ui.sprite import SPRITE_CACHE
+
+ALPHA_TABLE = np.array([[src + dst - src * dst // 255 for dst in range(256)] for src in range(256)], np.uint8) # alpha of a blit, [source, destination]
+
+class Stencil:
+    def __init__(self, surf : pg.Surface) -> None:
+        """Arrays of a pattern, indexed [x, y] like surfarray.
+        The opaque pixels are set in a single masked assignment, only the translucent ones go through the blend formula."""
+        alpha = pg.surfarray.array_alpha(surf)
+        self.gray = pg.surfarray.array_red(surf)
+        self.opaque = alpha == 255
+        self.translucent = (alpha > 0) & (alpha < 255)
+        self.has_translucent = bool(self.translucent.any())
+        self.alpha = alpha.astype(np.int32)
+
+def get_stencil(surf : pg.Surface) -> Stencil:
+    """Returns the stencil of a pattern, computed once per surface."""
+    cache = SPRITE_CACHE.setdefault(surf, {})
+    if "stencil" not in cache:
+        cache["stencil"] = Stencil(surf)
+    return cache["stencil"]
+
+class StencilEngine:
+    def __init__(self, size : tuple[int, int]) -> None:
+        """Coverage of the stencils over a canvas of the given size.
+        A stencil is a (pattern surface, (x, y)) tuple, the position being relative to the canvas."""
+        self.size = size
+        self.rect = pg.Rect((0, 0), size)
+        self.alpha = np.zeros(size, np.uint8) # union of the stencils, 255 where the canvas is fully covered
+        self.gray = np.zeros(size, np.uint8)
+        self.stencils : list[tuple[pg.Surface, tuple[int, int]]] = [] # stencils composited in the coverage, in order
+
+        self.layer : pg.Surface | None = None # last paint layer and its color
+        self.layer_color : tuple | None = None
+
+        self.preview : pg.Surface | None = None # paint layer updated in place, only over the rects that changed
+        self.preview_color : tuple | None = None
+        self.preview_dirty : list[pg.Rect] = [] # rects of the coverage changed since the last update of the preview
+
+    def get_rect(self, stencil : tuple[pg.Surface, tuple[int, int]]) -> pg.Rect:
+        """Returns the part of the canvas covered by the stencil (empty if it is outside)."""
+        surf, pos = stencil
+        return pg.Rect(pos, surf.get_size()).clip(self.rect)
+
+    def clip(self, surf : pg.Surface, pos : tuple[int, int], area : pg.Rect) -> tuple[slice, slice, slice, slice] | None:
+        """Returns the slices of the area and of the stencil where they overlap, None if they don't."""
+        x, y = pos
+        width, height = surf.get_size()
+        left, top = max(x, area.left), max(y, area.top)
+        right, bottom = min(x + width, area.right), min(y + height, area.bottom)
+        if left >= right or top >= bottom:
+            return None
+        return slice(left, right), slice(top, bottom), slice(left - x, right - x), slice(top - y, bottom - y)
+
+    def composite(self, surf : pg.Surface, pos : tuple[int, int], area : pg.Rect | None = None):
+        """Adds a stencil over the coverage, like a blit of the pattern on it.
+        Only the part of the stencil inside the area is composited, the whole canvas by default."""
+        clipped = self.clip(surf, pos, area or self.rect)
+        if clipped is None:
+            return
+        x, y, stencil_x, stencil_y = clipped
+        stencil = get_stencil(surf)
+        alpha, gray = self.alpha[x, y], self.gray[x, y]
+
+        # an opaque pixel replaces the coverage, whatever was under it
+        opaque = stencil.opaque[stencil_x, stencil_y]
+        alpha[opaque] = 255
+        gray[opaque] = stencil.gray[stencil_x, stencil_y][opaque]
+
+        if stencil.has_translucent:
+            translucent = stencil.translucent[stencil_x, stencil_y]
+            src_alpha, src_gray = stencil.alpha[stencil_x, stencil_y][translucent], stencil.gray[stencil_x, stencil_y][translucent].astype(np.int32)
+            dst_alpha, dst_gray = alpha[translucent], gray[translucent].astype(np.int32)
+
+            # pygame copies the source where the destination is fully transparent, and blends it elsewhere
+            blended_gray = dst_gray + (((src_gray - dst_gray) * src_alpha + src_gray) >> 8)
+            gray[translucent] = np.where(dst_alpha == 0, src_gray, blended_gray)
+            alpha[translucent] = ALPHA_TABLE[src_alpha, dst_alpha]
+
+    def recomposite(self, area : pg.Rect):
+        """Clears the area of the coverage and composites every stencil overlapping it again, in order."""
+        self.alpha[area.left:area.right, area.top:area.bottom] = 0
+        self.gray[area.left:area.right, area.top:area.bottom] = 0
+        for surf, pos in self.stencils:
+            self.composite(surf, pos, area)
+
+    def set_stencils(self, stencils : list[tuple[pg.Surface, tuple[int, int]]]):
+        """Updates the coverage to the given stencils.
+        Nothing is done if they didn't change, the stencils added after the previous ones are composited,
+        and the rects of the stencils that moved or were removed are recomposited, the rest of the coverage is kept."""
+        if stencils == self.stencils:
+            return
+        unchanged = 0 # the stencils before the first difference are still in the coverage
+        while unchanged < min(len(stencils), len(self.stencils)) and stencils[unchanged] == self.stencils[unchanged]:
+            unchanged += 1
+        removed, added = self.stencils[unchanged:], stencils[unchanged:]
+        self.stencils = list(stencils)
+
+        if not removed: # only additions, they go over the coverage
+            dirty = [self.get_rect(stencil) for stencil in added]
+            for surf, pos in added:
+                self.composite(surf, pos)
+        else:
+            dirty = merge_rects([self.get_rect(stencil) for stencil in removed + added])
+            if sum(rect.w * rect.h for rect in dirty) >= self.rect.w * self.rect.h:
+                dirty = [self.rect.copy()]
+            for rect in dirty:
+                self.recomposite(rect)
+
+        self.preview_dirty += [rect for rect in dirty if rect.w and rect.h]
+        self.layer = None
+
+    def draw_layer(self, surf : pg.Surface, color : tuple, area : pg.Rect):
+        """Writes the paint layer over the area of the surface : the color, transparent where the stencils cover the canvas."""
+        surf.fill(color, area)
+        x, y = slice(area.left, area.right), slice(area.top, area.bottom)
+        alpha, gray = self.alpha[x, y], self.gray[x, y]
+        np.subtract(255, alpha, out=pg.surfarray.pixels_alpha(surf)[x, y])
+
+        # like the BLEND_RGBA_MAX fill of the blits, the stencil color shows where it lets the paint through
+        tinted = (gray > 0) & (alpha < 255)
+        if tinted.any():
+            pixels = pg.surfarray.pixels3d(surf)
+            pixels[x, y][tinted] = np.maximum(gray[tinted][:, np.newaxis], color)
+            del pixels
+
+    def get_paint_layer(self, stencils : list[tuple[pg.Surface, tuple[int, int]]], color : tuple) -> pg.Surface:
+        """Returns the surface painted by the paint gun.
+        The surface is shared until the stencils or the color change, it must not be drawn on."""
+        self.set_stencils(stencils)
+        if self.layer is None or self.layer_color != color:
+            self.layer = pg.Surface(self.size, pg.SRCALPHA) # new surface, a queued paint job may still hold the previous one
+            self.draw_layer(self.layer, color, self.rect)
+            self.layer_color = color
+        return self.layer
+
+    def get_preview(self, stencils : list[tuple[pg.Surface, tuple[int, int]]], color : tuple) -> pg.Surface:
+        """Returns the paint layer for a live preview, the same surface is updated over the rects that changed.
+        Meant to be called each time a stencil moves, the cost depends on the size of the moved stencils."""
+        self.set_stencils(stencils)
+        if self.preview is None or self.preview_color != color:
+            if self.preview is None:
+                self.preview = pg.Surface(self.size, pg.SRCALPHA)
+            self.preview_dirty = [self.rect.copy()]
+            self.preview_color = color
+        for rect in merge_rects(self.preview_dirty):
+            self.draw_layer(self.preview, color, rect)
+        self.preview_dirty.clear()
+        return self.preview
+
+def merge_rects(rects : list[pg.Rect]) -> list[pg.Rect]:
+    """Merges the overlapping rects, so an area is only recomposited once (the old and new rects of a moved stencil overlap)."""
+    merged : list[pg.Rect] = []
+    for rect in rects:
+        if not (rect.w and rect.h):
+            continue
+        rect = rect.copy()
+        overlapping = rect.collidelistall(merged)
+        while overlapping:
+            for index in reversed(overlapping):
+                rect.union_ip(merged.pop(index))
+            overlapping = rect.collidelistall(merged)
+        merged.append(rect)
+    return merged
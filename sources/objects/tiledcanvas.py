@@ -0,0 +1,80 @@
+r"""
+Projet : Creative Core
+Equipe : Paul Baumard, Abel Bossard, Tybalt Debruyne, Taddeo Boisseuil-Marcil
+ _   _ _          _
+| | (_) |        | |
+| |_ _| | ___  __| |   ___ __ _ _ ____   ____ _ ___
+| __| | |/ _ \/ _` |  / __/ _` | '_ \ \ / / _` / __|
+| |_| | |  __/ (_| | | (_| (_| | | | \ V / (_| \__ \
+ \__|_|_|\___|\__,_|  \___\__,_|_| |_|\_/ \__,_|___/
+
+Key Features:
+-------------
+- Pixels of the canvas split in tiles, a paint job only copies and rewrites the tiles where there is paint.
+- Keeps the tiles changed since the last thumbnail, the thumbnail (half size, used for the paintings) is rescaled tile by tile.
+- The tile grid is shared with the undo history, which saves and restores whole tiles.
+
+Notes:
+------
+The tiles are subsurfaces of a single surface, so the canvas is still drawn with a single blit,
+and the paint gun keeps stamping in the pixels of the whole surface.
+Whoever writes in the surface directly has to call mark_dirty with the rect it changed.
+"""
+
+import pygame as pg
+
+TILE_SIZE = 96 # 16 pixels of the pixel art, even so the tiles of the thumbnail are aligned on pixels
+
+class TiledCanvas:
+    def __init__(self, size : tuple[int, int], bg_color : tuple, tile_size : int = TILE_SIZE) -> None:
+        """Blank canvas of the given size, filled with bg_color."""
+        self.size = size
+        self.tile_size = tile_size
+        self.surf = pg.Surface(size)
+        self.surf.fill(bg_color)
+
+        self.tiles = {(x, y) : self.surf.subsurface(self.get_tile_rect((x, y)))
+                      for x in range((size[0] - 1) // tile_size + 1) for y in range((size[1] - 1) // tile_size + 1)}
+
+        self.thumbnail = pg.transform.scale_by(self.surf, 0.5)
+        self.thumbnail_dirty : set[tuple[int, int]] = set() # tiles changed since the last update of the thumbnail
+
+    def get_tile_rect(self, key : tuple[int, int]) -> pg.Rect:
+        """Returns the part of the canvas of the tile, the last row and column may be smaller."""
+        return pg.Rect(key[0] * self.tile_size, key[1] * self.tile_size, self.tile_size, self.tile_size).clip((0, 0), self.size)
+
+    def get_tiles(self, rect : pg.Rect) -> list[tuple[int, int]]:
+        """Returns the keys of the tiles overlapped by the rect."""
+        rect = rect.clip((0, 0), self.size)
+        if not (rect.w and rect.h):
+            return []
+        return [(x, y) for x in range(rect.left // self.tile_size, (rect.right - 1) // self.tile_size + 1)
+                       for y in range(rect.top // self.tile_size, (rect.bottom - 1) // self.tile_size + 1)]
+
+    def mark_dirty(self, rect : pg.Rect):
+        """Records that the pixels under the rect changed."""
+        self.thumbnail_dirty.update(self.get_tiles(rect))
+
+    def write_tile(self, key : tuple[int, int], surf : pg.Surface):
+        """Replaces the pixels of a tile, surf having the size of the tile."""
+        self.tiles[key].blit(surf, (0, 0))
+        self.thumbnail_dirty.add(key)
+
+    def get_painted_tiles(self, layer : pg.Surface) -> dict[tuple[int, int], pg.Surface]:
+        """Returns the tiles as they will be once the paint layer is applied, only for the tiles where the layer has paint."""
+        painted = {}
+        for key in self.get_tiles(layer.get_bounding_rect()):
+            rect = self.get_tile_rect(key)
+            if layer.subsurface(rect).get_bounding_rect().w: # some tiles of the bounding rect may still be covered by the stencils
+                painted[key] = self.tiles[key].copy()
+                painted[key].blit(layer, (0, 0), rect)
+        return painted
+
+    def get_thumbnail(self) -> pg.Surface:
+        """Returns the canvas at half size, only the tiles changed since the last call are scaled again.
+        The surface is shared, it must not be drawn on."""
+        for key in self.thumbnail_dirty:
+            rect = self.get_tile_rect(key)
+            self.thumbnail.blit(pg.transform.scale_by(self.tiles[key], 0.5), (rect.x // 2, rect.y // 2))
+        self.thumbnail_dirty.clear()
+        return self.thumbnail
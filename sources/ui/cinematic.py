@@ -13,6 +13,7 @@ Key Features:
 - Plays animations for cinematics using a configurable dictionary.
 - Customizes the dialogue, animation, and additional post-cutscene dialogue for each cinematic.
 - Handles transitions with sinus function for smooth fade-out effects.
+- Streams the animation frames from a background thread, only a few full screen frames are in memory at once.
 - Is used for:
     introspection dialogues for character development.
     cutscenes for story progression.
@@ -30,33 +31,89 @@ author of this module: Leih (Abel), Pouchy (Paul), Tioh (Taddeo)
 
 from objects.dialogue import DialogueManager
 import pygame as pg
-from ui.sprite import load_spritesheet_image, MAIN_CHARACTER
+import ui.sprite as sprite
 from typing_extensions import TYPE_CHECKING
+from threading import Thread, Event
+from queue import Queue, Empty, Full
 from math import pi, sin
 from utils.coord import Coord
+from utils.assetstore import Asset
 from utils.fonts import TERMINAL_FONT_VERYBIG, STANDARD_COLOR
 
 # Very ugly, but it's the only way to avoid circular imports
 if TYPE_CHECKING:
     from core.logic import Game 
 
+class FrameStreamer:
+    """Streams the frames of a cutscene spritesheet (320x180 per frame) scaled to full screen.
+    The frames are scaled a few frames ahead by a background thread and stored in a bounded queue (ring buffer),
+    so only buffer_size full screen frames exist at once instead of the whole cutscene (500+ MB for the longest one)."""
+    def __init__(self, path : str, buffer_size : int = 4):
+        # The native strip is small, it is converted on the main thread as convert_alpha needs the display
+        self.strip = pg.image.load(path).convert_alpha()
+        self.frame_count = self.strip.get_width()//320
+        self.buffer : Queue[pg.Surface] = Queue(maxsize=buffer_size)
+        self.stop_event = Event()
+        self.error : Exception | None = None # raised by the background thread, the stream ends early
+        self.thread = Thread(target=self.__scale_frames, daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def __scale_frames(self):
+        """Runs in the background thread, scales the frames in order and waits when the buffer is full.
+        An error (bad strip, out of memory...) is kept for the main thread instead of being lost with the thread."""
+        for i in range(self.frame_count):
+            try:
+                frame = pg.transform.scale_by(self.strip.subsurface(pg.Rect(i*320, 0, 320, 180)), 6) # scaling releases the GIL, so it doesn't slow the main thread
+            except Exception as error:
+                self.error = error
+                return
+            while not self.stop_event.is_set():
+                try:
+                    self.buffer.put(frame, timeout=0.1)
+                    break
+                except Full:
+                    pass
+            if self.stop_event.is_set():
+                return
+
+    def next_frame(self) -> pg.Surface:
+        """Returns the next frame, the previous one is released as soon as the caller drops it.
+        Returns None if the background thread stopped before producing it, instead of waiting forever."""
+        while True:
+            try:
+                return self.buffer.get(timeout=0.1)
+            except Empty:
+                if not self.thread.is_alive() and self.buffer.empty():
+                    if self.error is not None:
+                        print(f"Cutscene animation stopped : {self.error!r}")
+                    return None
+
+    def close(self):
+        """Stops the background thread, used when the cutscene is skipped."""
+        self.stop_event.set()
+        try:
+            while True: # frees the frames still in the buffer
+                self.buffer.get_nowait()
+        except Empty:
+            pass
+        self.thread.join()
+
+
 class CinematicPlayer:
     """Class for playing cinematics."""
     def __init__(self, config_dict : dict[str, tuple[str, str, str]]):
 
         if "anim" in config_dict:
-            self.anim_lst, self.anim_len = load_spritesheet_image(config_dict["anim"])
-            self.cutscene_surf = self.anim_lst[0]
+            # Frames are streamed during the animation instead of being all scaled here
+            self.anim_streamer = FrameStreamer(config_dict["anim"])
+            self.anim_len = self.anim_streamer.frame_count
         else:
-            self.anim_lst = None
+            self.anim_streamer = None
 
             # setups the final surface like in __play_anim for the cutscene if there is no animation
-            self.cutscene_final_surf = pg.Surface((1920, 1080), pg.SRCALPHA)
-            band_size = (1920, 120)
-            black_band = pg.Surface(band_size)
-            self.cutscene_final_surf.blit(black_band, (0, 0))
-            self.cutscene_final_surf.blit(black_band, (0, 1080 - band_size[1]))
-            self.cutscene_final_surf = pg.transform.grayscale(self.cutscene_final_surf)
+            self.cutscene_final_surf = self.get_empty_final_surf()
             
 
         if "dialogue" in config_dict:
@@ -72,6 +129,16 @@ class CinematicPlayer:
         self.dialogue = DialogueManager()
         self.is_finished = False
     
+    @staticmethod
+    def get_empty_final_surf() -> pg.Surface:
+        """Final surface of a cutscene without animation frame : only the black bands."""
+        final_surf = pg.Surface((1920, 1080), pg.SRCALPHA)
+        band_size = (1920, 120)
+        black_band = pg.Surface(band_size)
+        final_surf.blit(black_band, (0, 0))
+        final_surf.blit(black_band, (0, 1080 - band_size[1]))
+        return pg.transform.grayscale(final_surf)
+
     def get_status_event(self, event, game):
         """Handle status events like quitting or pressing escape."""
         if event.type == pg.KEYDOWN and event.key == pg.K_ESCAPE:
@@ -89,6 +156,8 @@ class CinematicPlayer:
         band_size = (game.win.get_width(), 120)
         black_band = pg.Surface(band_size)
         clock = pg.time.Clock()
+        self.anim_streamer.start()
+        self.cutscene_surf = None
         anim_incr = 0        # Loop until the animation is finished or the cinematic is marked as finished
         while anim_incr//10 < self.anim_len and not self.is_finished:
             clock.tick(60)  # Cap the frame rate at 60 FPS
@@ -96,20 +165,26 @@ class CinematicPlayer:
                 # Handle status events like quitting or pressing escape
                 self.get_status_event(event, game)
 
-            # Get the current frame of the animation
-            self.cutscene_surf = self.anim_lst[anim_incr//10]
+            # Get the next frame of the animation when it changes (each frame stays 10 ticks), the previous one is released
+            if anim_incr % 10 == 0:
+                frame = self.anim_streamer.next_frame()
+                if frame is None: # the frames couldn't be scaled, the cutscene goes on to its dialogue
+                    break
+                self.cutscene_surf = frame
+                # Draw black bands at the top and bottom of the screen
+                self.cutscene_surf.blit(black_band, (0, 0))
+                self.cutscene_surf.blit(black_band, (0, 1080 - band_size[1]))
             anim_incr += 1
-            # Draw black bands at the top and bottom of the screen
-            self.cutscene_surf.blit(black_band, (0, 0))
-            self.cutscene_surf.blit(black_band, (0, 1080 - band_size[1]))
             
             # Draw the background and the current frame of the animation
             game.draw_background()
             game.win.blit(self.cutscene_surf, (0, 0))
             pg.display.flip()
         
+        self.anim_streamer.close()
         # Convert the final frame to grayscale
-        self.cutscene_final_surf = pg.transform.grayscale(self.cutscene_surf)
+        self.cutscene_final_surf = pg.transform.grayscale(self.cutscene_surf) if self.cutscene_surf else self.get_empty_final_surf()
+        self.cutscene_surf = None
     
     def __play_dialogue(self, game : 'Game'):
         """Play the dialogue sequence."""
@@ -191,7 +266,7 @@ class CinematicPlayer:
         - Introspection dialogue (with the normal game background)
         """
         # Play the animation sequence
-        if self.anim_lst:
+        if self.anim_streamer:
             self.__play_anim(game)
 
         # If there is a dialogue name, play the dialogue sequence
@@ -206,7 +281,7 @@ class CinematicPlayer:
         # If there is an introspection dialogue, play the introspection dialogue sequence
         if self.introspection_dialogue:
             self.dialogue.special_dialogue(self.introspection_dialogue)
-            self.dialogue.npc_icon = MAIN_CHARACTER
+            self.dialogue.npc_icon = sprite.MAIN_CHARACTER
             self.__play_introspection_dialogue(game)
 
         # Mark the cinematic as finished
@@ -216,9 +291,13 @@ class CinematicPlayer:
 
 class IntroCutscene:
     """Simple class for playing the intro IntroCutscene."""
-    def __init__(self, frames : list[pg.Surface]):
+    def __init__(self, frames : list[Asset]):
         self.frames = frames
 
+    def get_frame(self, frame_ind : int) -> pg.Surface:
+        """Fetches the frame from the asset store, the frames are not kept after the cutscene."""
+        return self.frames[frame_ind].get()
+
     def transition(self, game : 'Game', current_frame : pg.Surface, next_frame : pg.Surface, time : float = 2):
         """Simple fade-in-out transition between one frame to another, can be easily used at other places.  
         Reimplementation of the __play_transition method above"""
@@ -250,7 +329,7 @@ class IntroCutscene:
     def play(self, game : 'Game', initial_background : pg.Surface):
         """Plays the intro cutscene."""
         frame_ind = 0
-        current_frame = self.frames[frame_ind]
+        current_frame = self.get_frame(frame_ind)
         skip_label = TERMINAL_FONT_VERYBIG.render("Cliquez pour passer", False, STANDARD_COLOR)
         
         clock = pg.time.Clock()
@@ -265,7 +344,7 @@ class IntroCutscene:
                     if frame_ind >= len(self.frames): # if we reached the end of the frames
                         break
 
-                    current_frame = self.transition(game, current_frame, self.frames[frame_ind], 1.5) # transition between the frames
+                    current_frame = self.transition(game, current_frame, self.get_frame(frame_ind), 1.5) # transition between the frames
             
             game.win.blit(current_frame, (0,0))
             game.win.blit(skip_label, (0,0))
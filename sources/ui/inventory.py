@@ -17,6 +17,7 @@ Key Features:
 - Allows the player to change floors rapidly with buttons on the right.
 - Items are displayed in a grid with a maximum of 8 items per page, page navigation buttons are provided.
 - Inventory items are given a thumbnail (which is compressed with a funny method) and a label.
+- The thumbnails and labels are cached per item, and generated ahead of time for the next and previous pages, flipping a page only moves them.
 
 *Shop*
 - Inherits from Inventory.
@@ -50,6 +51,8 @@ class Inventory:
         self.inv: list[Placeable] = content  # List of owned items
         self.displayed_objects: list[tuple[Placeable, Surface]] = []  # Rendered items on the current page
         self._page: int = 0  # Current page index
+        self.thumbnails: dict[tuple, tuple[Placeable, Surface]] = {}  # Thumbnail and label of each item, by (id, placed, name)
+        self.pending_pages: list[int] = []  # Pages whose thumbnails are generated ahead of time
         self.font = TERMINAL_FONT # Font for labels
         self.title = title  # Title of the inventory
         width = BORDER_AROUND_WINDOW * 2 + OBJECT_SIZE*2 + 20
@@ -81,7 +84,8 @@ class Inventory:
         
         
     def init(self):
-        """Initializes the objects for rendering on the current page."""
+        """Initializes the objects for rendering on the current page.
+        The thumbnails come from the cache, the ones of the next and previous pages are generated later by preload_thumbnails."""
         # Paginate items
         start = self._page * ITEMS_PER_PAGE
         end = (self._page + 1) * ITEMS_PER_PAGE
@@ -89,38 +93,65 @@ class Inventory:
 
         self._process_objects()
 
-    def _process_objects(self):
-        """Processes each object for rendering on the current page."""
-        processed_objects = []
+        # Thumbnails of the items that left the inventory are dropped, the ones of the neighbour pages are generated ahead of time
+        ids = {obj.id for obj in self.inv}
+        self.thumbnails = {key : thumbnail for key, thumbnail in self.thumbnails.items() if key[0] in ids}
+        self.pending_pages = [self._page + 1, self._page - 1]
 
-        for ind, obj in enumerate(self.displayed_objects):
+    def _get_thumbnail(self, obj: Placeable) -> tuple[Placeable, Surface]:
+        """Returns the thumbnail and the label of an item, generated once per item, state (placed or not) and name."""
+        key = (obj.id, obj.placed, obj.name)
+        if key not in self.thumbnails:
             # Scale the object to fit within a thumbnail
             biggest_side = max(obj.rect.width, obj.rect.height)
             scale_ratio = OBJECT_SIZE / biggest_side
             thumbnail_surf = transform.scale_by(obj.surf, scale_ratio)
-            thumbnail_rect = thumbnail_surf.get_rect()
 
             # Apply greyscale if the object is placed
             if obj.placed:
                 thumbnail_surf.fill((50, 50, 50), special_flags=BLEND_RGB_MIN)
+            else:
+                obj.compact() # a painting in the inventory only keeps its indexed picture, the framed surface was only needed here
 
-            # Position the thumbnail
-            thumbnail_rect.centerx = 324-OBJECT_SIZE-20 if ind % 2 == 0 else 324 # Big blob of magic numbers
-            thumbnail_rect.y = 84 + (220 * (ind // 2))
-
-            # Create a new Placeable for the thumbnail
-            thumbnail_placeable = Placeable(obj.name, Coord(obj.coord.room_num, thumbnail_rect.topleft), thumbnail_surf, price=obj.price)
+            # Create a new Placeable for the thumbnail, moved to its slot of the page when it is displayed
+            thumbnail_placeable = Placeable(obj.name, Coord(obj.coord.room_num, (0, 0)), thumbnail_surf, price=obj.price)
             thumbnail_placeable.id = obj.id
             thumbnail_placeable.pixelise()
 
             # Create a label for the object
             label_surf = self.font.render(obj.name, False, STANDARD_COLOR)
 
+            self.thumbnails[key] = (thumbnail_placeable, label_surf)
+        return self.thumbnails[key]
+
+    def _process_objects(self):
+        """Processes each object for rendering on the current page."""
+        processed_objects = []
+
+        for ind, obj in enumerate(self.displayed_objects):
+            thumbnail_placeable, label_surf = self._get_thumbnail(obj)
+
+            # Position the thumbnail, the rect keeps the size of the thumbnail before pixelise
+            thumbnail_rect = thumbnail_placeable.rect.copy()
+            thumbnail_rect.centerx = 324-OBJECT_SIZE-20 if ind % 2 == 0 else 324 # Big blob of magic numbers
+            thumbnail_rect.y = 84 + (220 * (ind // 2))
+            thumbnail_placeable.move(Coord(obj.coord.room_num, thumbnail_rect.topleft))
+
             # Add to processed list
             processed_objects.append((thumbnail_placeable, label_surf))
 
         self.displayed_objects = processed_objects
 
+    def preload_thumbnails(self):
+        """Generates the thumbnails of a page next to the current one, so the page flips only read the cache.
+        Called by the scheduler while the inventory is open, a page per call."""
+        while self.pending_pages:
+            page = self.pending_pages.pop(0)
+            if 0 <= page * ITEMS_PER_PAGE < len(self.inv):
+                for obj in self.inv[page * ITEMS_PER_PAGE:(page + 1) * ITEMS_PER_PAGE]:
+                    self._get_thumbnail(obj)
+                return
+
     def draw(self, win: Surface, mouse_pos: Coord):
         """Draws the inventory or shop interface on the screen."""
         win.blit(self.window_sprite, (12, 60))
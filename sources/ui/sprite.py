@@ -16,20 +16,25 @@ Key Features:
 -------------
 - Nine-slice algorithm scaling for UI elements.
 - Whiten effect for surfaces, to be used as activated button sprites (to avoid having unnecessary files).
+- Cached masks and outlines per surface, for pixel perfect hit tests.
+- Cached rotations around a pivot, rounded to a step of 1 degree, for the robotic arm of the canvas.
+- 8-bit palette indexed copies of the paintings, the palettes being shared between the surfaces with the same colors.
+- Lazy sprite registry, sprites are loaded on first access instead of at import time, preload() loads a whole group behind a loading screen.
 
 Author: Tioh (Taddeo), with some help from Ytyt for the inverse_kinematics function.
 """
 
-from pygame import image, Surface, transform, SRCALPHA, BLEND_RGBA_MAX, display, Rect, BLEND_RGB_ADD, BLEND_RGBA_MULT, Vector2, surfarray
+from pygame import image, Surface, transform, SRCALPHA, BLEND_RGBA_MAX, Rect, BLEND_RGB_ADD, BLEND_RGBA_MULT, Vector2, surfarray, mask, RLEACCEL
+from weakref import WeakKeyDictionary
+from collections import OrderedDict
+import numpy as np
 from math import sin, pi, sqrt, acos, atan2, degrees, cos
 import utils.anim as anim
 from objects.particlesspawner import ParticleSpawner, LineParticleSpawner
 from utils.coord import Coord
+from utils.assetstore import ASSETS, Asset
 
 
-if not display.get_init():
-    display.set_mode((0,0))
-
 def invert_alpha(surface):
     """
     Invert the alpha values of a surface.
@@ -51,29 +56,9 @@ def invert_alpha(surface):
     alpha_array[:] = 255 - alpha_array[:] # This works better, but it's less readable, it's a Numpy feature called "broadcasting" that allows to apply an operation to all elements of an array at once (here, invert the alpha values) without using loops
 
 def load_image(path : str):
-    """ Custom routine to load, resize and optimize all sprites."""
-    sprite = image.load(path)
-    sized_sprite = transform.scale_by(sprite, 6)
-    return sized_sprite.convert_alpha()
-
-def load_spritesheet_image(path) -> tuple[list[Surface], int]:
-    """ resize and optimize cutscene spritesheets.
-    Row is the row of the spritesheet to load.  
-    Images need to be spritesheets with a size of 320x180 per frame.  
-    This is sadly needed because of a limit in the pygame.transform.scale function, so the sprite need to be loaded and resized frame by frame."""
-
-    sprite = image.load(path).convert_alpha()
-    size = sprite.get_size()
-
-    lenght = size[0]//320
-
-    sprites = []
-    for i in range(lenght): #iterate over the number of frames in the spritesheet
-        subsprite = sprite.subsurface(Rect(i*320, 0, 320, 180)) #take the frame at the i-th position 
-        sized_subsprite = transform.scale_by(subsprite, 6) #resize the frame
-        sprites.append(sized_subsprite.convert_alpha()) #add the frame to the list of frames
-    
-    return sprites, lenght # the lenght is often used by the calling function to know how many frames are in the spritesheet
+    """ Custom routine to load, resize and optimize all sprites.
+    The native image is kept by the asset store, so loading the same file twice only decodes it once."""
+    return ASSETS.load(path, 6)
 
 def whiten(surface : Surface):
     """Whiten a surface to simulate a button press effect."""
@@ -153,11 +138,62 @@ def get_outline(surf, color):
     outline_surface.fill(color, special_flags=BLEND_RGBA_MULT)
     return outline_surface
 
+# Data derived from a sprite (mask, outlines), computed once per surface.
+# Weak keys, so the entry disappears with the surface (a frame evicted from a cache, a sold painting...)
+SPRITE_CACHE : WeakKeyDictionary[Surface, dict] = WeakKeyDictionary()
+
+def get_mask(surf : Surface) -> mask.Mask:
+    """Returns the cached collision mask of the surface, built on first use."""
+    cache = SPRITE_CACHE.setdefault(surf, {})
+    if "mask" not in cache:
+        cache["mask"] = mask.from_surface(surf)
+    return cache["mask"]
+
+def get_cached_outline(surf : Surface, color : tuple) -> Surface:
+    """Same as get_outline, but computed once per surface and color.
+    The returned surface is shared, it must not be drawn on."""
+    cache = SPRITE_CACHE.setdefault(surf, {})
+    if ("outline", color) not in cache:
+        cache[("outline", color)] = get_outline(surf, color)
+    return cache[("outline", color)]
+
+def mask_collidepoint(surf : Surface, topleft : tuple[int, int], xy : tuple[int, int]) -> bool:
+    """Pixel perfect hit test of a surface drawn at topleft.
+    The cheap bounding box test is done first, the mask is only read if the point is inside it."""
+    x, y = int(xy[0] - topleft[0]), int(xy[1] - topleft[1])
+    width, height = surf.get_size()
+    if not (0 <= x < width and 0 <= y < height):
+        return False
+    return bool(get_mask(surf).get_at((x, y)))
+
+# Palettes of the indexed surfaces, each palette is stored once (and pickled once per save) whatever the number of paintings using it
+PALETTES : dict[tuple, tuple] = {}
+
+def to_indexed(surf : Surface) -> Surface | None:
+    """Returns an 8-bit copy of an opaque surface, with a palette made of its colors.
+    Returns None if the surface has more than 256 colors, it can't be indexed without losing some of them."""
+    pixels = surfarray.array3d(surf).astype(np.uint32)
+    keys = (pixels[..., 0] << 16) | (pixels[..., 1] << 8) | pixels[..., 2] # one int per color, np.unique is much faster in 1D
+    colors, indices = np.unique(keys, return_inverse=True)
+    if len(colors) > 256:
+        return None
+    palette = tuple((int(key) >> 16, (int(key) >> 8) & 255, int(key) & 255) for key in colors)
+    indexed = Surface(surf.get_size(), 0, 8)
+    indexed.set_palette(PALETTES.setdefault(palette, palette))
+    surfarray.pixels2d(indexed)[:] = indices.reshape(keys.shape)
+    return indexed
+
+def from_indexed(data : bytes, size : tuple[int, int], palette : tuple) -> Surface:
+    """Rebuilds an indexed surface from its indices (image.tobytes in "P" format) and its palette."""
+    indexed = image.frombytes(data, size, "P")
+    indexed.set_palette(PALETTES.setdefault(palette, palette))
+    return indexed
+
 def get_locked_surface(surf : Surface):
     """Returns a grey surface with a lock on it."""
     locked_surf = surf.copy()       #create a locked door surface
     locked_surf = transform.grayscale(locked_surf)
-    lock = LOCK
+    lock = get_sprite("LOCK")
     lock_rect = lock.get_rect(center=locked_surf.get_rect().center)    #center the lock on the door
     locked_surf.blit(lock, lock_rect)
     return locked_surf
@@ -211,6 +247,44 @@ def point_rotate(image, origin, pivot, angle):
     
     return rotated_image, rotated_image_rect
 
+ROTATION_STEP = 1 # degrees, the angles are rounded to it so a few rotated images are enough
+MAX_ROTATIONS = 360 // ROTATION_STEP # every angle fits, the arms of the canvas sweep almost the whole circle while painting
+
+class RotationCache:
+    def __init__(self, image : Surface, max_rotations : int = MAX_ROTATIONS) -> None:
+        """Rotated copies of an image, with the offset of their center to the pivot, by rounded angle.
+        The copies are RLE encoded on their first blit : a rotated arm is mostly transparent, so it takes about 6 times less memory
+        (around 115 KB instead of 700 KB), and is faster to blit. They must only be blitted, reading their pixels decodes them."""
+        self.image = image
+        self.max_rotations = max_rotations
+        self.rotations : OrderedDict[tuple, tuple[Surface, Vector2]] = OrderedDict() # (angle, pivot) : (rotated image, offset), the least recently used first
+
+    def get(self, angle : float, pivot : tuple) -> tuple[Surface, Vector2]:
+        key = (angle, tuple(pivot))
+        if key in self.rotations:
+            self.rotations.move_to_end(key)
+            return self.rotations[key]
+
+        # Offset from the pivot to the center of the image, rotated like the image (see point_rotate)
+        offset_pivot_to_center = Vector2(self.image.get_rect().center) - Vector2(pivot)
+        rotated_image = transform.rotate(self.image, angle)
+        rotated_image.set_alpha(255, RLEACCEL)
+        self.rotations[key] = (rotated_image, offset_pivot_to_center.rotate(-angle))
+        if len(self.rotations) > self.max_rotations:
+            self.rotations.popitem(last=False)
+        return self.rotations[key]
+
+def cached_point_rotate(image, origin, pivot, angle, step = ROTATION_STEP):
+    """Same as point_rotate, with the angle rounded to the step.
+    The rotated image is computed once per rounded angle and kept in the rotation cache of the image,
+    it is shared and must not be drawn on."""
+    angle = round(angle / step) * step % 360
+    cache = SPRITE_CACHE.setdefault(image, {})
+    if "rotations" not in cache:
+        cache["rotations"] = RotationCache(image)
+    rotated_image, rotated_offset = cache["rotations"].get(angle, pivot)
+    return rotated_image, rotated_image.get_rect(center=(origin[0] + rotated_offset.x, origin[1] + rotated_offset.y))
+
 def inverse_kinematics(target, root, length1, length2):
     """Compute the angles needed to reach the target using 2D inverse kinematics 
         Algorithm inspired by https://www.alanzucconi.com/2018/05/02/ik-2d-1/
@@ -234,157 +308,216 @@ def inverse_kinematics(target, root, length1, length2):
     # Transform into global angles
     return degrees(angle1), degrees(angle2 + angle1)
 
-# Backgrounds
-BG1 = load_image("data/backgrounds/R1.png")
-BG2 = load_image("data/backgrounds/R0.png")
-BG3 = load_image("data/backgrounds/R2.png")
-BG4 = load_image("data/backgrounds/R3.png")
-BG5 = load_image("data/backgrounds/R4.png")
-BG6 = load_image("data/backgrounds/R5.png")
-PRETTY_BG = load_image("data/backgrounds/joli_background.png")
-
-# UI Elements
-CANVA_UI_PAINT = load_image('data/ui_canva_1.png')
-CANVA_UI_NAME = load_image('data/ui_canva2.png')
-PAINT_BUTTON = load_image('data/buttons/bouton_canva_ui_paint.png')
-SAVE_BUTTON = load_image('data/buttons/bouton_canva_ui_name.png')
-WINDOW = load_image('data/bord.png')
-YES_BUTTON = load_image("data/buttons/oui.png")
-NO_BUTTON = load_image("data/buttons/non.png")
-LOGIN_BUTTON = load_image("data/buttons/login.png")
-QUIT_BUTTON = load_image("data/buttons/quit.png")
-PLAY_BUTTON = load_image('data/buttons/jouer.png')
-CLOSE_BUTTON = load_image("data/buttons/close.png")
-REGISTER_BUTTON = load_image("data/buttons/register.png")
-CONFIRM_BUTTON = load_image("data/buttons/confirm.png")
-DESTRUCTION_BUTTON = load_image("data/buttons/destruciotn_button.png")
-BUILD_MODE_BORDER = load_image("data/bordure_construction.png")
-DESTRUCTION_MODE_BORDER = load_image("data/bordure_destruction.png")
-DIALBOX = load_image("data/pop_up_dialogue.png")
-ARROW_LEFT = load_image("data/buttons/fleche_gauche.png")
-ARROW_RIGHT = load_image("data/buttons/fleche_droite.png")
-LOCK = load_image("data/cadena.png")
-BEAUTY_LABEL_ANIMATION = anim.Animation(anim.Spritesheet(load_image("data/conteur_beaute.png"), (30*6, 30*6)), 0, 14)
-MONEY_LABEL_ANIMATION = anim.Animation(anim.Spritesheet(load_image("data/argent_ui_30x28_25frames.png"), (30*6, 28*6)), 0, 25)
-COLOR_BUTTON_BG = load_image("data/couleurs_uii.png")
-TITLE = load_image("data/titre_234x82.png")
-FRAME_PAINTING = load_image("data/cadre.png")
-
-# Spritesheets
-SPRITESHEET_INVENTORY = anim.Spritesheet(load_image('data/etagere.png'), (53*6, 31*6))
-SPRITESHEET_HAUT = anim.Spritesheet(load_image("data/prt_haut.png"), (42*6, 29*6))
-SPRITESHEET_BAS = anim.Spritesheet(load_image("data/prt_bas.png"), (42*6, 29*6))
-SPRITESHEET_DOOR_BLINK = anim.Spritesheet(load_image("data/prt_anim_blink.png"), (42*6, 29*6))
-SPRITESHEET_HAUT_FLIP = anim.Spritesheet(transform.flip(load_image("data/prt_haut.png"),False, True), (42*6, 29*6))
-SPRITESHEET_BAS_FLIP = anim.Spritesheet(transform.flip(load_image("data/prt_bas.png"),False, True), (42*6, 29*6))
-SPRITESHEET_DOOR_BLINK_FLIP = anim.Spritesheet(transform.flip(load_image("data/prt_anim_blink.png"),False, True), (42*6, 29*6))
-SPRITESHEET_ROOFTOP = anim.Spritesheet(load_image('data/rooftop.png'), (320*6,180*6))
-EXCLAMATION_SPRITESHEET = anim.Spritesheet(load_image("data/exclamation_2x9.png"),(2*6,9*6))
-
-# Desks
-DESK_FG = anim.Spritesheet(load_image('data/guichet_1.png'), (57*6,66*6))
-DESK_BG = anim.Spritesheet(load_image('data/guichet_2.png'), (57*6,66*6))
-DESK_ROBOT_BG = anim.Spritesheet(load_image('data/guichet_robot.png'), (57*6,66*6))
-
-# Props
-SHOP = load_image("data/shop_placeable.png")
-
-SPRITE_STATUE_1 = load_image('data/props/statue.png')
-SPRITE_STATUE_2 = load_image("data/props/think.png")
-SPRITE_PLANT_1 = load_image("data/props/plant_1.png")
-SPRITE_PLANT_2 = load_image("data/props/plant_2.png")
-SPRITE_POSTER = load_image("data/props/poster.png")
-SPRITE_SPHERE = load_image("data/props/familiar_sphere.png")
-SPRITE_DUCK = load_image("data/props/duck.png")
-SPRITE_CUBE = load_image("data/props/strange_cube.png")
-SPRITE_STRAWBERRIES = load_image("data/props/strawberries.png")
-SPRITE_ROB = load_image("data/props/walle.png")
-SPRITE_PAINTING = load_image("data/props/munch.png")
-SPRITE_FLOWER_1 = load_image("data/props/karma_flower.png")
-SPRITE_FLOWER_2 = load_image("data/props/red_flower.png")
-SPRITE_VASE_1 = load_image("data/props/vase_1.png")
-SPRITE_VASE_2 = load_image("data/props/vase_2.png")
-SPRITE_VASE_3 = load_image("data/props/vase_3.png")
-SPRITE_GOLD =  load_image("data/props/gold_ingot.png")
-SPRITE_CELL = load_image("data/props/cell.png")
-SPRITE_SHELF_1 = load_image("data/props/shelf_1.png")
-SPRITE_SHELF_2 = load_image("data/props/shelf_2.png")
-TELESCOPE = load_image("data/telescope.png")
-
-
-# Robots
+def load_images(*paths : str) -> list[Surface]:
+    """Loads a list of sprites, used by the registry for the numbered sprite lists."""
+    return [load_image(path) for path in paths]
+
+def load_spritesheet(path : str, img_size : tuple[int]) -> anim.Spritesheet:
+    """Loads a spritesheet whose frames are img_size big in the native image."""
+    return anim.Spritesheet(load_image(path), (img_size[0]*6, img_size[1]*6))
+
+def load_flipped_spritesheet(path : str, img_size : tuple[int]) -> anim.Spritesheet:
+    """Loads a vertically flipped spritesheet, used by the doors going down."""
+    return anim.Spritesheet(ASSETS.load(path, 6, flip=True), (img_size[0]*6, img_size[1]*6))
+
+
 #---------------------------------------------
-#       The format for the robot anim is:
-#line 1 - Walk Right
-#line 2 - Walk Left
-#line 3 - Idle Right
-#line 4 - Watch Wall
-#dict is the particle + the relative offset from the origin of the bot
+#       Sprite registry
+# Sprites are not loaded when importing this module anymore, each name is resolved the first time it is accessed (sprite.X or from ui.sprite import X).
+# The format for the registry is:
+# NAME : (group, paths, loader)
+# - group is used by preload() to load a whole set of sprites at once (behind a loading screen)
+# - paths are the files the sprite is made of, they are given to the loader
+# - loader returns the sprite, other sprites are accessed with get_sprite() inside of it
+#   loaders returning Asset handles are wrapped in handle(), their images are only decoded by the loading screen
 #---------------------------------------------
+
+def handle(loader : callable) -> callable:
+    """Marks a registry loader returning Asset handles, the scaled images are created when drawn (and can be evicted)."""
+    loader.is_handle = True
+    return loader
+
+# Robots particles
 dust = ParticleSpawner(Coord(0,(0,0)), Vector2(0,0), (50,50,50,100), 60, dir_randomness=2, density=1, speed=0.1)
 none_particle = ParticleSpawner(Coord(0,(0,0)), Vector2(0,0), (0,0,0,0), 0, dir_randomness=0, density=0, speed=0)
 
-SPRITESHEET_ROBOT_1_PACK = (anim.Spritesheet(load_image('data/robots/robot_1.png'),(24*6,46*6)), [8, 8, 8, 8],
-                             {"right_dust" :(dust.copy(), (4*6,46*6)),
-                              "left_dust" :(dust.copy(), (20*6,46*6)),
-                              "light" :(ParticleSpawner(Coord(0,(0,0)), Vector2(0,0), (26,80,90,200), 60, dir_randomness=0, density=1, speed=0, radius=(4,4)), (13*6,30*6))})
-
-SPRITESHEET_ROBOT_2_PACK = (anim.Spritesheet(load_image('data/robots/robot_2.png'),(31*6,43*6)), [8, 8, 8, 8],
-                            {"right_dust" :(dust.copy(), (6*6,43*6)),
-                              "left_dust" :(dust.copy(), (23*6,43*6))})
-
-SPRITESHEET_ROBOT_3_PACK = (anim.Spritesheet(load_image('data/robots/robot_3.png'),(27*6,39*6)), [14, 14, 11, 17],
-                            {"right_dust" :(dust.copy(), (4*6,39*6)),
-                              "left_dust" :(dust.copy(), (21*6,39*6))})
-
-SPRITESHEET_ROBOT_4_PACK = (anim.Spritesheet(load_image('data/robots/robot_4.png'),(26*6,38*6)), [8, 8, 8, 8],
-                            {"right_dust" :(dust.copy(), (5*6,38*6)),
-                              "left_dust" :(dust.copy(), (17*6,38*6))})
-
-SPRITESHEET_ROBOT_5_PACK = (anim.Spritesheet(load_image('data/robots/robot_5.png'),(31*6,48*6)), [8, 8, 8, 8],
-                            {"right_dust" :(dust.copy(), (11*6,48*6)),
-                              "left_dust" :(dust.copy(), (26*6,48*6))})
-
-SPRITESHEET_ROBOT_6_PACK = (anim.Spritesheet(load_image('data/robots/robot_6.png'),(32*6,48*6)), [8, 8, 17, 23],
-                            {"right_dust" :(none_particle.copy(), (11*6,48*6)),
-                              "left_dust" :(none_particle.copy(), (26*6,48*6)),
-                              "levitation" : (LineParticleSpawner(Coord(0,(0,0)), Vector2(1,0), Vector2(0,-1), (150,150,150,200), 25, dir_randomness=0, density=5, speed=1, radius=(4,4), line_length=96), (8*6, 48*6))})
-
-ANIM_ROBOT_MUSIC = anim.Animation(anim.Spritesheet(load_image('data/robots/robot_musique.png'),(48*6,32*6)), 0, 8)
-
-LIST_SPRITESHEET_ROBOT = [SPRITESHEET_ROBOT_1_PACK, SPRITESHEET_ROBOT_2_PACK, SPRITESHEET_ROBOT_3_PACK, SPRITESHEET_ROBOT_4_PACK, SPRITESHEET_ROBOT_5_PACK, SPRITESHEET_ROBOT_6_PACK]
-
-# NPC Sprites
-MAIN_CHARACTER = load_image("data/pnj_principal.png")
-SHOPKEEPER = load_image("data/shop_pnj.png")
-CROWD = load_image("data/foule_pnj.png")
-CACHIER_NPC = load_image("data/guichet_pnj.png")
-COLOR_NPC = load_image("data/distrid_46x78.png")
-TUTORIAL_NPC = load_image("data/deb_pnj.png")
-
-# Arm and Sprayer for the canva
-ARM = load_image("data/bra_articuler_1.png")
-SPRAYER = load_image("data/buse.png")
-
-# Frame and Patterns
-DRAWER_HOLDER = load_image("data/etagere_canva.png")
-THUMBNAIL_LIST = [load_image("data/pattern_storage/pattern_"+str(num)+".png") for num in range(1,16)]
-PATTERN_LIST = [load_image("data/pattern_storage/pattern_"+str(num)+"_frame.png") for num in range(1,16)]
-DRAWER_LIST = [load_image("data/drawers/bouton_"+str(num)+".png") for num in range(1,16)]
-
-# Cutscenes
-# The format for the cutscenes is:
-# - The cutscene
-# - The name of the main dialogue
-# - The name of the introspecive dialogue
-# Cutscenes are called by the unlock manager when a floor is discovered for the first time
-CUTSCENES : dict[str, (anim.Animation, str)] = {"floor0" : {"dialogue" : ("0", TUTORIAL_NPC, "tutor"), "introspec" : "introspec_0"},
-                                                "floor1" : {'anim' : "data/anim_deb_57_frames.png", "dialogue" : ("1", TUTORIAL_NPC, "tutor"),'introspec' : "introspec_1"},
-                                                "floor2" : {"anim" : "data/anim.png", "dialogue" : ("2",SHOPKEEPER,'cashy'), "introspec" : "introspec_2"},
-                                                "floor3" : {"dialogue" : ("3", COLOR_NPC, "colr"), "introspec" : "introspec_3"},
-                                                "floor4" : {"anim" : "data/caissier_anim_30frmaes.png", "dialogue" : ("4", CACHIER_NPC, 'rob'), "introspec" : "introspec_4"},
-                                                "floor5" : {"anim" : "data/anim_haut_65frames.png", "dialogue" : ("5", CROWD, 'crowd'), "introspec" : "introspec_5"}}
-
-
-
-INTRO_CUTSCENE : list[Surface] = [load_image(f'data/anim_intro/frame{i}.png') for i in range(1,6)]
\ No newline at end of file
+SPRITE_REGISTRY : dict[str, tuple[str, list[str], callable]] = {
+    # Backgrounds
+    # Full screen sprites are Asset handles, the scaled surface is only kept by the asset store and can be evicted when the player is on another floor
+    "BG1" : ("game", ["data/backgrounds/R1.png"], handle(lambda path: Asset(path, group="floor1"))),
+    "BG2" : ("game", ["data/backgrounds/R0.png"], handle(lambda path: Asset(path, group="floor0"))),
+    "BG3" : ("game", ["data/backgrounds/R2.png"], handle(lambda path: Asset(path, group="floor2"))),
+    "BG4" : ("game", ["data/backgrounds/R3.png"], handle(lambda path: Asset(path, group="floor3"))),
+    "BG5" : ("game", ["data/backgrounds/R4.png"], handle(lambda path: Asset(path, group="floor4"))),
+    "BG6" : ("game", ["data/backgrounds/R5.png"], handle(lambda path: Asset(path, group="floor5"))),
+    "PRETTY_BG" : ("homescreen", ["data/backgrounds/joli_background.png"], handle(lambda path: Asset(path, group="homescreen"))),
+
+    # UI Elements
+    "CANVA_UI_PAINT" : ("game", ['data/ui_canva_1.png'], load_image),
+    "CANVA_UI_NAME" : ("game", ['data/ui_canva2.png'], load_image),
+    "PAINT_BUTTON" : ("game", ['data/buttons/bouton_canva_ui_paint.png'], load_image),
+    "SAVE_BUTTON" : ("game", ['data/buttons/bouton_canva_ui_name.png'], load_image),
+    "WINDOW" : ("homescreen", ['data/bord.png'], load_image),
+    "YES_BUTTON" : ("game", ["data/buttons/oui.png"], load_image),
+    "NO_BUTTON" : ("game", ["data/buttons/non.png"], load_image),
+    "LOGIN_BUTTON" : ("homescreen", ["data/buttons/login.png"], load_image),
+    "QUIT_BUTTON" : ("homescreen", ["data/buttons/quit.png"], load_image),
+    "PLAY_BUTTON" : ("homescreen", ['data/buttons/jouer.png'], load_image),
+    "CLOSE_BUTTON" : ("homescreen", ["data/buttons/close.png"], load_image),
+    "REGISTER_BUTTON" : ("homescreen", ["data/buttons/register.png"], load_image),
+    "CONFIRM_BUTTON" : ("homescreen", ["data/buttons/confirm.png"], load_image),
+    "DESTRUCTION_BUTTON" : ("game", ["data/buttons/destruciotn_button.png"], load_image),
+    "BUILD_MODE_BORDER" : ("game", ["data/bordure_construction.png"], handle(lambda path: Asset(path, group="build"))),
+    "DESTRUCTION_MODE_BORDER" : ("game", ["data/bordure_destruction.png"], handle(lambda path: Asset(path, group="build"))),
+    "DIALBOX" : ("game", ["data/pop_up_dialogue.png"], load_image),
+    "ARROW_LEFT" : ("game", ["data/buttons/fleche_gauche.png"], load_image),
+    "ARROW_RIGHT" : ("game", ["data/buttons/fleche_droite.png"], load_image),
+    "LOCK" : ("game", ["data/cadena.png"], load_image),
+    "BEAUTY_LABEL_ANIMATION" : ("game", ["data/conteur_beaute.png"], lambda path: anim.Animation(load_spritesheet(path, (30, 30)), 0, 14)),
+    "MONEY_LABEL_ANIMATION" : ("game", ["data/argent_ui_30x28_25frames.png"], lambda path: anim.Animation(load_spritesheet(path, (30, 28)), 0, 25)),
+    "COLOR_BUTTON_BG" : ("game", ["data/couleurs_uii.png"], load_image),
+    "TITLE" : ("homescreen", ["data/titre_234x82.png"], load_image),
+    "FRAME_PAINTING" : ("game", ["data/cadre.png"], load_image),
+
+    # Spritesheets
+    "SPRITESHEET_INVENTORY" : ("game", ['data/etagere.png'], lambda path: load_spritesheet(path, (53, 31))),
+    "SPRITESHEET_HAUT" : ("game", ["data/prt_haut.png"], lambda path: load_spritesheet(path, (42, 29))),
+    "SPRITESHEET_BAS" : ("game", ["data/prt_bas.png"], lambda path: load_spritesheet(path, (42, 29))),
+    "SPRITESHEET_DOOR_BLINK" : ("game", ["data/prt_anim_blink.png"], lambda path: load_spritesheet(path, (42, 29))),
+    "SPRITESHEET_HAUT_FLIP" : ("game", ["data/prt_haut.png"], lambda path: load_flipped_spritesheet(path, (42, 29))),
+    "SPRITESHEET_BAS_FLIP" : ("game", ["data/prt_bas.png"], lambda path: load_flipped_spritesheet(path, (42, 29))),
+    "SPRITESHEET_DOOR_BLINK_FLIP" : ("game", ["data/prt_anim_blink.png"], lambda path: load_flipped_spritesheet(path, (42, 29))),
+    "SPRITESHEET_ROOFTOP" : ("game", ['data/rooftop.png'], handle(lambda path: anim.Spritesheet(Asset(path, group="floor5"), (320*6,180*6)))),
+    "EXCLAMATION_SPRITESHEET" : ("game", ["data/exclamation_2x9.png"], lambda path: load_spritesheet(path, (2, 9))),
+
+    # Desks
+    "DESK_FG" : ("game", ['data/guichet_1.png'], lambda path: load_spritesheet(path, (57, 66))),
+    "DESK_BG" : ("game", ['data/guichet_2.png'], lambda path: load_spritesheet(path, (57, 66))),
+    "DESK_ROBOT_BG" : ("game", ['data/guichet_robot.png'], lambda path: load_spritesheet(path, (57, 66))),
+
+    # Props
+    "SHOP" : ("game", ["data/shop_placeable.png"], load_image),
+
+    "SPRITE_STATUE_1" : ("game", ['data/props/statue.png'], load_image),
+    "SPRITE_STATUE_2" : ("game", ["data/props/think.png"], load_image),
+    "SPRITE_PLANT_1" : ("game", ["data/props/plant_1.png"], load_image),
+    "SPRITE_PLANT_2" : ("game", ["data/props/plant_2.png"], load_image),
+    "SPRITE_POSTER" : ("game", ["data/props/poster.png"], load_image),
+    "SPRITE_SPHERE" : ("game", ["data/props/familiar_sphere.png"], load_image),
+    "SPRITE_DUCK" : ("game", ["data/props/duck.png"], load_image),
+    "SPRITE_CUBE" : ("game", ["data/props/strange_cube.png"], load_image),
+    "SPRITE_STRAWBERRIES" : ("game", ["data/props/strawberries.png"], load_image),
+    "SPRITE_ROB" : ("game", ["data/props/walle.png"], load_image),
+    "SPRITE_PAINTING" : ("game", ["data/props/munch.png"], load_image),
+    "SPRITE_FLOWER_1" : ("game", ["data/props/karma_flower.png"], load_image),
+    "SPRITE_FLOWER_2" : ("game", ["data/props/red_flower.png"], load_image),
+    "SPRITE_VASE_1" : ("game", ["data/props/vase_1.png"], load_image),
+    "SPRITE_VASE_2" : ("game", ["data/props/vase_2.png"], load_image),
+    "SPRITE_VASE_3" : ("game", ["data/props/vase_3.png"], load_image),
+    "SPRITE_GOLD" : ("game", ["data/props/gold_ingot.png"], load_image),
+    "SPRITE_CELL" : ("game", ["data/props/cell.png"], load_image),
+    "SPRITE_SHELF_1" : ("game", ["data/props/shelf_1.png"], load_image),
+    "SPRITE_SHELF_2" : ("game", ["data/props/shelf_2.png"], load_image),
+    "TELESCOPE" : ("game", ["data/telescope.png"], load_image),
+
+    # Robots
+    #---------------------------------------------
+    #       The format for the robot anim is:
+    #line 1 - Walk Right
+    #line 2 - Walk Left
+    #line 3 - Idle Right
+    #line 4 - Watch Wall
+    #dict is the particle + the relative offset from the origin of the bot
+    #---------------------------------------------
+    "SPRITESHEET_ROBOT_1_PACK" : ("game", ['data/robots/robot_1.png'], lambda path: (load_spritesheet(path, (24, 46)), [8, 8, 8, 8],
+                                    {"right_dust" :(dust.copy(), (4*6,46*6)),
+                                     "left_dust" :(dust.copy(), (20*6,46*6)),
+                                     "light" :(ParticleSpawner(Coord(0,(0,0)), Vector2(0,0), (26,80,90,200), 60, dir_randomness=0, density=1, speed=0, radius=(4,4)), (13*6,30*6))})),
+
+    "SPRITESHEET_ROBOT_2_PACK" : ("game", ['data/robots/robot_2.png'], lambda path: (load_spritesheet(path, (31, 43)), [8, 8, 8, 8],
+                                    {"right_dust" :(dust.copy(), (6*6,43*6)),
+                                     "left_dust" :(dust.copy(), (23*6,43*6))})),
+
+    "SPRITESHEET_ROBOT_3_PACK" : ("game", ['data/robots/robot_3.png'], lambda path: (load_spritesheet(path, (27, 39)), [14, 14, 11, 17],
+                                    {"right_dust" :(dust.copy(), (4*6,39*6)),
+                                     "left_dust" :(dust.copy(), (21*6,39*6))})),
+
+    "SPRITESHEET_ROBOT_4_PACK" : ("game", ['data/robots/robot_4.png'], lambda path: (load_spritesheet(path, (26, 38)), [8, 8, 8, 8],
+                                    {"right_dust" :(dust.copy(), (5*6,38*6)),
+                                     "left_dust" :(dust.copy(), (17*6,38*6))})),
+
+    "SPRITESHEET_ROBOT_5_PACK" : ("game", ['data/robots/robot_5.png'], lambda path: (load_spritesheet(path, (31, 48)), [8, 8, 8, 8],
+                                    {"right_dust" :(dust.copy(), (11*6,48*6)),
+                                     "left_dust" :(dust.copy(), (26*6,48*6))})),
+
+    "SPRITESHEET_ROBOT_6_PACK" : ("game", ['data/robots/robot_6.png'], lambda path: (load_spritesheet(path, (32, 48)), [8, 8, 17, 23],
+                                    {"right_dust" :(none_particle.copy(), (11*6,48*6)),
+                                     "left_dust" :(none_particle.copy(), (26*6,48*6)),
+                                     "levitation" : (LineParticleSpawner(Coord(0,(0,0)), Vector2(1,0), Vector2(0,-1), (150,150,150,200), 25, dir_randomness=0, density=5, speed=1, radius=(4,4), line_length=96), (8*6, 48*6))})),
+
+    "ANIM_ROBOT_MUSIC" : ("game", ['data/robots/robot_musique.png'], lambda path: anim.Animation(load_spritesheet(path, (48, 32)), 0, 8)),
+
+    "LIST_SPRITESHEET_ROBOT" : ("game", [], lambda: [get_sprite(f"SPRITESHEET_ROBOT_{num}_PACK") for num in range(1, 7)]),
+
+    # NPC Sprites
+    "MAIN_CHARACTER" : ("game", ["data/pnj_principal.png"], load_image),
+    "SHOPKEEPER" : ("game", ["data/shop_pnj.png"], load_image),
+    "CROWD" : ("game", ["data/foule_pnj.png"], load_image),
+    "CACHIER_NPC" : ("game", ["data/guichet_pnj.png"], load_image),
+    "COLOR_NPC" : ("game", ["data/distrid_46x78.png"], load_image),
+    "TUTORIAL_NPC" : ("game", ["data/deb_pnj.png"], load_image),
+
+    # Arm and Sprayer for the canva
+    "ARM" : ("game", ["data/bra_articuler_1.png"], load_image),
+    "SPRAYER" : ("game", ["data/buse.png"], load_image),
+
+    # Frame and Patterns
+    "DRAWER_HOLDER" : ("game", ["data/etagere_canva.png"], load_image),
+    "THUMBNAIL_LIST" : ("game", ["data/pattern_storage/pattern_"+str(num)+".png" for num in range(1,16)], load_images),
+    "PATTERN_LIST" : ("game", ["data/pattern_storage/pattern_"+str(num)+"_frame.png" for num in range(1,16)], load_images),
+    "DRAWER_LIST" : ("game", ["data/drawers/bouton_"+str(num)+".png" for num in range(1,16)], load_images),
+
+    # Cutscenes
+    # The format for the cutscenes is:
+    # - The cutscene
+    # - The name of the main dialogue
+    # - The name of the introspecive dialogue
+    # Cutscenes are called by the unlock manager when a floor is discovered for the first time
+    "CUTSCENES" : ("game", [], lambda: {"floor0" : {"dialogue" : ("0", get_sprite("TUTORIAL_NPC"), "tutor"), "introspec" : "introspec_0"},
+                                        "floor1" : {'anim' : "data/anim_deb_57_frames.png", "dialogue" : ("1", get_sprite("TUTORIAL_NPC"), "tutor"),'introspec' : "introspec_1"},
+                                        "floor2" : {"anim" : "data/anim.png", "dialogue" : ("2", get_sprite("SHOPKEEPER"),'cashy'), "introspec" : "introspec_2"},
+                                        "floor3" : {"dialogue" : ("3", get_sprite("COLOR_NPC"), "colr"), "introspec" : "introspec_3"},
+                                        "floor4" : {"anim" : "data/caissier_anim_30frmaes.png", "dialogue" : ("4", get_sprite("CACHIER_NPC"), 'rob'), "introspec" : "introspec_4"},
+                                        "floor5" : {"anim" : "data/anim_haut_65frames.png", "dialogue" : ("5", get_sprite("CROWD"), 'crowd'), "introspec" : "introspec_5"}}),
+
+    "INTRO_CUTSCENE" : ("game", [f'data/anim_intro/frame{i}.png' for i in range(1,6)], handle(lambda *paths: [Asset(path, group="intro") for path in paths])),
+}
+
+def get_sprite(name : str):
+    """Returns the sprite registered under this name, loading it on first access.
+    The loaded sprite is stored as a global of the module, so the next accesses don't go through the registry anymore."""
+    if name not in globals():
+        group, paths, loader = SPRITE_REGISTRY[name]
+        globals()[name] = loader(*paths)
+    return globals()[name]
+
+def __getattr__(name : str):
+    """Called by Python when sprite.X is not (yet) a global of the module (PEP 562).
+    Resolves the sprites of the registry lazily."""
+    if name in SPRITE_REGISTRY:
+        return get_sprite(name)
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+
+def get_group_paths(group : str, handles : bool = False) -> list[str]:
+    """Returns the files used by the sprites of the group, so they can be decoded in advance by the parallel loader.
+    With handles=True, only the files of the Asset handles, which are decoded but not scaled in advance."""
+    return [path for sprite_group, paths, loader in SPRITE_REGISTRY.values()
+            if sprite_group == group and getattr(loader, "is_handle", False) == handles for path in paths]
+
+def preload(group : str):
+    """Loads every sprite of the group at once.
+    Intended to be called behind a loading screen, so the game doesn't freeze the first time a sprite is used."""
+    for name, (sprite_group, _, _) in SPRITE_REGISTRY.items():
+        if sprite_group == group:
+            get_sprite(name)
+    ASSETS.drop_prefetched() # the images scaled in advance were taken by the sprites, the others won't be
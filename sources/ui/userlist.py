@@ -42,7 +42,14 @@ class UserList:
         for i, data in enumerate(self.displayed_content):
             username, dic = data
             username_surf = TERMINAL_FONT.render(f"Musée de {username}", False, "white")
-            beauty_surf = TERMINAL_FONT.render(f"beauté : {dic['beauty']}", False, "white")
+            beauty_text = f"beauté : {dic['beauty']}"
+            if dic.get('beauty_per_room'): # older saves don't have the beauty of each floor
+                best_floor, best_beauty = max(dic['beauty_per_room'].items(), key=lambda item: item[1])
+                beauty_text += f" (étage {best_floor} : {best_beauty})"
+            for tag, beauty in dic.get('beauty_per_tag', {}).items(): # the decorations are already the total
+                if tag != "decoration":
+                    beauty_text += f" / {tag} : {beauty}"
+            beauty_surf = TERMINAL_FONT.render(beauty_text, False, "white")
             floor_unlock_surf = TERMINAL_FONT.render(f"étages débloqués : {len(dic['unlocks'].unlocked_floors)-1} / 5", False, "white")
             rect = Rect(735, 216+(110*i)+24, 450, 100)
             
@@ -12,22 +12,48 @@ Key Features:
 -------------
 - Spritesheet class for loading and extracting images from a spritesheet.
 - Animation class for managing animations with spritesheets.
+- Animations only extract a frame from the spritesheet when the frame changes.
+- Flipped animations share the flipped frames cached by the spritesheet, they are only flipped once.
 - Tests for pickling and unpickling Spritesheet instances are in tests/pickling_tests.py.
 
 Author: Tioh (Taddeo), with contributions from Pouchy (Paul) for the pickling compatibility.
 """
 
-from pygame import Surface, SRCALPHA, image
+from pygame import Surface, SRCALPHA, image, Rect, transform
+from utils.assetstore import Asset
 
 class Spritesheet:
-    def __init__(self, sprite : Surface, img_size : tuple[int]) -> None:
-        """Initializes the spritesheet with the image and the size of the images in the spritesheet."""
-        self.surf = sprite
-        self.rect = self.surf.get_rect()
+    def __init__(self, sprite : Surface | Asset, img_size : tuple[int]) -> None:
+        """Initializes the spritesheet with the image and the size of the images in the spritesheet.
+        The image can be an Asset handle for big spritesheets, so that the asset store can evict it when unused."""
+        self.source = sprite
+        self.rect = Rect((0, 0), self.source.get_size())
         self.img_size = img_size
+        self.frames : dict[tuple, Surface] = {} # frames already extracted (and flipped), only for plain surfaces (Asset sources can be evicted)
 
-    def get_img(self, coord : tuple[int]) -> Surface:
-        """Returns the image at the given coordinates in the spritesheet."""
+    @property
+    def surf(self) -> Surface:
+        """Returns the whole spritesheet surface, fetched from the asset store if needed."""
+        if type(self.source) is Asset:
+            return self.source.get()
+        return self.source
+
+    def get_img(self, coord : tuple[int], flip : tuple[bool, bool] = (False, False)) -> Surface:
+        """Returns the image at the given coordinates in the spritesheet, flipped on the x and y axis if asked.
+        For plain surfaces the frame is extracted once and shared (so its mask and outline are cached too), it must not be drawn on."""
+        key = tuple(coord) if flip == (False, False) else (tuple(coord), tuple(flip))
+        if key in self.frames:
+            return self.frames[key]
+
+        frame = self.extract_img(coord)
+        if flip != (False, False):
+            frame = transform.flip(frame, *flip)
+        if type(self.source) is not Asset:
+            self.frames[key] = frame
+        return frame
+
+    def extract_img(self, coord : tuple[int]) -> Surface:
+        """Copies the image at the given coordinates out of the spritesheet."""
         coord_x_px = coord[0]*self.img_size[0] #take the last x-coord to calculate the next position
         coord_y_py = coord[1]*self.img_size[1] #take the last y-coord to calculate the next position
         try:
@@ -44,30 +70,49 @@ class Spritesheet:
         """Returns the state of the object for safely pickling.
         Needed because the Surface object cannot be pickled, so we convert it to a bytestring."""
         state = self.__dict__.copy()
-        state["surf"] = (image.tostring(self.surf, "RGBA"), self.surf.get_size()) # convert the surface to a bytestring
+        state["frames"] = {} # extracted again when needed
+        if type(self.source) is not Asset: # Asset handles are picklable as they are
+            state["source"] = (image.tostring(self.source, "RGBA"), self.source.get_size()) # convert the surface to a bytestring
         return state
     
     def __setstate__(self, state : dict):
         """Sets the state of the object after safely unpickling.
         Needed because the Surface object cannot be pickled, so we convert it back from a bytestring."""
+        if "surf" in state: # saves made before the spritesheets could use Asset handles
+            state["source"] = state.pop("surf")
+        state.setdefault("frames", {})
         self.__dict__ = state 
-        self.surf = image.frombuffer(self.surf[0], self.surf[1], "RGBA")  # convert the bytestring back to a surface
+        if type(self.source) is tuple:
+            self.source = image.frombuffer(self.source[0], self.source[1], "RGBA")  # convert the bytestring back to a surface
 
 
 class Animation:
-    def __init__(self, spritesheet : Spritesheet, line : int, length : int, speed : int = 6, repeat = True ) -> None:
-        """Initializes the animation with the spritesheet, the line of the spritesheet to use, the number of frames in the animation, the speed of the animation, and whether the animation should repeat."""
+    def __init__(self, spritesheet : Spritesheet, line : int, length : int, speed : int = 6, repeat = True, flip : tuple[bool, bool] = (False, False)) -> None:
+        """Initializes the animation with the spritesheet, the line of the spritesheet to use, the number of frames in the animation, the speed of the animation, and whether the animation should repeat.
+        The frames can be flipped on the x and y axis, the spritesheet keeps the flipped frames."""
         self.spritesheet = spritesheet
+        self.flip = flip
         self.img_index : int = 0
         self.line = line
         self.length = length
         self.speed = speed
         self.__speed_incr = 0
         self.repeat = repeat
+        self.current_frame : Surface | None = None # the frame is only fetched from the spritesheet when the index changes
+        self.current_frame_index : int = -1
+
+    def get_current_frame(self) -> Surface:
+        """Returns the frame at img_index, fetched from the spritesheet only if the index changed since the last call.  
+        The returned surface is shared between calls, it must not be drawn on."""
+        if self.current_frame is None or self.current_frame_index != self.img_index:
+            self.current_frame = self.spritesheet.get_img((self.img_index, self.line), self.flip)
+            self.current_frame_index = self.img_index
+        return self.current_frame
 
     def get_frame(self) -> Surface:
         """returns the current frame of the animation and changes the frame if needed.  
-        Needs to be called every frame to update the animation with the right speed."""
+        Needs to be called every frame to update the animation with the right speed.  
+        The same surface is returned as long as the frame doesn't change, so it must not be drawn on."""
         if self.img_index == self.length-1 and self.repeat:
             self.img_index = 0
         
@@ -78,8 +123,7 @@ class Animation:
         else:
             self.__speed_incr += 1
         
-        new_surf = self.spritesheet.get_img((self.img_index, self.line))
-        return new_surf
+        return self.get_current_frame()
     
     def reset_frame(self):
         """resets the animation to the first frame.  
@@ -87,11 +131,22 @@ class Animation:
         returns 1st frame of the animation."""
         self.img_index = 0  
 
-        new_surf = self.spritesheet.get_img((0, self.line))
-        return new_surf
+        return self.get_current_frame()
     
     def copy(self):
-        return Animation(self.spritesheet,self.line,self.length,self.speed,self.repeat)
+        return Animation(self.spritesheet,self.line,self.length,self.speed,self.repeat,self.flip)
+
+    def __getstate__(self):
+        """The cached frame is a Surface, which can't be pickled, it is fetched again after unpickling."""
+        state = self.__dict__.copy()
+        state["current_frame"] = None
+        return state
+
+    def __setstate__(self, state : dict):
+        state.setdefault("current_frame_index", -1) # animations pickled before the frame cache
+        state.setdefault("flip", (False, False))
+        state["current_frame"] = None
+        self.__dict__ = state
 
     def is_finished(self):
         """checks if the animation has reached its last frame."""
@@ -0,0 +1,188 @@
+r"""
+Projet : Creative Core
+Equipe : Paul Baumard, Abel Bossard, Tybalt Debruyne, Taddeo Boisseuil-Marcil
+                     _
+                    | |
+   __ _ ___ ___  ___| |_ ___
+  / _` / __/ __|/ _ \ __/ __|
+ | (_| \__ \__ \  __/ |_\__ \
+  \__,_|___/___/\___|\__|___/
+
+Key Features:
+-------------
+- Keeps every decoded image at its native (pixel art) resolution, which is 36 times lighter than the 6x scaled version.
+- Produces scaled (and flipped) variants of an image the first time they are requested.
+- Evicts the least recently used variants when the memory budget is exceeded.
+- Variants are tagged with a group (usually a floor), the groups currently in use are never evicted.
+- Can be filled with images decoded by the parallel loader (utils/loader.py).
+- Scaled variants are read from / written to the persistent disk cache (utils/diskcache.py) when it is enabled.
+
+Notes:
+------
+Big sprites (backgrounds, rooftop, intro frames...) are referenced through an Asset handle instead of a Surface,
+this way nothing else keeps the pixels alive and the store is free to drop them.
+Small sprites are still loaded once with ASSETS.load() and owned by the caller, like before.
+"""
+
+from collections import OrderedDict
+from pygame import image, transform, Surface
+
+def get_surface_memory(surf : Surface) -> int:
+    """Returns the amount of memory (in bytes) used by the pixels of a surface."""
+    return surf.get_pitch() * surf.get_height()
+
+class AssetStore:
+    def __init__(self, budget_mb : float = 160) -> None:
+        """Stores the native images and a bounded cache of their scaled variants.
+        The budget only applies to the variants, native images are small and kept for the whole game."""
+        self.budget = int(budget_mb * 1024 * 1024)
+        self.natives : dict[str, Surface] = {}
+        self.variants : OrderedDict[tuple, tuple[Surface, str | None]] = OrderedDict() # ordered from least to most recently used
+        self.prefetched : dict[tuple[str, float], Surface] = {} # scaled by the loader, waiting for load() or get() to take them, out of the budget
+        self.prefetched_taken : set[tuple[str, float]] = set()
+        self.used_memory = 0
+        self.active_groups : set[str] = set()
+        self.disk_cache = None # DiskCache (utils/diskcache.py), set by the launcher if enabled
+
+    def set_budget(self, budget_mb : float):
+        """Changes the memory budget (in megabytes) of the variants, evicting some of them if needed."""
+        self.budget = int(budget_mb * 1024 * 1024)
+        self.evict()
+
+    def set_active_groups(self, groups):
+        """Marks the groups currently in use (current floor, homescreen...), their variants won't be evicted.
+        Intended to be called when changing floor."""
+        self.active_groups = set(groups)
+        self.evict()
+
+    def get_native(self, path : str) -> Surface:
+        """Returns the decoded image at its native resolution, decoding it on first use."""
+        if path not in self.natives:
+            self.natives[path] = image.load(path).convert_alpha()
+        return self.natives[path]
+
+    def is_cached(self, path : str, scale : float = 6) -> bool:
+        """Returns True if the scaled image can be created from the disk cache, without decoding the file."""
+        return self.disk_cache is not None and self.disk_cache.get_entry(path, scale) is not None
+
+    def build_variant(self, path : str, scale : float = 6, flip : bool = False) -> Surface:
+        """Creates a new scaled (and eventually vertically flipped) surface from the native image.
+        The disk cache is tried first, new variants are added to it."""
+        variant = "flip" if flip else ""
+        if (path, scale) in self.prefetched: # scaled by the loader, kept until drop_prefetched as the flipped sprites use it too
+            surf = self.prefetched[(path, scale)]
+            if flip:
+                surf = transform.flip(surf, False, True)
+                if self.disk_cache:
+                    self.disk_cache.put(path, scale, variant, surf)
+                return surf
+            if (path, scale) in self.prefetched_taken: # the first caller owns the surface, the next ones get a copy
+                return surf.copy()
+            self.prefetched_taken.add((path, scale))
+            return surf
+
+        if self.disk_cache:
+            surf = self.disk_cache.get(path, scale, variant)
+            if surf is not None:
+                return surf
+
+        surf = self.get_native(path)
+        if scale != 1:
+            surf = transform.scale_by(surf, scale)
+        if flip:
+            surf = transform.flip(surf, False, True)
+
+        if self.disk_cache:
+            self.disk_cache.put(path, scale, variant, surf)
+        return surf
+
+    def prefetch(self, path : str, native : Surface, scaled : Surface | None, scale : float = 6):
+        """Stores an image decoded (and scaled, unless scaled is None) by another thread (see utils/loader.py).
+        convert_alpha needs the display, so it is done here, on the main thread.
+        The scaled surface is kept out of the budget until load() or get() takes it, so it can't be evicted while the loading goes on."""
+        if path not in self.natives:
+            self.natives[path] = native.convert_alpha()
+
+        if scaled is not None and (path, scale) not in self.prefetched:
+            surf = scaled.convert_alpha()
+            if self.disk_cache:
+                self.disk_cache.put(path, scale, "", surf)
+            self.prefetched[(path, scale)] = surf
+
+    def drop_prefetched(self):
+        """Frees the prefetched surfaces nothing took, called once the sprites of the loaded group are created."""
+        self.prefetched.clear()
+        self.prefetched_taken.clear()
+
+    def load(self, path : str, scale : float = 6, flip : bool = False) -> Surface:
+        """Returns a scaled surface owned by the caller, it is not tracked by the store.
+        Used for the small sprites that stay in memory for the whole game."""
+        return self.build_variant(path, scale, flip) # takes the surface scaled by the loader if there is one
+
+    def get(self, path : str, scale : float = 6, flip : bool = False, group : str | None = None) -> Surface:
+        """Returns a cached scaled variant of the image, creating it if needed.
+        The returned surface must not be kept by the caller, as it can be evicted at any time."""
+        key = (path, scale, flip)
+        if key in self.variants:
+            self.variants.move_to_end(key) # most recently used
+            return self.variants[key][0]
+
+        surf = self.build_variant(path, scale, flip)
+        self.variants[key] = (surf, group)
+        self.used_memory += get_surface_memory(surf)
+        self.evict()
+        return surf
+
+    def evict(self):
+        """Drops the least recently used variants until the memory budget is respected.
+        Variants of the active groups are skipped."""
+        for key in list(self.variants.keys()): # copy because the dict is modified in the loop
+            if self.used_memory <= self.budget:
+                return
+            surf, group = self.variants[key]
+            if group in self.active_groups:
+                continue
+            del self.variants[key]
+            self.used_memory -= get_surface_memory(surf)
+
+    def evict_group(self, group : str):
+        """Drops every variant of a group, whatever the budget.
+        Used for the groups that won't be needed for a long time, like the homescreen once the game is started."""
+        for key in [key for key, (_, variant_group) in self.variants.items() if variant_group == group]:
+            self.used_memory -= get_surface_memory(self.variants.pop(key)[0])
+
+
+class Asset:
+    def __init__(self, path : str, scale : float = 6, flip : bool = False, group : str | None = None) -> None:
+        """Lightweight handle to a scaled variant stored in ASSETS.
+        Fully picklable, as it only contains the path and the variant parameters."""
+        self.path = path
+        self.scale = scale
+        self.flip = flip
+        self.group = group
+
+    def get(self) -> Surface:
+        """Returns the scaled surface, only use it for the current frame."""
+        return ASSETS.get(self.path, self.scale, self.flip, self.group)
+
+    def get_size(self) -> tuple[int, int]:
+        """Returns the size of the scaled surface without creating it."""
+        if ASSETS.disk_cache and (size := ASSETS.disk_cache.get_size(self.path, self.scale, "flip" if self.flip else "")):
+            return size
+        width, height = ASSETS.get_native(self.path).get_size()
+        return (int(width * self.scale), int(height * self.scale))
+
+    def get_width(self) -> int:
+        return self.get_size()[0]
+
+    def get_height(self) -> int:
+        return self.get_size()[1]
+
+    def get_rect(self, **kwargs):
+        return self.get().get_rect(**kwargs)
+
+    def __repr__(self):
+        return f"Asset({self.path}, scale={self.scale}, flip={self.flip}, group={self.group})"
+
+
+ASSETS = AssetStore()
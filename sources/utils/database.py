@@ -21,7 +21,6 @@ Author: Ytyt (Tybalt), with help from Pouchy for the custom packet system.
 import socket, pickle
 from hashlib import sha256
 from ui.infopopup import InfoPopup
-from utils.room_config import DEFAULT_SAVE
 
 class Database:
     def __init__(self, server_ip, server_port, info_popups : list[InfoPopup]):
@@ -105,6 +104,7 @@ class Database:
                 return user_data
         
         print("No pickled data found for user, loading default save.")
+        from utils.room_config import DEFAULT_SAVE # builds the rooms and their sprites, not imported with the homescreen
         return DEFAULT_SAVE
 
     def register_user(self, username, password):
@@ -113,6 +113,7 @@ class Database:
             self.info_popups.append(InfoPopup("Les deux champs sont requis!"))
             return
         
+        from utils.room_config import DEFAULT_SAVE
         pickled_data = pickle.dumps(DEFAULT_SAVE)  # Serialize the default save data to send to the database
         error_status = self.send_query('INSERT INTO users (username, password, pickled_data) VALUES (?, ?, ?)', read=False, query_parameters=(username, self.hash_password(password), pickled_data))
 
@@ -0,0 +1,214 @@
+r"""
+Projet : Creative Core
+Equipe : Paul Baumard, Abel Bossard, Tybalt Debruyne, Taddeo Boisseuil-Marcil
+      _ _     _                     _
+     | (_)   | |                   | |
+   __| |_ ___| | __   ___ __ _  ___| |__   ___
+  / _` | / __| |/ /  / __/ _` |/ __| '_ \ / _ \
+ | (_| | \__ \   <  | (_| (_| | (__| | | |  __/
+  \__,_|_|___/_|\_\  \___\__,_|\___|_| |_|\___|
+
+Key Features:
+-------------
+- Stores the final pixels of the scaled (and flipped) sprites in a single binary file.
+- Entries are keyed by path, scale and variant, and are invalidated when the hash of the source file changes.
+- The size and modification time of the source file are checked first, the file is only read and hashed when they changed.
+- The file is memory mapped, surfaces are created with image.frombuffer, without decoding or scaling anything.
+- New sprites are written to a spool file as soon as they are produced, only their index entries stay in memory until the save.
+
+Notes:
+------
+File layout (little endian):
+    magic (4 bytes) | version (uint32) | index size (uint32) | JSON index | padding | pixel blobs
+Each blob starts on a 64 bytes boundary and holds the pixels in BGRA order, which is the format of convert_alpha,
+so the mapped surfaces are as fast to blit as the converted ones.
+The mapping is copy on write, surfaces created from it can be drawn on without touching the file.
+The spool file (".pending", same blob alignment, no header) is copied blob by blob into the new cache file on save, then deleted.
+"""
+
+import os
+import mmap
+import json
+import struct
+import hashlib
+from pygame import image, Surface
+
+CACHE_MAGIC = b"CCAC"
+CACHE_VERSION = 1 # increase it when the layout or the way sprites are produced changes, old caches are then ignored
+ALIGNMENT = 64
+HEADER = struct.Struct("<4sII")
+
+def align(offset : int) -> int:
+    """Rounds the offset up to the next ALIGNMENT boundary."""
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+def get_file_stat(path : str) -> list[int] | None:
+    """Returns the size and the modification time (ns) of the file, None if it doesn't exist anymore."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns] # a list, like it is read back from the JSON index
+
+def get_file_hash(path : str) -> str:
+    """Returns the hash of the content of the file."""
+    with open(path, 'rb') as file:
+        return hashlib.sha1(file.read()).hexdigest()
+
+class DiskCache:
+    def __init__(self, path : str) -> None:
+        """Persistent cache of the scaled sprites, call open() before using it and save() after loading new sprites."""
+        self.path = path
+        self.index : dict[str, dict] = {}
+        self.map : mmap.mmap | None = None
+        self.pending : dict[str, tuple[str, tuple[int, int], int, int]] = {} # entries created since the file was opened : hash, size, offset and length in the spool
+        self.stats_changed = False # entries validated by their hash, their new stat is written by the next save
+        self.spool = None # file holding the pixels of the pending entries, opened on the first put
+        self.hashes : dict[str, str] = {}
+        self.stats : dict[str, list[int] | None] = {}
+
+    def open(self):
+        """Maps the cache file, an invalid or outdated file is ignored (and replaced by the next save)."""
+        # a cache written while the old one was still mapped (see save) replaces it now
+        if os.path.exists(self.path + ".new"):
+            try:
+                os.replace(self.path + ".new", self.path)
+            except OSError:
+                pass
+
+        if not os.path.exists(self.path):
+            return
+
+        with open(self.path, 'rb') as file:
+            try:
+                cache_map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY)
+            except ValueError: # empty file
+                return
+
+        magic, version, index_size = HEADER.unpack_from(cache_map, 0) if len(cache_map) >= HEADER.size else (None, None, 0)
+        if magic != CACHE_MAGIC or version != CACHE_VERSION:
+            cache_map.close()
+            return
+
+        self.index = json.loads(bytes(cache_map[HEADER.size:HEADER.size + index_size]))
+        self.map = cache_map
+
+    def get_source_hash(self, path : str) -> str:
+        if path not in self.hashes:
+            self.hashes[path] = get_file_hash(path)
+        return self.hashes[path]
+
+    def get_source_stat(self, path : str) -> list[int] | None:
+        if path not in self.stats:
+            self.stats[path] = get_file_stat(path)
+        return self.stats[path]
+
+    def is_valid(self, path : str, entry : dict) -> bool:
+        """Returns True if the entry was made from the current content of the source file.
+        Only a file whose size or modification time changed is hashed, its new stat is then kept for the next save."""
+        stat = self.get_source_stat(path)
+        if stat is None:
+            return False
+        if entry.get("stat") == stat:
+            return True
+        if entry["hash"] != self.get_source_hash(path):
+            return False
+        entry["stat"] = stat # same content, touched or copied
+        self.stats_changed = True
+        return True
+
+    @staticmethod
+    def get_key(path : str, scale : float, variant : str) -> str:
+        return f"{path}|{scale}|{variant}"
+
+    def get_entry(self, path : str, scale : float, variant : str = "") -> dict | None:
+        """Returns the index entry if it is up to date with the source file."""
+        entry = self.index.get(self.get_key(path, scale, variant))
+        if entry and self.map and self.is_valid(path, entry):
+            return entry
+        return None
+
+    def get_size(self, path : str, scale : float, variant : str = "") -> tuple[int, int] | None:
+        """Returns the size of the cached sprite without creating the surface."""
+        entry = self.get_entry(path, scale, variant)
+        return tuple(entry["size"]) if entry else None
+
+    def get(self, path : str, scale : float, variant : str = "") -> Surface | None:
+        """Returns a surface backed by the mapped file, or None if the sprite is not cached."""
+        entry = self.get_entry(path, scale, variant)
+        if entry is None:
+            return None
+        pixels = memoryview(self.map)[entry["offset"]:entry["offset"] + entry["length"]]
+        return image.frombuffer(pixels, tuple(entry["size"]), "BGRA")
+
+    def put(self, path : str, scale : float, variant : str, surf : Surface):
+        """Adds a sprite to the cache, its pixels go to the spool file right away, it is in the cache file after the next save."""
+        key = self.get_key(path, scale, variant)
+        if key in self.pending or self.get_entry(path, scale, variant) is not None:
+            return
+        if self.spool is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self.spool = open(self.path + ".pending", 'w+b') # a spool left by a crash is overwritten
+        offset = align(self.spool.seek(0, os.SEEK_END))
+        pixels = image.tobytes(surf, "BGRA")
+        self.spool.seek(offset)
+        self.spool.write(pixels)
+        self.pending[key] = (self.get_source_hash(path), surf.get_size(), offset, len(pixels))
+
+    def read_pending(self, key : str) -> bytes:
+        """Reads the pixels of a pending entry back from the spool file."""
+        _, _, offset, length = self.pending[key]
+        self.spool.seek(offset)
+        return self.spool.read(length)
+
+    def save(self):
+        """Writes a new cache file with the valid entries of the mapped file and the new ones.
+        The mapped file can't be replaced on every system while surfaces still use it,
+        so the new file is written next to it and takes its place on the next open() if needed."""
+        if not self.pending and not self.stats_changed:
+            return
+
+        # keeps the old entries that are still valid
+        index : dict[str, dict] = {}
+        for key, entry in self.index.items():
+            path = key.rsplit("|", 2)[0]
+            if key not in self.pending and self.is_valid(path, entry):
+                index[key] = {"hash" : entry["hash"], "stat" : entry["stat"], "size" : entry["size"], "offset" : 0, "length" : entry["length"]}
+        old_offsets = {key : self.index[key]["offset"] for key in index}
+        for key, (file_hash, size, _, length) in self.pending.items():
+            index[key] = {"hash" : file_hash, "stat" : self.get_source_stat(key.rsplit("|", 2)[0]), "size" : size, "offset" : 0, "length" : length}
+
+        # the offsets depend on the size of the index, which depends on the offsets, so the space of the index is reserved generously
+        index_space = align(HEADER.size + len(json.dumps(index)) + 16 * len(index) + ALIGNMENT)
+        offset = index_space
+        for entry in index.values():
+            entry["offset"] = offset
+            offset = align(offset + entry["length"])
+        index_bytes = json.dumps(index).encode()
+
+        # the blobs are copied one at a time, from the mapped file or the spool
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path + ".new", 'wb') as file:
+            file.write(HEADER.pack(CACHE_MAGIC, CACHE_VERSION, len(index_bytes)))
+            file.write(index_bytes)
+            for key, entry in index.items():
+                file.seek(entry["offset"])
+                if key in old_offsets:
+                    file.write(memoryview(self.map)[old_offsets[key]:old_offsets[key] + entry["length"]])
+                else:
+                    file.write(self.read_pending(key))
+
+        if self.spool is not None:
+            self.spool.close()
+            self.spool = None
+            os.remove(self.path + ".pending")
+        self.pending.clear()
+        self.stats_changed = False
+        try:
+            os.replace(self.path + ".new", self.path)
+        except OSError: # still mapped (windows), done on the next launch
+            return
+        self.open() # the surfaces created from the old mapping keep it alive
+
+
+DISK_CACHE = DiskCache("data/cache/assets.cache")
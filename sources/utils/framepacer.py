@@ -0,0 +1,127 @@
+r"""
+Projet : Creative Core
+Equipe : Paul Baumard, Abel Bossard, Tybalt Debruyne, Taddeo Boisseuil-Marcil
+   __
+  / _|
+ | |_ _ __ __ _ _ __ ___   ___   _ __   __ _  ___ ___ _ __
+ |  _| '__/ _` | '_ ` _ \ / _ \ | '_ \ / _` |/ __/ _ \ '__|
+ | | | | | (_| | | | | | |  __/ | |_) | (_| | (_|  __/ |
+ |_| |_|  \__,_|_| |_| |_|\___| | .__/ \__,_|\___\___|_|
+                                | |
+                                |_|
+
+Key Features:
+-------------
+- Replaces the plain clock.tick of the main loop.
+- Drops to a few simulation-only ticks per second when the window is minimized, hidden or loses the focus.
+- Lowers the frame rate when the frames consistently take longer than their budget, and raises it back when they are fast again.
+- Tells the main loop how many updates to run each frame, so the game keeps its speed whatever the frame rate.
+- Measures the frame time jitter, shown in the debug banner.
+
+Notes:
+------
+The game logic (bots, animations, particles) advances by a fixed step on each update, written for the configured fps.
+When the frame rate is lower, several updates are run in a single frame instead of slowing the game down.
+The work time of a frame is measured by the main loop (add_work_time), and a frame after a wait for events (wake) runs a single update.
+"""
+
+from collections import deque
+from statistics import fmean, pstdev
+import pygame as pg
+
+THROTTLING_EVENTS = (pg.WINDOWFOCUSLOST, pg.WINDOWMINIMIZED, pg.WINDOWHIDDEN)
+RESTORING_EVENTS = (pg.WINDOWFOCUSGAINED, pg.WINDOWRESTORED, pg.WINDOWSHOWN)
+
+class FramePacer:
+    def __init__(self, fps : int = 60, background_fps : int = 10, window : int = 120) -> None:
+        """fps is the rate of the game logic, and the highest frame rate.
+        background_fps is the rate of the simulation ticks while the window is in the background.
+        window is the number of frames used to measure the frame times."""
+        self.clock = pg.time.Clock()
+        self.fps = fps
+        self.levels = sorted({fps, fps * 3 // 4, fps // 2}, reverse=True) # frame rates the pacer can choose from
+        self.target_fps = fps
+        self.background_fps = background_fps
+        self.throttled = False
+
+        self.frame_times : deque[int] = deque(maxlen=window) # ms between two frames
+        self.work_times : deque[float] = deque(maxlen=window) # ms spent in update and draw, without the waiting
+        self.accumulator : float = 0 # simulation steps owed to the game
+        self.slept = False # the main loop waited for an event since the last tick, the elapsed time isn't a frame
+
+    def handle_event(self, event : pg.event.Event):
+        """Throttles the game when the window goes to the background and restores it when it comes back."""
+        if event.type in THROTTLING_EVENTS:
+            self.set_throttled(True)
+        elif event.type in RESTORING_EVENTS:
+            self.set_throttled(False)
+
+    def set_throttled(self, throttled : bool):
+        if throttled != self.throttled:
+            self.throttled = throttled
+            self.frame_times.clear() # the old measures don't mean anything at the new rate
+            self.work_times.clear()
+
+    def should_render(self) -> bool:
+        """Returns False while the window is in the background, only the simulation runs."""
+        return not self.throttled
+
+    def get_rate(self) -> int:
+        return self.background_fps if self.throttled else self.target_fps
+
+    def tick(self) -> int:
+        """Waits for the next frame, and returns the number of updates to run in it.
+        Always 1 at the full frame rate, more when throttled or slowed down to keep the game speed."""
+        elapsed = self.clock.tick(self.get_rate())
+        if self.slept: # the game was paused or idle, the time asleep is neither a slow frame nor simulation owed to the game
+            self.slept = False
+            self.accumulator = 0
+            return 1
+
+        self.frame_times.append(elapsed)
+        if not self.throttled:
+            self.adapt_target()
+
+        if self.get_rate() == self.fps:
+            self.accumulator = 0
+            return 1
+
+        self.accumulator += elapsed * self.fps / 1000
+        steps = int(self.accumulator)
+        self.accumulator -= steps
+        return min(steps, self.fps) # never more than a second of simulation at once (after a freeze of the window for example)
+
+    def add_work_time(self, work_time : float):
+        """Records the time (in ms) spent in the update and the draw of a frame, measured by the main loop.
+        The clock can't measure it, its raw time includes the blocking waits for events."""
+        self.work_times.append(work_time)
+
+    def wake(self):
+        """Called by the main loop after it slept until an event, the next tick won't count the time asleep."""
+        self.slept = True
+
+    def adapt_target(self):
+        """Lowers the frame rate if the frames take more than 90% of their budget, raises it if they would fit in half the budget of the higher rate.
+        Decided once every window of frames, so it doesn't oscillate."""
+        if len(self.work_times) < self.work_times.maxlen:
+            return
+
+        work_time = fmean(self.work_times)
+        level = self.levels.index(self.target_fps)
+        if work_time > 0.9 * 1000 / self.target_fps and level < len(self.levels) - 1:
+            self.target_fps = self.levels[level + 1]
+        elif level > 0 and work_time < 0.5 * 1000 / self.levels[level - 1]:
+            self.target_fps = self.levels[level - 1]
+        else:
+            return
+        self.frame_times.clear()
+        self.work_times.clear()
+
+    def get_jitter(self) -> float:
+        """Returns the standard deviation of the frame times, in ms."""
+        return pstdev(self.frame_times) if len(self.frame_times) > 1 else 0
+
+    def get_report(self) -> str:
+        """Short summary of the pacing, for the debug banner."""
+        state = "background" if self.throttled else f"{self.target_fps}/{self.fps}"
+        return f"fps : {round(self.clock.get_fps())} ({state}) / jitter : {round(self.get_jitter(), 1)}ms"
@@ -0,0 +1,71 @@
+r"""
+Projet : Creative Core
+Equipe : Paul Baumard, Abel Bossard, Tybalt Debruyne, Taddeo Boisseuil-Marcil
+  _                 _
+ | |               | |
+ | | ___   __ _  __| | ___ _ __
+ | |/ _ \ / _` |/ _` |/ _ \ '__|
+ | | (_) | (_| | (_| |  __/ |
+ |_|\___/ \__,_|\__,_|\___|_|
+
+Key Features:
+-------------
+- Decodes and scales the images and decodes the sounds in a thread pool.
+- Applies convert_alpha on the main thread as the results arrive (it needs the display).
+- Reports the real progress of the loading, used by the loading screen progress bar.
+
+Notes:
+------
+PNG/MP3 decoding and scaling are done in C by pygame, which releases the GIL, so the threads really run in parallel.
+The decoded images are handed to the asset store (ASSETS.prefetch), the sprite registry then finds them already loaded.
+The big sprites behind an Asset handle are only decoded, they are scaled when drawn, so the loading doesn't exceed the memory budget.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pygame import image, transform, mixer, Surface
+from utils.assetstore import ASSETS
+
+def decode_image(path : str, scale : float | None = 6) -> tuple[Surface, Surface | None]:
+    """Decodes the image and scales it (unless scale is None), called in a worker thread.
+    The surfaces are not converted yet, as convert_alpha can only be called on the main thread."""
+    native = image.load(path)
+    return native, transform.scale_by(native, scale) if scale is not None else None
+
+def decode_sound(path : str) -> mixer.Sound:
+    """Decodes the sound, called in a worker thread."""
+    return mixer.Sound(path)
+
+class ParallelLoader:
+    def __init__(self, workers : int | None = None) -> None:
+        """Loads a batch of images and sounds in parallel, using one thread per core by default."""
+        self.workers = workers or os.cpu_count() or 1
+
+    def load(self, image_paths : list[str], sound_paths : tuple[str, ...] = (), native_paths : tuple[str, ...] = (), on_progress = None) -> dict[str, mixer.Sound]:
+        """Loads every image and sound of the lists, blocking until everything is loaded.
+        on_progress(done, total) is called on the main thread each time a file is loaded.
+        Images are stored in ASSETS, the sounds are returned in a dict indexed by their path.
+        The images of native_paths are only decoded, they are scaled when used (big sprites behind an Asset handle)."""
+        native_paths = [path for path in dict.fromkeys(native_paths) if path not in ASSETS.natives and not ASSETS.is_cached(path)]
+        image_paths = [path for path in dict.fromkeys(image_paths) if path not in ASSETS.natives and not ASSETS.is_cached(path) and path not in native_paths] # removes duplicates, already loaded and disk cached images
+        sound_paths = list(dict.fromkeys(sound_paths))
+        sounds = {}
+        total = len(image_paths) + len(native_paths) + len(sound_paths)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = {executor.submit(decode_image, path) : ("image", path) for path in image_paths}
+            futures.update({executor.submit(decode_image, path, None) : ("image", path) for path in native_paths})
+            futures.update({executor.submit(decode_sound, path) : ("sound", path) for path in sound_paths})
+
+            for done, future in enumerate(as_completed(futures), start=1):
+                kind, path = futures[future]
+                if kind == "image":
+                    native, scaled = future.result()
+                    ASSETS.prefetch(path, native, scaled) # convert_alpha happens here, on the main thread
+                else:
+                    sounds[path] = future.result()
+
+                if on_progress:
+                    on_progress(done, total)
+
+        return sounds
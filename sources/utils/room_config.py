@@ -19,7 +19,7 @@ Author: Pouchy (Paul), Leih (Abel)
 
 from utils.coord import Coord
 from objects.placeable import Placeable
-from core.room import Room
+from core.room import Room, Museum
 import ui.sprite as sprite
 from pygame import Surface, SRCALPHA
 import objects.placeablesubclass as subplaceable
@@ -40,8 +40,7 @@ def init_rooms():
 
     # floor 0
     R0 = Room(0, sprite.BG2)
-    R0.placed += [stairs_up]
-    R0.blacklist += [stairs_up]
+    R0.add_placeable(stairs_up, blacklisted=True)
 
     # floor 1
     R1 = Room(1, sprite.BG1)
@@ -49,34 +48,34 @@ def init_rooms():
     collider = Placeable('collider', Coord(1, (0, 0)), Surface((798, 1080), flags=SRCALPHA), "collider", flags=['no_outline', 'no_interaction'])
     inventory = subplaceable.InvPlaceable(
         "Inventory", Coord(1, (1548, 210)), Surface((53*6, 31*6)))
-    R1.placed += [guichet, stairs_up, stairs_down, inventory, collider]
-    R1.blacklist += [stairs_up, stairs_down, inventory, guichet, collider]
+    for placeable in [guichet, stairs_up, stairs_down, inventory, collider]:
+        R1.add_placeable(placeable, blacklisted=True)
 
     # floor 2
     R2 = Room(2, sprite.BG3)
     shop = subplaceable.ShopPlaceable('shop', Coord(
         2, (48, 468)), sprite.SHOP, "shop")
-    R2.placed += [stairs_up, stairs_down, shop, inventory]
-    R2.blacklist += [stairs_up, stairs_down, shop, inventory]
+    for placeable in [stairs_up, stairs_down, shop, inventory]:
+        R2.add_placeable(placeable, blacklisted=True)
 
     # floor 3
     R3 = Room(3, sprite.BG4)
     color_unlock = subplaceable.ColorUnlockPlaceable('ColorUnlockPlaceable', Coord(3, (48, 468+24)), sprite.COLOR_NPC)
-    R3.placed += [stairs_up, stairs_down, inventory, color_unlock]
-    R3.blacklist += [stairs_up, stairs_down, inventory, color_unlock]
+    for placeable in [stairs_up, stairs_down, inventory, color_unlock]:
+        R3.add_placeable(placeable, blacklisted=True)
 
     # floor 4
     R4 = Room(4, sprite.BG5)
     auto_cachier = subplaceable.AutoCachierPlaceable(
         'AutoCachierPlaceable', Coord(1, (1398, 574)), sprite.CACHIER_NPC)
-    R4.placed += [stairs_up, stairs_down, auto_cachier, inventory]
-    R4.blacklist += [stairs_up, stairs_down, auto_cachier, inventory]
+    for placeable in [stairs_up, stairs_down, auto_cachier, inventory]:
+        R4.add_placeable(placeable, blacklisted=True)
 
     # floor 5
     R5 = Room(5, anim=Animation(sprite.SPRITESHEET_ROOFTOP, 0, 14, 8))
     music_robot = Placeable('Johnny Hallyday 2.0', Coord(5,(240,780)), None, anim=sprite.ANIM_ROBOT_MUSIC) #Place the musician bot
-    R5.placed += [stairs_down, music_robot]
-    R5.blacklist += [stairs_down, music_robot]
+    for placeable in [stairs_down, music_robot]:
+        R5.add_placeable(placeable, blacklisted=True)
 
     special_placeables = {'staires_up' : stairs_up, 'staires_down' : stairs_down, 'guichet' : guichet, 'inventory' : inventory, 'shop' : shop, 'auto_cachier' : auto_cachier, 'music_robot' : music_robot, 'color_unlock' : color_unlock} #used to access special placeables in the game loop
 
@@ -84,6 +83,7 @@ def init_rooms():
 
 
 ROOMS, SPECIAL_PLACEABLES = init_rooms()
+MUSEUM = Museum(ROOMS) # keeps the total beauty of the floors up to date
 
 # Assigning rooms to variables for easier access
 R0 = ROOMS[0]
@@ -0,0 +1,88 @@
+r"""
+Projet : Creative Core
+Equipe : Paul Baumard, Abel Bossard, Tybalt Debruyne, Taddeo Boisseuil-Marcil
+           _              _       _
+          | |            | |     | |
+  ___  ___| |__   ___  __| |_   _| | ___ _ __
+ / __|/ __| '_ \ / _ \/ _` | | | | |/ _ \ '__|
+ \__ \ (__| | | |  __/ (_| | |_| | |  __/ |
+ |___/\___|_| |_|\___|\__,_|\__,_|_|\___|_|
+
+Key Features:
+-------------
+- Runs the update of each subsystem of the game at its own rate (every update, 30 Hz, 10 Hz...).
+- Tasks sharing the same rate are spread over different updates instead of all running on the same one.
+- Low priority tasks are postponed to the next update when the update already used its time budget.
+- Measures the time spent in each task, for the debug banner or a profiler.
+
+Notes:
+------
+The rates are relative to the game logic rate (config fps), one run() call is one update of the game.
+A task registered with catch_up=True receives the number of updates since its last run, to keep its speed at a lower rate.
+"""
+
+from time import perf_counter
+
+class Task:
+    def __init__(self, name : str, func, period : int, low_priority : bool, catch_up : bool, phase : int) -> None:
+        self.name = name
+        self.func = func
+        self.period = period # in updates
+        self.low_priority = low_priority
+        self.catch_up = catch_up
+        self.next_tick = phase
+        self.last_tick = phase - period
+
+        # timings in ms
+        self.calls = 0
+        self.last_time = 0.
+        self.mean_time = 0. # exponential moving average
+        self.max_time = 0.
+
+    def run(self, tick : int):
+        start = perf_counter()
+        if self.catch_up:
+            self.func(tick - self.last_tick)
+        else:
+            self.func()
+        self.last_time = (perf_counter() - start) * 1000
+
+        self.calls += 1
+        self.mean_time = self.last_time if self.calls == 1 else self.mean_time * 0.95 + self.last_time * 0.05
+        self.max_time = max(self.max_time, self.last_time)
+        self.last_tick = tick
+        self.next_tick = tick + self.period
+
+class Scheduler:
+    def __init__(self, fps : int = 60, budget_ms : float | None = None) -> None:
+        """fps is the number of run() calls per second.
+        budget_ms is the time after which the low priority tasks are postponed, half of a frame by default."""
+        self.fps = fps
+        self.budget_ms = budget_ms if budget_ms is not None else 500 / fps
+        self.tasks : list[Task] = []
+        self.tick = 0
+
+    def register(self, name : str, func, rate : float | None = None, low_priority : bool = False, catch_up : bool = False):
+        """Adds a task run rate times per second (every update if None), in the order of registration."""
+        period = max(1, round(self.fps / rate)) if rate else 1
+        phase = sum(1 for task in self.tasks if task.period == period) % period # spreads the tasks of the same rate
+        self.tasks.append(Task(name, func, period, low_priority, catch_up, self.tick + phase))
+
+    def run(self):
+        """Runs the tasks that are due, called once per update of the game."""
+        start = perf_counter()
+        for task in self.tasks:
+            if task.next_tick > self.tick:
+                continue
+            if task.low_priority and (perf_counter() - start) * 1000 > self.budget_ms:
+                continue # stays due, runs on the next update
+            task.run(self.tick)
+        self.tick += 1
+
+    def get_timings(self) -> dict[str, dict]:
+        """Returns the timings (in ms) and the number of calls of each task."""
+        return {task.name : {"calls" : task.calls, "last" : task.last_time, "mean" : task.mean_time, "max" : task.max_time} for task in self.tasks}
+
+    def get_report(self) -> str:
+        """Mean time of each task, for the debug banner."""
+        return " / ".join(f"{task.name} : {task.mean_time:.2f}ms" for task in self.tasks)
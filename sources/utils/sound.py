@@ -11,6 +11,7 @@ Equipe : Paul Baumard, Abel Bossard, Tybalt Debruyne, Taddeo Boisseuil-Marcil
 Key Features:
 -------------
 - Class to manage sounds in the game.
+- Can be given the sounds already decoded by the parallel loader (utils/loader.py).
 
 Every sounds are free access and have been taken in pixabay.com
 
@@ -21,8 +22,38 @@ import pygame
 import random
 from utils.timermanager import TimerManager 
 
+# Every sound of the game, the name is the attribute of the SoundManager
+SOUND_FILES = {"accrocher" : 'data/sounds/accrocher_tableau.wav',
+               "achieve" : 'data/sounds/achieve.mp3',
+               "shop" : 'data/sounds/shop.wav',
+               "down" : 'data/sounds/Doordown.wav',
+               "up" : 'data/sounds/elevator.wav',
+               "incorrect" : 'data/sounds/incorrect.wav',
+               "items" : 'data/sounds/items.mp3',
+               "mite" : 'data/sounds/mite.wav',
+
+               "floorcracking" : 'data/sounds/floorcracking.mp3',
+               "blank_sound" : 'data/sounds/blank_sound.mp3',
+               "noise" : 'data/sounds/noise.mp3',
+               "rain" : 'data/sounds/rain.mp3',
+               "wind" : 'data/sounds/wind.mp3',
+
+               "robot_moving" : 'data/sounds/robot_moving.mp3',
+               "robot" : 'data/sounds/robot.mp3',
+               "robot1" : 'data/sounds/robot1.wav',
+               "robot2" : 'data/sounds/robot2.wav',
+               "robot3" : 'data/sounds/robot3.wav',
+               "robot4" : 'data/sounds/robot4.wav',
+               "robot5" : 'data/sounds/robot5.wav',
+               "robot6" : 'data/sounds/robot6.wav',
+               "robots" : 'data/sounds/robots.mp3',
+               "walk" : 'data/sounds/walk.wav',
+
+               "music_begin" : 'data/sounds/musiqueintro.wav',
+               "music_ambiant" : 'data/sounds/Musiquejeu.wav'}
+
 class SoundManager:
-    def __init__(self, volume, timer):
+    def __init__(self, volume, timer, preloaded_sounds : dict[str, pygame.mixer.Sound] = None):
         """
         Class to manage sounds in the game.  
         It is a good idea to have a loading screen while loading the sounds.  
@@ -32,40 +63,15 @@ class SoundManager:
         # Set the volume from the config file
         self.volume = volume/100 # because the volume is a percentage
 
-        # Load sounds
-        self.accrocher = pygame.mixer.Sound('data/sounds/accrocher_tableau.wav') #
-        self.achieve = pygame.mixer.Sound('data/sounds/achieve.mp3') #
-        self.shop = pygame.mixer.Sound('data/sounds/shop.wav') #
-        self.down = pygame.mixer.Sound('data/sounds/Doordown.wav') #
-        self.up = pygame.mixer.Sound('data/sounds/elevator.wav') #
-        self.incorrect = pygame.mixer.Sound('data/sounds/incorrect.wav') #
-        self.items = pygame.mixer.Sound('data/sounds/items.mp3') #
-        self.mite = pygame.mixer.Sound('data/sounds/mite.wav') #
+        # Load sounds, the ones already decoded by the loading screen are taken from preloaded_sounds
+        self.preloaded_sounds = preloaded_sounds if preloaded_sounds else {}
+        for name, path in SOUND_FILES.items():
+            setattr(self, name, self.load_sound(path))
 
         classic_sounds = [self.accrocher, self.achieve, self.shop, self.down, self.up, self.incorrect, self.items, self.mite]
         for sound in classic_sounds:
             sound.set_volume(0.5*self.volume)
 
-        self.floorcracking = pygame.mixer.Sound('data/sounds/floorcracking.mp3')
-        self.blank_sound = pygame.mixer.Sound('data/sounds/blank_sound.mp3')
-        self.noise = pygame.mixer.Sound('data/sounds/noise.mp3')
-        self.rain = pygame.mixer.Sound('data/sounds/rain.mp3')
-        self.wind = pygame.mixer.Sound('data/sounds/wind.mp3')
-
-        self.robot_moving = pygame.mixer.Sound('data/sounds/robot_moving.mp3')
-        self.robot = pygame.mixer.Sound('data/sounds/robot.mp3')
-        self.robot1 = pygame.mixer.Sound('data/sounds/robot1.wav')
-        self.robot2 = pygame.mixer.Sound('data/sounds/robot2.wav')
-        self.robot3 = pygame.mixer.Sound('data/sounds/robot3.wav')
-        self.robot4 = pygame.mixer.Sound('data/sounds/robot4.wav')
-        self.robot5 = pygame.mixer.Sound('data/sounds/robot5.wav')
-        self.robot6 = pygame.mixer.Sound('data/sounds/robot6.wav')
-        self.robots = pygame.mixer.Sound('data/sounds/robots.mp3')
-        self.walk = pygame.mixer.Sound('data/sounds/walk.wav')
-
-        self.music_begin = pygame.mixer.Sound('data/sounds/musiqueintro.wav')
-        self.music_ambiant = pygame.mixer.Sound('data/sounds/Musiquejeu.wav')
-
         self.music_begin.set_volume(0.8*self.volume)
         self.music_ambiant.set_volume(0.2*self.volume)
 
@@ -92,6 +98,12 @@ class SoundManager:
         for sound in self.robot:
             sound.set_volume(0.1*self.volume)
         
+    def load_sound(self, path : str) -> pygame.mixer.Sound:
+        """Returns the preloaded sound if there is one, loads it otherwise."""
+        if path in self.preloaded_sounds:
+            return self.preloaded_sounds.pop(path)
+        return pygame.mixer.Sound(path)
+
     def play_random_ambiant_sound(self):
         """
         Play a random sound in the list of noise blank sounds
@@ -0,0 +1,71 @@
+r"""
+Projet : Creative Core
+Equipe : Paul Baumard, Abel Bossard, Tybalt Debruyne, Taddeo Boisseuil-Marcil
+                  _   _       _               _     _
+                 | | (_)     | |             (_)   | |
+  ___ _ __   __ _| |_ _  __ _| |   __ _ _ __ _  __| |
+ / __| '_ \ / _` | __| |/ _` | |  / _` | '__| |/ _` |
+ \__ \ |_) | (_| | |_| | (_| | | | (_| | |  | | (_| |
+ |___/ .__/ \__,_|\__|_|\__,_|_|  \__, |_|  |_|\__,_|
+     | |                           __/ |
+     |_|                          |___/
+
+Key Features:
+-------------
+- Uniform grid over the screen, each cell knows the objects whose rect overlaps it.
+- Point queries (hover, clicks) only test the objects of one cell.
+- Rect queries (build mode collisions) only test the objects of the overlapped cells.
+- Results are returned in insertion order, which is also the drawing order of the room.
+"""
+
+from pygame import Rect
+
+class SpatialGrid:
+    def __init__(self, cell_size : int = 120) -> None:
+        """Creates an empty grid, cell_size is in pixels (120 is 20 pixels of the pixel art)."""
+        self.cell_size = cell_size
+        self.cells : dict[tuple[int, int], list] = {}
+        self.items : dict[object, tuple[Rect, list[tuple[int, int]], int]] = {} # item : (rect, cells, insertion order)
+        self.insertions = 0
+
+    def get_cells(self, rect : Rect) -> list[tuple[int, int]]:
+        """Returns the keys of the cells overlapped by the rect."""
+        left, top = rect.left // self.cell_size, rect.top // self.cell_size
+        right, bottom = (rect.right - 1) // self.cell_size, (rect.bottom - 1) // self.cell_size
+        return [(x, y) for x in range(left, max(left, right) + 1) for y in range(top, max(top, bottom) + 1)]
+
+    def insert(self, item, rect : Rect):
+        """Adds an item to the grid, the rect is copied so the item has to be removed and inserted again if it moves."""
+        if item in self.items:
+            self.remove(item)
+        rect = Rect(rect)
+        cells = self.get_cells(rect)
+        for cell in cells:
+            self.cells.setdefault(cell, []).append(item)
+        self.items[item] = (rect, cells, self.insertions)
+        self.insertions += 1
+
+    def remove(self, item):
+        """Removes an item from the grid, does nothing if it isn't in it."""
+        if item not in self.items:
+            return
+        _, cells, _ = self.items.pop(item)
+        for cell in cells:
+            self.cells[cell].remove(item)
+            if not self.cells[cell]:
+                del self.cells[cell]
+
+    def query_point(self, xy : tuple[int, int]) -> list:
+        """Returns the items whose rect contains the point, in insertion order."""
+        cell = (int(xy[0]) // self.cell_size, int(xy[1]) // self.cell_size)
+        found = [item for item in self.cells.get(cell, ()) if self.items[item][0].collidepoint(xy)]
+        return sorted(found, key=lambda item: self.items[item][2])
+
+    def query_rect(self, rect : Rect) -> list:
+        """Returns the items whose rect overlaps the given rect, in insertion order."""
+        found = {}
+        for cell in self.get_cells(rect):
+            for item in self.cells.get(cell, ()):
+                if item not in found and self.items[item][0].colliderect(rect):
+                    found[item] = self.items[item][2]
+        return sorted(found, key=found.get)
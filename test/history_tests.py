@@ -0,0 +1,72 @@
+#Projet : Creative Core
+#Equipe : Paul Baumard, Abel Bossard, Tybalt Debruyne, Taddeo Boisseuil-Marcil
+import pygame as pg
+import os
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../sources'))) # Magic to make the imports work, taken on stackoverflow
+from objects.tiledcanvas import TiledCanvas
+from objects.history import CanvaHistory
+print('history test')
+
+"""All tests should print True, if they don't, undo or redo doesn't give back the canvas as it was
+The paintings are simulated by drawing rects on the canvas, the way the paint job saves the tiles before writing in them."""
+
+SIZE = (672, 1020) # size of the canvas
+
+def paint(canvas : TiledCanvas, history : CanvaHistory, rect : pg.Rect, color : tuple, beauty : float):
+    history.begin(beauty)
+    history.touch(canvas.get_tiles(rect))
+    canvas.surf.fill(color, rect)
+    canvas.mark_dirty(rect)
+    history.commit()
+
+def get_pixels(canvas : TiledCanvas) -> bytes:
+    return pg.image.tobytes(canvas.surf, "RGB")
+
+try:
+    canvas = TiledCanvas(SIZE, (240, 240, 240))
+    history = CanvaHistory(canvas)
+    states = [get_pixels(canvas)]
+    for rect, color in [(pg.Rect(10, 10, 50, 50), (194, 49, 47)), (pg.Rect(100, 300, 400, 250), (11, 23, 33)), (pg.Rect(0, 900, 672, 120), (232, 216, 153))]:
+        paint(canvas, history, rect, color, 1)
+        states.append(get_pixels(canvas))
+
+    print(len(history.undo_stack[0].before) == 1) # only the tile of the small rect is saved, not the whole canvas
+    print(len(history.undo_stack[1].before) == len(canvas.get_tiles(pg.Rect(100, 300, 400, 250))))
+
+    results = []
+    for state in reversed(states[:-1]): # undo everything
+        history.undo()
+        results.append(get_pixels(canvas) == state)
+    print(all(results), history.undo() is None)
+
+    results = []
+    for state in states[1:]: # redo everything
+        history.redo()
+        results.append(get_pixels(canvas) == state)
+    print(all(results), history.redo() is None)
+except Exception as e:
+    print("Exception in undo/redo test")
+    print(e)
+
+try:
+    # old entries are compressed, undoing them has to give the same pixels
+    for entry in history.undo_stack:
+        entry.compress()
+    history.undo()
+    history.undo()
+    print(get_pixels(canvas) == states[1])
+
+    # a new painting clears the redo stack
+    paint(canvas, history, pg.Rect(200, 200, 20, 20), (0, 0, 0), 1)
+    print(not history.can_redo())
+
+    # the thumbnail is updated with the tiles written by the undo
+    history.undo()
+    thumbnail = canvas.get_thumbnail()
+    print(pg.image.tobytes(thumbnail, "RGB") == pg.image.tobytes(pg.transform.scale_by(canvas.surf, 0.5), "RGB"))
+except Exception as e:
+    print("Exception in compressed history test")
+    print(e)
+
+print('test complete, please check for errors by looking for False')
@@ -36,9 +36,32 @@ try:
     test = Placeable('test', Coord(0,(0,0)), Surface((10,10)))
     pickled_data = pickle.dumps(test)
     unpickled_data = pickle.loads(pickled_data)
-    print(test.__dict__, unpickled_data.__dict__)
+    print(test, unpickled_data) # Placeable has slots, so no __dict__
 except Exception as e:
     print("Exception in Placeable test")
     print(e)
 
+try:
+    test = Placeable('test', Coord(0,(0,0)), Surface((10,10)), flags=["static", "no_interaction"])
+    pickled_data = pickle.dumps(test)
+    unpickled_data = pickle.loads(pickled_data)
+    print(test, unpickled_data)
+except Exception as e:
+    print("Exception in static Placeable test")
+    print(e)
+
+try:
+    # state of a Placeable saved before the slots, flags were attributes
+    test = Placeable('test', Coord(0,(0,0)), Surface((10,10)))
+    old_state = {slot : getattr(test, slot) for slot in ("name", "id", "coord", "anim", "tag", "rect", "y_constraint", "placed", "price", "beauty")}
+    old_state["surf"] = old_state["temp_surf"] = test.__getstate__()["surf"]
+    old_state["temp_rect"] = test.rect.copy()
+    old_state["no_outline"] = True
+    unpickled_data = Placeable.__new__(Placeable)
+    unpickled_data.__setstate__(old_state)
+    print(test, unpickled_data, unpickled_data.no_outline)
+except Exception as e:
+    print("Exception in old Placeable save test")
+    print(e)
+
 print('test complete, please check for errors by comparing the printed dictionaries')
\ No newline at end of file
@@ -0,0 +1,89 @@
+#Projet : Creative Core
+#Equipe : Paul Baumard, Abel Bossard, Tybalt Debruyne, Taddeo Boisseuil-Marcil
+import random
+import pygame as pg
+import os
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../sources'))) # Magic to make the imports work, taken on stackoverflow
+os.chdir(os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))) # the sprites are loaded from the root of the project
+pg.init()
+pg.display.set_mode((1, 1), pg.HIDDEN) # convert_alpha needs a display
+from ui.sprite import PATTERN_LIST, invert_alpha
+from objects.stencil import StencilEngine
+print('stencil test')
+
+"""All tests should print True, if they don't, the stencil engine doesn't paint like the blits it replaced
+The paint layer used to be made by blitting the patterns, inverting the alpha and filling the color with BLEND_RGBA_MAX.
+The colors are only compared where the layer is visible (alpha > 0), the hidden pixels are never painted."""
+
+SIZE = (672, 1020) # size of the canvas
+COLORS = [(11, 23, 33), (194, 49, 47), (232, 216, 153)]
+
+def get_blitted_layer(stencils, color):
+    """The paint layer as it was computed before the stencil engine."""
+    surf = pg.Surface(SIZE).convert_alpha()
+    surf.fill((0, 0, 0, 0))
+    for pattern, pos in stencils:
+        surf.blit(pattern, pos)
+    invert_alpha(surf)
+    surf.fill(color + (0,), special_flags=pg.BLEND_RGBA_MAX)
+    return surf
+
+def is_same_layer(expected, layer):
+    visible = pg.surfarray.array_alpha(expected) > 0
+    return bool((pg.surfarray.array_alpha(expected) == pg.surfarray.array_alpha(layer)).all()
+                and (pg.surfarray.array3d(expected) == pg.surfarray.array3d(layer))[visible].all())
+
+random.seed(1)
+patterns = list(PATTERN_LIST)
+translucent = pg.Surface((200, 150), pg.SRCALPHA) # the patterns of the game are opaque, this one tests the blending
+translucent.fill((255, 255, 255, 90))
+pg.draw.circle(translucent, (200, 200, 200, 255), (60, 60), 40)
+pg.draw.circle(translucent, (120, 120, 120, 30), (140, 90), 50)
+patterns.append(translucent)
+
+def random_stencil():
+    return (random.choice(patterns), (random.randint(-200, 650), random.randint(-200, 1000))) # some are partly outside the canvas
+
+try:
+    engine = StencilEngine(SIZE)
+    results = []
+    for _ in range(30):
+        stencils = [random_stencil() for _ in range(random.randint(1, 20))]
+        color = random.choice(COLORS)
+        results.append(is_same_layer(get_blitted_layer(stencils, color), engine.get_paint_layer(stencils, color)))
+    print(all(results))
+except Exception as e:
+    print("Exception in paint layer test")
+    print(e)
+
+try:
+    # a pattern is dragged around, moved on top, added and removed, like in the canvas
+    engine = StencilEngine(SIZE)
+    stencils = [random_stencil() for _ in range(16)] + [(translucent, (300, 400))]
+    color = COLORS[1]
+    results = []
+    for step in range(200):
+        action = random.random()
+        if action < 0.7:
+            pattern, (x, y) = stencils[-1]
+            stencils[-1] = (pattern, (x + random.randint(-30, 30), y + random.randint(-30, 30)))
+        elif action < 0.8:
+            stencils.append(stencils.pop(random.randrange(len(stencils))))
+        elif action < 0.9:
+            stencils.append(random_stencil())
+        elif len(stencils) > 2:
+            stencils.pop(random.randrange(len(stencils)))
+        if step % 50 == 0:
+            color = random.choice(COLORS)
+
+        preview = engine.get_preview(list(stencils), color)
+        if step % 10 == 0:
+            expected = get_blitted_layer(stencils, color)
+            results.append(is_same_layer(expected, preview) and is_same_layer(expected, engine.get_paint_layer(list(stencils), color)))
+    print(all(results))
+except Exception as e:
+    print("Exception in preview test")
+    print(e)
+
+print('test complete, please check for errors by looking for False')